@@ -0,0 +1,138 @@
+# ------------------------------------------------------------
+# Archive size and write speed against per-click downloads
+# - Generates N prompts across every tool (mostly short answers, some
+#   paragraphs; strict mode and the visual step mixed)
+# - "downloads": what N Download Prompt + Download Inputs clicks store, one
+#   prompt_<tool>_<ts>.txt and one pretty-printed prompt_inputs_*.json each
+# - "archive": the same prompts written to one prompt_builder.archive file
+#   (gzip and plain), then read back with every prompt rebuilt and checked
+#   against assemble_prompt
+# - Reports bytes, disk blocks actually used, write time and read time
+# - Usage: python benchmarks/archive_size.py [--prompts 20000] [--seed 1] [--json]
+# ------------------------------------------------------------
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from prompt_builder.archive import ArchiveWriter, iter_archive  # noqa: E402
+from prompt_builder.core import REGISTRY, assemble_prompt  # noqa: E402
+from prompt_builder.streaming import inputs_json_bytes, prompt_bytes  # noqa: E402
+
+WORDS = "launch plan audience notes draft customer report summary product team budget goals risks".split()
+
+
+def sample_job(rng: random.Random, names: list, i: int) -> tuple:
+    name = rng.choice(names)
+    answers = {}
+    for q in REGISTRY[name].questions:
+        if q.type == "single":
+            answers[q.id] = rng.choice(q.options)
+        elif q.optional and rng.random() < 0.3:
+            answers[q.id] = ""
+        else:
+            words = rng.randint(2, 12) if rng.random() < 0.8 else rng.randint(12, 120)
+            answers[q.id] = " ".join(rng.choice(WORDS) for _ in range(words))
+    ts = f"20260101-{i // 3600 % 24:02d}{i // 60 % 60:02d}{i % 60:02d}"
+    return name, answers, rng.random() < 0.8, rng.random() < 0.3, ts
+
+
+def disk_bytes(paths) -> int:
+    return sum(os.stat(p).st_blocks * 512 for p in paths)
+
+
+def write_downloads(directory: str, jobs: list) -> list:
+    paths = []
+    for i, (name, answers, strict, visual, ts) in enumerate(jobs):
+        safe_tool = name.replace(" ", "_").lower()
+        path = os.path.join(directory, f"prompt_{safe_tool}_{ts}_{i}.txt")
+        with open(path, "wb") as f:
+            f.write(prompt_bytes(name, answers, strict, visual))
+        paths.append(path)
+        payload = {
+            "tool": name,
+            "strict_mode": strict,
+            "include_visual_step": visual if REGISTRY[name].visual_block else False,
+            "answers": answers,
+            "generated_at": ts,
+            "app": "prompt_builder_v1_1_help_export.py (guided questions restored)",
+        }
+        path = os.path.join(directory, f"prompt_inputs_{safe_tool}_{ts}_{i}.json")
+        with open(path, "wb") as f:
+            f.write(inputs_json_bytes(payload))
+        paths.append(path)
+    return paths
+
+
+def write_archive(path: str, jobs: list):
+    writer = ArchiveWriter(path)
+    for name, answers, strict, visual, ts in jobs:
+        writer.add(name, answers, strict, visual, ts)
+    writer.close()
+
+
+def timed(fn) -> tuple:
+    t0 = time.perf_counter()
+    value = fn()
+    return value, time.perf_counter() - t0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare the prompt archive with per-click download files.")
+    parser.add_argument("--prompts", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    names = list(REGISTRY)
+    jobs = [sample_job(rng, names, i) for i in range(args.prompts)]
+
+    report = {"prompts": len(jobs)}
+    with tempfile.TemporaryDirectory() as tmp:
+        downloads = os.path.join(tmp, "downloads")
+        os.makedirs(downloads)
+        paths, seconds = timed(lambda: write_downloads(downloads, jobs))
+        report["downloads"] = {
+            "bytes": sum(os.path.getsize(p) for p in paths),
+            "disk_bytes": disk_bytes(paths),
+            "write_s": round(seconds, 3),
+        }
+
+        for label, name in (("archive_gz", "prompts.jsonl.gz"), ("archive_plain", "prompts.jsonl")):
+            path = os.path.join(tmp, name)
+            _, seconds = timed(lambda: write_archive(path, jobs))
+            read, read_s = timed(lambda: list(iter_archive(path)))
+            mismatched = sum(
+                entry["prompt"] != assemble_prompt(*job[:4]) for entry, job in zip(read, jobs)
+            ) + abs(len(read) - len(jobs))
+            report[label] = {
+                "bytes": os.path.getsize(path),
+                "disk_bytes": disk_bytes([path]),
+                "write_s": round(seconds, 3),
+                "read_s": round(read_s, 3),
+                "mismatched": mismatched,
+            }
+
+    base = report["downloads"]
+    for label in ("archive_gz", "archive_plain"):
+        entry = report[label]
+        entry["smaller_x"] = round(base["disk_bytes"] / entry["disk_bytes"], 1)
+        entry["faster_x"] = round(base["write_s"] / entry["write_s"], 1)
+    if args.json:
+        print(json.dumps(report))
+    else:
+        for key, value in report.items():
+            print(f"{key:>14}: {value}")
+    return 0 if all(report[k]["mismatched"] == 0 for k in ("archive_gz", "archive_plain")) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+# ------------------------------------------------------------
+# Import-time budget for prompt_builder
+# - Imports the core package in fresh interpreters and fails (exit 1) if the
+#   median cost goes over budget or if any UI module gets pulled in.
+# - tests/test_import_time.py asserts the same budget under pytest; this
+#   script is for other budgets and run counts
+# - Usage: python benchmarks/check_import_time.py [--budget-ms 50] [--runs 7]
+# ------------------------------------------------------------
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Measured inside the child so interpreter startup is excluded.
+PROBE = """
+import sys, time, json
+t0 = time.perf_counter()
+import prompt_builder.core
+elapsed = (time.perf_counter() - t0) * 1000
+print(json.dumps({
+    "ms": elapsed,
+    "forbidden": sorted(m for m in sys.modules if m.split(".")[0] in ("streamlit", "pandas", "numpy", "altair")),
+}))
+"""
+
+
+def measure_once() -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=REPO_ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(out)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check the import-time budget of prompt_builder.")
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="Max median import time in milliseconds.")
+    parser.add_argument("--runs", type=int, default=7, help="Number of fresh interpreters to sample.")
+    args = parser.parse_args(argv)
+
+    samples = [measure_once() for _ in range(args.runs)]
+    median_ms = statistics.median(s["ms"] for s in samples)
+    forbidden = samples[0]["forbidden"]
+
+    print(f"import prompt_builder.core: median {median_ms:.2f} ms over {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+    if forbidden:
+        print("FAIL: UI modules imported: " + ", ".join(forbidden))
+        return 1
+    if median_ms > args.budget_ms:
+        print("FAIL: import time over budget")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+# ------------------------------------------------------------
+# Peak-memory check for large-input mode
+# - Builds a tool's answers with one 10 MB field and measures (tracemalloc)
+#   the peak extra memory of each large-input step: budget check, preview,
+#   prompt download bytes and inputs download bytes
+# - Fails (exit 1) if any step peaks above --max-ratio x the input size
+# - tests/test_large_input_memory.py asserts the same bound at 10 MB under
+#   pytest; this script is for trying other sizes and limits
+# - Usage: python benchmarks/check_large_input_memory.py [--mb 10] [--max-ratio 3]
+# ------------------------------------------------------------
+
+import argparse
+import os
+import sys
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from prompt_builder.core import REGISTRY, validate_required  # noqa: E402
+from prompt_builder.streaming import (  # noqa: E402
+    check_size_budgets,
+    inputs_json_bytes,
+    prompt_bytes,
+    prompt_preview,
+)
+
+TOOL = "Google Antigravity"
+BIG_FIELD = "Situation"
+
+
+def peak_of(fn) -> int:
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    result = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    del result
+    return peak - base
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check peak memory of large-input prompt assembly.")
+    parser.add_argument("--mb", type=float, default=10.0, help="Size of the large answer in MB.")
+    parser.add_argument("--max-ratio", type=float, default=3.0, help="Allowed peak as a multiple of the input.")
+    args = parser.parse_args(argv)
+
+    size = int(args.mb * 1024 * 1024)
+    tool = REGISTRY[TOOL]
+    answers = {q.id: (q.options[0] if q.type == "single" else "short answer") for q in tool.questions}
+
+    tracemalloc.start()
+    answers[BIG_FIELD] = ("Pasted document line. " * (size // 22 + 1))[:size]
+    payload = {"tool": TOOL, "strict_mode": True, "include_visual_step": False, "answers": answers}
+    render_args = (TOOL, answers, True, False)
+
+    steps = {
+        "validate_required": lambda: validate_required(tool, answers),
+        "check_size_budgets": lambda: check_size_budgets(*render_args, max_field_chars=size * 2, max_total_chars=size * 2),
+        "prompt_preview": lambda: prompt_preview(*render_args, max_chars=20_000),
+        "prompt_bytes": lambda: prompt_bytes(*render_args),
+        "inputs_json_bytes": lambda: inputs_json_bytes(payload),
+    }
+
+    failed = False
+    print(f"input: {size / 1e6:.1f} MB in '{BIG_FIELD}' ({TOOL})")
+    for name, fn in steps.items():
+        ratio = peak_of(fn) / size
+        ok = ratio <= args.max_ratio
+        failed |= not ok
+        print(f"{name:<20} peak {ratio:5.2f}x input {'OK' if ok else 'FAIL'}")
+    tracemalloc.stop()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
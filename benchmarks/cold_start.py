@@ -0,0 +1,162 @@
+# ------------------------------------------------------------
+# Cold start with and without a snapshot (prompt_builder.snapshot)
+# - Writes N tool files (copies of the built-in tools under new names) and
+#   L pseudo-translated catalogs to a temporary directory, then builds a
+#   snapshot for them
+# - "boot": a fresh interpreter importing prompt_builder, loading tools and
+#   catalogs and building the search index; what a batch worker or the
+#   server pays before its first request
+# - "first_render": a fresh interpreter running the page once (Streamlit
+#   AppTest), from the first import to the rendered page
+# - Both are CPU ms measured inside the child (interpreter startup
+#   excluded), medians over --runs, with the snapshot unset and set in
+#   alternation; the registry a child ends up with must be the same either way
+# - Usage: python benchmarks/cold_start.py [--tools 300] [--locales 2] [--runs 5] [--json]
+# ------------------------------------------------------------
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from prompt_builder.core import REGISTRY, TOOLS  # noqa: E402
+from prompt_builder.i18n import page_texts, source_strings  # noqa: E402
+
+APP = os.path.join(REPO_ROOT, "prompt_builder_v1_1_help_export.py")
+ACCENTS = str.maketrans("aeiouAEIOU", "áéíóúÁÉÍÓÚ")
+PLACEHOLDER_RE = re.compile(r"(\{[A-Za-z_][A-Za-z0-9_]*\})")
+
+BOOT_PROBE = """
+import time, json
+t0 = time.process_time()
+from prompt_builder.registry import load_tools
+from prompt_builder.search import get_search_index
+load_tools()
+get_search_index()
+ms = (time.process_time() - t0) * 1000
+import hashlib
+from prompt_builder.core import REGISTRY
+from prompt_builder.schema import tool_schema
+from prompt_builder.snapshot import get_snapshot
+signature = hashlib.blake2b(json.dumps(
+    sorted((name, tool.fingerprint, tool_schema(tool)) for name, tool in REGISTRY.items()), sort_keys=True
+).encode()).hexdigest()
+snapshot = get_snapshot()
+print(json.dumps({"ms": ms, "tools": len(REGISTRY), "signature": signature,
+                  "snapshot": snapshot.status if snapshot is not None else None}))
+"""
+
+RENDER_PROBE = """
+import time, json
+t0 = time.process_time()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(%r, default_timeout=120)
+at.run()
+ms = (time.process_time() - t0) * 1000
+print(json.dumps({"ms": ms, "exception": [e.message for e in at.exception]}))
+""" % APP
+
+
+def pseudo(text: str) -> str:
+    # Accent the letters, leave {Placeholders} alone
+    return "".join(part if PLACEHOLDER_RE.fullmatch(part) else part.translate(ACCENTS)
+                   for part in PLACEHOLDER_RE.split(text))
+
+
+def write_tools(directory: str, count: int):
+    names = list(TOOLS)
+    for i in range(count):
+        base = names[i % len(names)]
+        schema = {"name": f"{base} #{i}", **TOOLS[base]}
+        with open(os.path.join(directory, f"tool_{i:05d}.json"), "w", encoding="utf-8") as f:
+            json.dump(schema, f)
+
+
+def write_catalogs(directory: str, count: int):
+    strings = {s: pseudo(s) for s in page_texts() + source_strings(REGISTRY)}
+    for i in range(count):
+        with open(os.path.join(directory, f"x{i}.json"), "w", encoding="utf-8") as f:
+            json.dump({"language": f"Pseudo {i}", "strings": strings}, f, ensure_ascii=False)
+
+
+def run_probe(code: str, env: dict) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=REPO_ROOT, env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure cold start with and without a registry snapshot.")
+    parser.add_argument("--tools", type=int, default=300)
+    parser.add_argument("--locales", type=int, default=2)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--no-render", action="store_true", help="Skip the page run (no Streamlit needed).")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tools_dir = os.path.join(tmp, "tools")
+        locales_dir = os.path.join(tmp, "locales")
+        os.makedirs(tools_dir)
+        os.makedirs(locales_dir)
+        write_tools(tools_dir, args.tools)
+        write_catalogs(locales_dir, args.locales)
+        path = os.path.join(tmp, "registry.snapshot")
+        env = dict(
+            os.environ,
+            PYTHONPATH=REPO_ROOT,
+            PROMPT_BUILDER_TOOLS_DIR=tools_dir,
+            PROMPT_BUILDER_LOCALES_DIR=locales_dir,
+            PROMPT_BUILDER_HISTORY_DB="",
+            PROMPT_BUILDER_SNAPSHOT="",
+        )
+        subprocess.run([sys.executable, "-m", "prompt_builder.snapshot", "build", "-o", path],
+                       cwd=REPO_ROOT, env=env, check=True, capture_output=True)
+        snapshot_kb = os.path.getsize(path) / 1024
+
+        modes = {"compiled": dict(env), "snapshot": dict(env, PROMPT_BUILDER_SNAPSHOT=path)}
+        boots = {label: [] for label in modes}
+        renders = {label: [] for label in modes}
+        for _ in range(args.runs):
+            for label, child_env in modes.items():
+                boots[label].append(run_probe(BOOT_PROBE, child_env))
+                if not args.no_render:
+                    result = run_probe(RENDER_PROBE, child_env)
+                    if result["exception"]:
+                        raise RuntimeError(result["exception"])
+                    renders[label].append(result)
+
+    report = {"tools": args.tools, "locales": args.locales, "snapshot_kb": round(snapshot_kb, 1)}
+    signatures = set()
+    for label in modes:
+        signatures.update(b["signature"] for b in boots[label])
+        entry = {"boot_ms": round(statistics.median(b["ms"] for b in boots[label]), 1),
+                 "registry": boots[label][0]["tools"], "status": boots[label][0]["snapshot"]}
+        if not args.no_render:
+            entry["first_render_ms"] = round(statistics.median(r["ms"] for r in renders[label]), 1)
+        report[label] = entry
+
+    report["same_registry"] = len(signatures) == 1
+    report["boot_faster_x"] = round(report["compiled"]["boot_ms"] / report["snapshot"]["boot_ms"], 1)
+    if not args.no_render:
+        report["first_render_saved_ms"] = round(
+            report["compiled"]["first_render_ms"] - report["snapshot"]["first_render_ms"], 1
+        )
+    if args.json:
+        print(json.dumps(report))
+    else:
+        for key, value in report.items():
+            print(f"{key:>22}: {value}")
+    return 0 if report["same_registry"] and report["snapshot"]["status"] == "loaded" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
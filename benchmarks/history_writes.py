@@ -0,0 +1,72 @@
+# ------------------------------------------------------------
+# Concurrent write throughput of the prompt history store
+# - N threads (one per simulated session) record generated prompts at once
+# - Reports committed writes per second and duplicate-lookup latency
+# - Usage: python benchmarks/history_writes.py [--sessions 64] [--per-session 200]
+# ------------------------------------------------------------
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from prompt_builder.core import REGISTRY, assemble_prompt  # noqa: E402
+from prompt_builder.history import HistoryStore, answers_hash  # noqa: E402
+
+
+def session(store: HistoryStore, seed: int, count: int):
+    rng = random.Random(seed)
+    tools = list(REGISTRY)
+    for n in range(count):
+        tool_name = rng.choice(tools)
+        answers = {
+            q.id: rng.choice(q.options) if q.type == "single" else f"session {seed} answer {n} {rng.random()}"
+            for q in REGISTRY[tool_name].questions
+        }
+        prompt = assemble_prompt(tool_name, answers, strict_mode=True, include_visual=False)
+        store.record(tool_name, answers, True, False, prompt)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure concurrent write throughput of the history store.")
+    parser.add_argument("--sessions", type=int, default=64)
+    parser.add_argument("--per-session", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = HistoryStore(os.path.join(tmp, "history.sqlite3"))
+        threads = [
+            threading.Thread(target=session, args=(store, seed, args.per_session))
+            for seed in range(args.sessions)
+        ]
+        t0 = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        store.flush()
+        elapsed = time.perf_counter() - t0
+
+        total = args.sessions * args.per_session
+        assert store.count() == total, (store.count(), total)
+        row = store.page(limit=1)[0]
+        full = store.get(row["id"])
+        key = answers_hash(full["tool"], full["answers"], full["strict_mode"], full["include_visual"])
+        t1 = time.perf_counter()
+        for _ in range(1000):
+            store.lookup(key)
+        lookup_us = (time.perf_counter() - t1) / 1000 * 1e6
+
+    print(f"{total} writes from {args.sessions} sessions in {elapsed:.2f} s: {total / elapsed:,.0f} writes/s")
+    print(f"duplicate lookup: {lookup_us:.1f} us")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
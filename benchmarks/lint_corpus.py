@@ -0,0 +1,97 @@
+# ------------------------------------------------------------
+# Lint throughput over a large prompt corpus
+# - Renders N prompts across every tool with a realistic answer mix (mostly
+#   short, some paragraphs, a few pasted documents; some optional answers
+#   left empty, some answers missing, some with strict rules pasted in)
+# - Times rendering and linting separately and reports prompts/s, MB/s, the
+#   lint cost as a share of rendering, and issue counts per kind
+# - Usage: python benchmarks/lint_corpus.py [--prompts 100000] [--seed 1] [--json]
+# ------------------------------------------------------------
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from prompt_builder.core import REGISTRY, STRICT_RULES, assemble_prompt  # noqa: E402
+from prompt_builder.lint import lint_prompt  # noqa: E402
+
+WORDS = "launch plan audience notes draft customer report summary product team budget goals risks".split()
+
+
+def sample_answers(rng: random.Random, tool) -> dict:
+    answers = {}
+    for q in tool.questions:
+        if q.type == "single":
+            answers[q.id] = rng.choice(q.options)
+            continue
+        r = rng.random()
+        if q.optional and r < 0.4:
+            answers[q.id] = ""
+            continue
+        words = rng.randint(2, 12) if r < 0.7 else rng.randint(12, 200) if r < 0.98 else rng.randint(2000, 8000)
+        text = " ".join(rng.choice(WORDS) for _ in range(words))
+        if rng.random() < 0.01:
+            text += "\n\n" + STRICT_RULES
+        answers[q.id] = text
+    if rng.random() < 0.01:
+        answers.pop(rng.choice(tool.questions).id)
+    return answers
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure prompt lint throughput over a generated corpus.")
+    parser.add_argument("--prompts", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    names = list(REGISTRY)
+    jobs = []
+    for _ in range(args.prompts):
+        name = rng.choice(names)
+        jobs.append((name, sample_answers(rng, REGISTRY[name]), rng.random() < 0.8, rng.random() < 0.3))
+
+    t0 = time.perf_counter()
+    prompts = [(REGISTRY[name], assemble_prompt(name, answers, strict, visual), answers)
+               for name, answers, strict, visual in jobs]
+    render_s = time.perf_counter() - t0
+
+    kinds = {}
+    flagged = 0
+    t0 = time.perf_counter()
+    for tool, prompt, answers in prompts:
+        issues = lint_prompt(tool, prompt, answers)
+        flagged += bool(issues)
+        for issue in issues:
+            kinds[issue["kind"]] = kinds.get(issue["kind"], 0) + 1
+    lint_s = time.perf_counter() - t0
+
+    chars = sum(len(prompt) for _, prompt, _ in prompts)
+    report = {
+        "prompts": len(prompts),
+        "mb": round(chars / 1e6, 1),
+        "render_s": round(render_s, 3),
+        "lint_s": round(lint_s, 3),
+        "lint_prompts_per_s": round(len(prompts) / lint_s),
+        "lint_mb_per_s": round(chars / 1e6 / lint_s, 1),
+        "lint_vs_render": round(lint_s / render_s, 2),
+        "flagged": flagged,
+        "issues": dict(sorted(kinds.items())),
+    }
+    if args.json:
+        print(json.dumps(report))
+    else:
+        for k, v in report.items():
+            print(f"{k:>20}: {v}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+# ------------------------------------------------------------
+# Load test for prompt_builder.server on localhost
+# - Starts the server in a child process (or targets --port of a running one)
+# - Opens N keep-alive connections and posts render requests for a fixed time
+# - Reports throughput and p50/p95/p99 latency per endpoint mix
+# - Usage: python benchmarks/loadtest_server.py --connections 32 --seconds 10
+# ------------------------------------------------------------
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from prompt_builder.core import TOOLS  # noqa: E402
+
+
+def sample_payload(rng: random.Random, tool_name: str) -> dict:
+    answers = {}
+    for q in TOOLS[tool_name]["questions"]:
+        if q["type"] == "single":
+            answers[q["id"]] = rng.choice(q["options"])
+        else:
+            answers[q["id"]] = " ".join(rng.choice(["launch", "plan", "audience", "notes", "draft"]) for _ in range(rng.randint(3, 40)))
+    return {
+        "tool": tool_name,
+        "strict_mode": rng.random() < 0.8,
+        "include_visual_step": rng.random() < 0.3,
+        "answers": answers,
+    }
+
+
+def build_request(path: str, payload) -> bytes:
+    if payload is None:
+        return f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode()
+    body = json.dumps(payload).encode("utf-8")
+    head = f"POST {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+    return head.encode() + body
+
+
+async def read_response(reader: asyncio.StreamReader) -> int:
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    length = 0
+    for line in head.split(b"\r\n"):
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":", 1)[1])
+    await reader.readexactly(length)
+    return status
+
+
+async def worker(port: int, requests: list, deadline: float, latencies: list, statuses: dict):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    i = 0
+    try:
+        while time.perf_counter() < deadline:
+            data = requests[i % len(requests)]
+            i += 1
+            t0 = time.perf_counter()
+            writer.write(data)
+            await writer.drain()
+            status = await read_response(reader)
+            latencies.append(time.perf_counter() - t0)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def run_load(port: int, connections: int, seconds: float, batch_every: int, seed: int):
+    rng = random.Random(seed)
+    tools = list(TOOLS)
+    requests = []
+    for n in range(200):
+        if batch_every and n % batch_every == 0:
+            records = [sample_payload(rng, rng.choice(tools)) for _ in range(50)]
+            requests.append(build_request("/render/batch", {"records": records}))
+        elif n % 25 == 1:
+            requests.append(build_request("/tools", None))
+        else:
+            requests.append(build_request("/render", sample_payload(rng, rng.choice(tools))))
+
+    latencies = []
+    statuses = {}
+    deadline = time.perf_counter() + seconds
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker(port, requests, deadline, latencies, statuses) for _ in range(connections)))
+    elapsed = time.perf_counter() - t0
+    return latencies, statuses, elapsed
+
+
+def wait_for_port(port: int, timeout: float = 10.0):
+    end = time.time() + timeout
+    while time.time() < end:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"server did not start on port {port}")
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Load test the Prompt Builder HTTP service on localhost.")
+    parser.add_argument("--port", type=int, default=0, help="Port of a running server (default: start one).")
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--batch-every", type=int, default=20, help="Every Nth request is a 50-record batch (0 = never).")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = parser.parse_args(argv)
+
+    proc = None
+    port = args.port
+    if not port:
+        port = free_port()
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "prompt_builder.server", "--port", str(port)],
+            cwd=REPO_ROOT,
+            stderr=subprocess.DEVNULL,
+        )
+    try:
+        wait_for_port(port)
+        latencies, statuses, elapsed = asyncio.run(
+            run_load(port, args.connections, args.seconds, args.batch_every, args.seed)
+        )
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+    latencies.sort()
+    q = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    report = {
+        "requests": len(latencies),
+        "seconds": round(elapsed, 3),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(q[49] * 1000, 3),
+        "p95_ms": round(q[94] * 1000, 3),
+        "p99_ms": round(q[98] * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3),
+        "statuses": {str(k): v for k, v in sorted(statuses.items())},
+        "connections": args.connections,
+    }
+    if args.json:
+        print(json.dumps(report))
+    else:
+        for k, v in report.items():
+            print(f"{k:>12}: {v}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,306 @@
+# ------------------------------------------------------------
+# Load test for the Streamlit page: many simulated sessions, fully local
+# - Drives N headless sessions (Streamlit AppTest) through the page script:
+#   pick a tool, answer its questions, generate, download both files, and
+#   again with another tool for --flows rounds
+# - Tools, answer lengths and toggles follow a rough real-usage mix; a share
+#   of sessions types with the live preview on (one rerun per edit)
+# - Sessions in one process are interleaved a rerun at a time, like one
+#   server process serving them; --workers processes split the sessions to
+#   use every core
+# - Downloads run the button's deferred callable the way the server does:
+#   on another thread, after the script run
+# - Reports p50/p95/p99 rerun latency, throughput, and per-session memory:
+#   session_bytes() of each session's st.session_state after its first
+#   prompt and at the end, plus process RSS growth per session
+# - Usage: python benchmarks/loadtest_sessions.py --sessions 32 --flows 3 [--workers 4] [--json]
+# ------------------------------------------------------------
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+DEFAULT_APP = os.path.join(REPO_ROOT, "prompt_builder_v1_1_help_export.py")
+
+# Share of sessions per tool, and of sessions that type with the live preview on
+TOOL_WEIGHTS = {
+    "ChatGPT": 35,
+    "Gemini": 20,
+    "NotebookLM": 15,
+    "Gemini Gems": 10,
+    "Google AI Studio": 10,
+    "Google Antigravity": 10,
+}
+LIVE_SHARE = 0.25
+STRICT_OFF_SHARE = 0.2
+VISUAL_SHARE = 0.3
+SKIP_OPTIONAL_SHARE = 0.5
+
+WORDS = (
+    "launch plan audience notes draft customer weekly report summary product team "
+    "feedback budget timeline goals risks metrics review onboarding checklist"
+).split()
+
+
+def answer_text(rng: random.Random) -> str:
+    # Mostly a phrase or a sentence, sometimes a paragraph, rarely a pasted page
+    r = rng.random()
+    words = rng.randint(2, 12) if r < 0.6 else rng.randint(12, 80) if r < 0.95 else rng.randint(400, 2000)
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+class SimSession:
+    def __init__(self, app_path: str, seed: int):
+        from streamlit.testing.v1 import AppTest
+
+        self.rng = random.Random(seed)
+        self.at = AppTest.from_file(app_path, default_timeout=120)
+        self.live = self.rng.random() < LIVE_SHARE
+        self.reruns = []      # seconds per script run
+        self.downloads = []   # seconds per deferred download
+        self.prompts = 0
+        self.memory = []      # session_state bytes after each prompt
+        self.media = None     # media file manager of the last run
+
+    def run(self):
+        t0 = time.perf_counter()
+        self.at.run()
+        self.reruns.append(time.perf_counter() - t0)
+        self.media = _media.get("mgr")
+        if self.at.exception:
+            raise RuntimeError(self.at.exception[0].message)
+
+    def flows(self, count: int):
+        # Generator: yields after every script run so sessions can interleave
+        from prompt_builder.core import REGISTRY
+        from prompt_builder.session import session_bytes
+
+        self.run()  # page load
+        yield
+        if self.live:
+            next(w for w in self.at.toggle if w.label == "Live preview").set_value(True)
+            self.run()
+            yield
+        names = [n for n in TOOL_WEIGHTS if n in REGISTRY]
+        for _ in range(count):
+            tool_name = self.rng.choices(names, weights=[TOOL_WEIGHTS[n] for n in names])[0]
+            strict = self.rng.random() >= STRICT_OFF_SHARE
+            if self.at.toggle(key="strict_mode").value != strict:
+                self.at.toggle(key="strict_mode").set_value(strict)
+                self.run()
+                yield
+            if self.at.selectbox(key="tool").value != tool_name:
+                self.at.selectbox(key="tool").select(tool_name)
+                self.run()
+                yield
+
+            for q in REGISTRY[tool_name].questions:
+                key = f"{tool_name}:{q.id}"
+                if q.type == "single":
+                    widget = self.at.selectbox(key=key)
+                    value = self.rng.choice(q.options)
+                    if widget.value == value:
+                        continue
+                    widget.select(value)
+                else:
+                    if q.optional and self.rng.random() < SKIP_OPTIONAL_SHARE:
+                        continue
+                    widget = self.at.text_input(key=key)
+                    widget.input(answer_text(self.rng))
+                # Inside the form an edit only stages its value
+                if not widget.form_id:
+                    self.run()
+                    yield
+            if REGISTRY[tool_name].visual_block and self.rng.random() < VISUAL_SHARE:
+                toggle = self.at.toggle(key=f"{tool_name}:visual")
+                toggle.set_value(not toggle.value)
+                if not toggle.form_id:
+                    self.run()
+                    yield
+
+            next(b for b in self.at.button if b.label == "Generate Prompt").click()
+            self.run()
+            if not self.live and "last" not in self.at.session_state:
+                raise RuntimeError(f"{tool_name}: no prompt generated")
+            if self.live:
+                # The fragment's button sets a flag and reruns the full script
+                self.run()
+            self.prompts += 1
+            yield
+            self.download()
+            self.memory.append(session_bytes(self.at.session_state.to_dict()))
+
+    def download(self):
+        for button in self.at.get("download_button"):
+            file_id = button.proto.deferred_file_id
+            if not file_id:
+                continue
+            t0 = time.perf_counter()
+            data = run_deferred(self.media, file_id)
+            self.downloads.append(time.perf_counter() - t0)
+            if not data:
+                raise RuntimeError(f"{button.proto.label}: empty download")
+            if button.proto.label == "Download Inputs (.json)":
+                # Must match the prompt the session generated, though the
+                # callable runs outside the session
+                if json.loads(data)["answers"] != self.at.session_state["last"].answers():
+                    raise RuntimeError("Download Inputs: answers differ from the generated prompt")
+
+
+# AppTest builds a new media file manager for every run; each session keeps
+# the one from its last run so downloads can call the deferred callables
+# registered there.
+_media = {}
+
+
+def _record_media_file_manager():
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.testing.v1 import app_test
+
+    class RecordingMediaFileManager(MediaFileManager):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            _media["mgr"] = self
+
+    app_test.MediaFileManager = RecordingMediaFileManager
+
+
+def run_deferred(mgr, file_id: str) -> bytes:
+    out = {}
+
+    def call():
+        try:
+            out["url"] = mgr.execute_deferred(file_id)
+        except Exception as exc:
+            out["error"] = exc
+
+    thread = threading.Thread(target=call)
+    thread.start()
+    thread.join()
+    if "error" in out:
+        raise RuntimeError(f"download failed: {out['error']}")
+    stored_id = out["url"].rsplit("/", 1)[-1].split(".", 1)[0]
+    return mgr._storage.get_file(stored_id).content
+
+
+def rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def run_sessions(job: tuple) -> dict:
+    # Runs in a worker: job is (app path, [session seeds], flows per session)
+    app_path, seeds, flows = job
+    os.environ.setdefault("PROMPT_BUILDER_HISTORY_DB", "")
+    _record_media_file_manager()
+
+    # Warm up imports and caches so RSS growth is per session, not per process
+    warm = SimSession(app_path, -1)
+    warm.run()
+    del warm
+    rss0 = rss_bytes()
+
+    sessions = [SimSession(app_path, seed) for seed in seeds]
+    active = [(s, s.flows(flows)) for s in sessions]
+    t0 = time.perf_counter()
+    while active:
+        for item in list(active):
+            try:
+                next(item[1])
+            except StopIteration:
+                active.remove(item)
+    elapsed = time.perf_counter() - t0
+
+    return {
+        "reruns": [t for s in sessions for t in s.reruns],
+        "downloads": [t for s in sessions for t in s.downloads],
+        "prompts": sum(s.prompts for s in sessions),
+        "first": [s.memory[0] for s in sessions if s.memory],
+        "last": [s.memory[-1] for s in sessions if s.memory],
+        "live": sum(s.live for s in sessions),
+        "sessions": len(sessions),
+        "seconds": elapsed,
+        "rss_growth": rss_bytes() - rss0,
+    }
+
+
+def percentiles(values: list) -> dict:
+    values = sorted(values)
+    if not values:
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+    q = statistics.quantiles(values, n=100, method="inclusive") if len(values) > 1 else values * 99
+    return {
+        "p50_ms": round(q[49] * 1000, 2),
+        "p95_ms": round(q[94] * 1000, 2),
+        "p99_ms": round(q[98] * 1000, 2),
+        "max_ms": round(values[-1] * 1000, 2),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Simulate many concurrent sessions of the Streamlit page.")
+    parser.add_argument("--app", default=DEFAULT_APP, help="Streamlit page to drive.")
+    parser.add_argument("--sessions", type=int, default=32)
+    parser.add_argument("--flows", type=int, default=3, help="Prompts generated per session.")
+    parser.add_argument("--workers", type=int, default=0, help="Processes (default: all cores).")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = parser.parse_args(argv)
+
+    workers = min(args.workers or os.cpu_count() or 1, args.sessions)
+    seeds = [args.seed * 100_003 + i for i in range(args.sessions)]
+    jobs = [(os.path.abspath(args.app), seeds[i::workers], args.flows) for i in range(workers)]
+
+    t0 = time.perf_counter()
+    if workers == 1:
+        results = [run_sessions(jobs[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(run_sessions, jobs))
+    elapsed = time.perf_counter() - t0
+
+    reruns = [t for r in results for t in r["reruns"]]
+    prompts = sum(r["prompts"] for r in results)
+    first = [b for r in results for b in r["first"]]
+    last = [b for r in results for b in r["last"]]
+    busy = max(r["seconds"] for r in results)
+    report = {
+        "sessions": args.sessions,
+        "live_sessions": sum(r["live"] for r in results),
+        "workers": workers,
+        "reruns": len(reruns),
+        "prompts": prompts,
+        "seconds": round(elapsed, 2),
+        "reruns_per_s": round(len(reruns) / busy, 1),
+        "prompts_per_s": round(prompts / busy, 2),
+        "rerun": percentiles(reruns),
+        "download": percentiles([t for r in results for t in r["downloads"]]),
+        "state_kb_first": round(statistics.mean(first) / 1024, 1) if first else 0.0,
+        "state_kb_last": round(statistics.mean(last) / 1024, 1) if last else 0.0,
+        "state_kb_max": round(max(last) / 1024, 1) if last else 0.0,
+        "rss_kb_per_session": round(sum(r["rss_growth"] for r in results) / args.sessions / 1024, 1),
+    }
+    if args.json:
+        print(json.dumps(report))
+    else:
+        for k, v in report.items():
+            print(f"{k:>20}: {v}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+# ------------------------------------------------------------
+# Locale catalogs: compile cost and the price of switching language
+# - Writes N pseudo-translated catalogs (every source string with its
+#   letters accented, placeholders kept) to a temporary directory
+# - Times compiling them into translated tools (once per process) and the
+#   memory the copies add to the registry
+# - Drives the page (AppTest) and compares the rerun after choosing another
+#   tool with the rerun after choosing another language; medians of CPU ms
+# - Checks that a translated prompt renders and validates like the English one
+# - Usage: python benchmarks/locale_switch.py [--locales 4] [--switches 10] [--json]
+# ------------------------------------------------------------
+
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from prompt_builder.core import REGISTRY, assemble_prompt, validate_required  # noqa: E402
+from prompt_builder.i18n import page_texts, source_strings  # noqa: E402
+
+APP = os.path.join(REPO_ROOT, "prompt_builder_v1_1_help_export.py")
+ACCENTS = str.maketrans("aeiouAEIOU", "áéíóúÁÉÍÓÚ")
+PLACEHOLDER_RE = re.compile(r"(\{[A-Za-z_][A-Za-z0-9_]*\})")
+
+
+def pseudo(text: str) -> str:
+    # Accent the letters, leave {Placeholders} alone
+    return "".join(part if PLACEHOLDER_RE.fullmatch(part) else part.translate(ACCENTS)
+                   for part in PLACEHOLDER_RE.split(text))
+
+
+def write_catalogs(directory: str, count: int):
+    strings = {s: pseudo(s) for s in page_texts() + source_strings(REGISTRY)}
+    for i in range(count):
+        with open(os.path.join(directory, f"x{i}.json"), "w", encoding="utf-8") as f:
+            json.dump({"language": f"Pseudo {i}", "strings": strings}, f, ensure_ascii=False)
+
+
+def cpu_ms(at) -> float:
+    t0 = time.process_time()
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return (time.process_time() - t0) * 1000
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure locale catalog compile time and language switch cost.")
+    parser.add_argument("--locales", type=int, default=4)
+    parser.add_argument("--switches", type=int, default=10)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        write_catalogs(tmp, args.locales)
+        os.environ["PROMPT_BUILDER_LOCALES_DIR"] = tmp
+        os.environ["PROMPT_BUILDER_HISTORY_DB"] = ""
+
+        from prompt_builder.i18n import get_locales, locale_tool_names, localized_name
+        from prompt_builder.session import deep_size
+
+        english = dict(REGISTRY)
+        before = deep_size(REGISTRY, set())
+        t0 = time.perf_counter()
+        locales = get_locales()
+        compile_ms = (time.perf_counter() - t0) * 1000
+        added = deep_size(REGISTRY, set()) - before
+
+        name = next(iter(english))
+        answers = {q.id: q.options[0] if q.type == "single" else "xyz" for q in english[name].questions}
+        local = localized_name(name, "x0")
+        local_answers = {q.id: q.options[0] if q.type == "single" else "xyz" for q in REGISTRY[local].questions}
+        missing = validate_required(english[name], {})
+        prompt = assemble_prompt(name, answers, True, False)
+        checks = {
+            "validates": validate_required(REGISTRY[local], {}) == [pseudo(m) for m in missing],
+            "renders": assemble_prompt(local, local_answers, True, False) == pseudo(prompt),
+        }
+
+        from streamlit.testing.v1 import AppTest
+
+        at = AppTest.from_file(APP, default_timeout=60)
+        cpu_ms(at)
+        tool_ms = []
+        locale_ms = []
+        codes = list(locales.languages())
+        for i in range(args.switches):
+            tools = locale_tool_names(at.session_state["locale"])
+            at.selectbox(key="tool").set_value(tools[(i + 1) % len(tools)])
+            tool_ms.append(cpu_ms(at))
+            at.selectbox(key="locale").set_value(codes[(i + 1) % len(codes)])
+            locale_ms.append(cpu_ms(at))
+
+    report = {
+        "locales": args.locales,
+        "tools": len(english),
+        "compile_ms": round(compile_ms, 1),
+        "registry_kb_added": round(added / 1024, 1),
+        "errors": dict(locales.errors),
+        "rerun_tool_switch_ms": round(statistics.median(tool_ms), 1),
+        "rerun_locale_switch_ms": round(statistics.median(locale_ms), 1),
+        **checks,
+    }
+    if args.json:
+        print(json.dumps(report))
+    else:
+        for key, value in report.items():
+            print(f"{key:>24}: {value}")
+    return 0 if all(checks.values()) and not locales.errors else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
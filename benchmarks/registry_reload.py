@@ -0,0 +1,74 @@
+# ------------------------------------------------------------
+# Reload cost of the external tool registry
+# - Writes N tool files (copies of the built-in tools under new names) to a
+#   temporary directory, then times a cold load, a reload with no changes
+#   and a reload after one file was edited
+# - The no-change and one-file reloads should stay flat as N grows
+# - Usage: python benchmarks/registry_reload.py [--tools 500] [--repeat 20]
+# ------------------------------------------------------------
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from prompt_builder.core import BUILTIN_REGISTRY, TOOLS  # noqa: E402
+from prompt_builder.registry import ToolRegistry  # noqa: E402
+
+
+def write_tools(directory: str, count: int):
+    names = list(TOOLS)
+    for i in range(count):
+        base = names[i % len(names)]
+        schema = {"name": f"{base} #{i}", **TOOLS[base]}
+        with open(os.path.join(directory, f"tool_{i:05d}.json"), "w", encoding="utf-8") as f:
+            json.dump(schema, f)
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure external tool registry reload cost.")
+    parser.add_argument("--tools", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        write_tools(directory, args.tools)
+        target = dict(BUILTIN_REGISTRY)
+        registry = ToolRegistry(directory, target=target)
+
+        cold = timed(registry.reload)
+        assert len(target) == len(BUILTIN_REGISTRY) + args.tools, registry.errors
+
+        idle = [timed(registry.reload) for _ in range(args.repeat)]
+
+        edited = os.path.join(directory, "tool_00000.json")
+        one = []
+        for n in range(args.repeat):
+            with open(edited, encoding="utf-8") as f:
+                schema = json.load(f)
+            schema["desc"] = f"edit {n}"
+            with open(edited, "w", encoding="utf-8") as f:
+                json.dump(schema, f)
+            one.append(timed(registry.reload))
+
+    print(f"tools: {args.tools}")
+    print(f"cold load          {cold:8.2f} ms")
+    print(f"reload, no changes {statistics.median(idle):8.2f} ms (median of {args.repeat})")
+    print(f"reload, one edit   {statistics.median(one):8.2f} ms (median of {args.repeat})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+# ------------------------------------------------------------
+# Replay throughput
+# - Writes N exported input payloads (random answers, all tools) to a
+#   temporary directory, then times three runs of prompt_builder.replay:
+#   writing the goldens, an unchanged replay, and a replay after one tool's
+#   template was changed through PROMPT_BUILDER_TOOLS_DIR
+# - Usage: python benchmarks/replay_payloads.py [--payloads 50000] [-j 0]
+# ------------------------------------------------------------
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from prompt_builder.core import REGISTRY, TOOLS  # noqa: E402
+
+CHANGED_TOOL = "Gemini"
+
+
+def write_payloads(directory: str, count: int, seed: int = 7):
+    rng = random.Random(seed)
+    names = list(REGISTRY)
+    for i in range(count):
+        tool_name = names[i % len(names)]
+        answers = {
+            q.id: rng.choice(q.options) if q.type == "single" else f"answer {i} {rng.random():.6f}"
+            for q in REGISTRY[tool_name].questions
+        }
+        payload = {"tool": tool_name, "strict_mode": bool(i % 2), "include_visual_step": False, "answers": answers}
+        sub = os.path.join(directory, f"{i // 1000:03d}")
+        os.makedirs(sub, exist_ok=True)
+        with open(os.path.join(sub, f"{i:06d}.json"), "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+
+
+def replay(payloads: str, golden: str, workers: int, extra=(), env=None):
+    cmd = [sys.executable, "-m", "prompt_builder.replay", payloads, "--golden", golden,
+           "-j", str(workers), "--show", "0", *extra]
+    t0 = time.perf_counter()
+    proc = subprocess.run(cmd, cwd=REPO_ROOT, capture_output=True, text=True, env=env)
+    return time.perf_counter() - t0, proc
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure bulk replay throughput.")
+    parser.add_argument("--payloads", type=int, default=50_000)
+    parser.add_argument("-j", "--workers", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        payloads = os.path.join(tmp, "payloads")
+        golden = os.path.join(tmp, "golden")
+        tools_dir = os.path.join(tmp, "tools")
+        os.makedirs(tools_dir)
+        write_payloads(payloads, args.payloads)
+
+        changed = dict(TOOLS[CHANGED_TOOL], name=CHANGED_TOOL)
+        changed["template"] = changed["template"].replace("Task:", "Your task:", 1)
+        with open(os.path.join(tools_dir, "changed.json"), "w", encoding="utf-8") as f:
+            json.dump(changed, f)
+
+        runs = [
+            ("write goldens", ("--update",), None),
+            ("replay, unchanged", (), None),
+            (f"replay, {CHANGED_TOOL} edited", (), dict(os.environ, PROMPT_BUILDER_TOOLS_DIR=tools_dir)),
+        ]
+        for label, extra, env in runs:
+            seconds, proc = replay(payloads, golden, args.workers, extra, env)
+            print(f"{label:<24} {seconds:6.2f}s  exit {proc.returncode}")
+            print("    " + proc.stdout.strip().splitlines()[-2])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,259 @@
+# ------------------------------------------------------------
+# Benchmark suite
+# - assemble_prompt and validate_required for every tool, answer sizes from
+#   a few bytes to several MB, strict and visual toggled
+# - Token estimates: a full count of the prompt vs. a rerun served from the
+#   per-piece count cache
+# - Lint: one pass of prompt_builder.lint over a rendered prompt
+# - Live preview: one short answer edited on top of answers of each size,
+#   patched incrementally (should stay flat as the prompt grows)
+# - Fan-out: every tool from one answer set, vs. validating and rendering
+#   each tool on its own
+# - A full headless page run per tool (Streamlit AppTest), if installed
+# - Writes machine-readable JSON; --compare fails (exit 1) when any benchmark
+#   is slower than the baseline file by more than --threshold
+#
+# Usage:
+#   python benchmarks/run_benchmarks.py -o new.json
+#   python benchmarks/run_benchmarks.py -o new.json --compare old.json --threshold 0.25
+# ------------------------------------------------------------
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from prompt_builder.core import REGISTRY, assemble_prompt, validate_required  # noqa: E402
+from prompt_builder.fanout import fan_out, get_field_index  # noqa: E402
+from prompt_builder.lint import lint_prompt  # noqa: E402
+from prompt_builder.preview import LivePreview  # noqa: E402
+from prompt_builder.tokens import TokenCounter, count_tokens  # noqa: E402
+
+APP_PATH = os.path.join(REPO_ROOT, "prompt_builder_v1_1_help_export.py")
+
+SIZES = {
+    "8B": 8,
+    "1KB": 1024,
+    "64KB": 64 * 1024,
+    "1MB": 1024 * 1024,
+    "4MB": 4 * 1024 * 1024,
+}
+QUICK_SIZES = ("8B", "64KB", "1MB")
+
+
+def make_answers_for(q, size: int) -> str:
+    if q.type == "single":
+        return q.options[-1]
+    return ("lorem ipsum " * (size // 12 + 1))[:size]
+
+
+def make_answers(tool, size: int) -> dict:
+    return {q.id: make_answers_for(q, size) for q in tool.questions}
+
+
+def time_call(fn, repeats: int, budget: float = 0.2) -> float:
+    # Best per-call time over `repeats` rounds, each looping until ~budget seconds
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - t0
+        if elapsed >= budget / 10 or number >= 1_000_000:
+            break
+        number *= 10
+    best = elapsed / number
+    for _ in range(repeats - 1):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - t0) / number)
+    return best
+
+
+def bench_live_edit(tool_name: str, tool, answers: dict, repeats: int) -> float:
+    # Alternate one short answer between two values; each call re-renders
+    # the placeholders that read it and rebuilds the piece list
+    qid = tool.questions[-1].id
+    preview = LivePreview(tool_name)
+    preview.update(answers)
+    edits = [dict(answers, **{qid: "edit a"}), dict(answers, **{qid: "edit b"})]
+    state = [0]
+
+    def edit():
+        state[0] ^= 1
+        preview.update(edits[state[0]])
+        preview.chunks(True, False)
+
+    return time_call(edit, repeats)
+
+
+def bench_core(sizes, repeats: int) -> dict:
+    results = {}
+    for tool_name, tool in REGISTRY.items():
+        visual_options = (False, True) if tool.visual_block else (False,)
+        for size_name in sizes:
+            answers = make_answers(tool, SIZES[size_name])
+            results[f"validate/{tool_name}/{size_name}"] = time_call(
+                lambda: validate_required(tool, answers), repeats
+            )
+            for strict in (False, True):
+                for visual in visual_options:
+                    name = f"assemble/{tool_name}/{size_name}/strict={int(strict)}/visual={int(visual)}"
+                    results[name] = time_call(
+                        lambda: assemble_prompt(tool_name, answers, strict_mode=strict, include_visual=visual),
+                        repeats,
+                    )
+            prompt = assemble_prompt(tool_name, answers, strict_mode=True, include_visual=False)
+            results[f"tokens/full/{tool_name}/{size_name}"] = time_call(lambda: count_tokens(prompt), repeats)
+            results[f"lint/{tool_name}/{size_name}"] = time_call(lambda: lint_prompt(tool, prompt, answers), repeats)
+            counter = TokenCounter()
+            results[f"tokens/cached/{tool_name}/{size_name}"] = time_call(
+                lambda: counter.prompt_tokens(tool_name, answers, True, False), repeats
+            )
+            results[f"preview/update/{tool_name}/{size_name}"] = bench_live_edit(tool_name, tool, answers, repeats)
+    return results
+
+
+def bench_fanout(sizes, repeats: int) -> dict:
+    results = {}
+    plan = get_field_index().plan(list(REGISTRY))
+    for size_name in sizes:
+        size = SIZES[size_name]
+        shared = {q.id: make_answers_for(q, size) for q in plan.shared}
+        own = {name: {q.id: make_answers_for(q, size) for q in plan.own[name]} for name in plan.tools}
+        per_tool = {name: {**own[name], **{qid: shared[qid] for qid, tools in plan.shared_tools.items() if name in tools}}
+                    for name in plan.tools}
+        counter = TokenCounter()
+
+        def each_tool():
+            # Keeps every prompt, like fan_out does
+            out = {}
+            for name, answers in per_tool.items():
+                missing = validate_required(REGISTRY[name], answers)
+                if not missing:
+                    out[name] = (
+                        assemble_prompt(name, answers, strict_mode=True, include_visual=False),
+                        counter.prompt_tokens(name, answers, True, False),
+                    )
+            return out
+
+        results[f"fanout/all/{size_name}"] = time_call(
+            lambda: fan_out(plan, shared, own, True, False, counter=counter), repeats
+        )
+        results[f"fanout/per-tool/{size_name}"] = time_call(each_tool, repeats)
+    return results
+
+
+def bench_app(repeats: int) -> dict:
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        print("streamlit not installed; skipping page benchmarks", file=sys.stderr)
+        return {}
+
+    results = {}
+    for tool_name, tool in REGISTRY.items():
+        best_load = best_generate = float("inf")
+        for _ in range(repeats):
+            at = AppTest.from_file(APP_PATH, default_timeout=60)
+            t0 = time.perf_counter()
+            at.run()
+            best_load = min(best_load, time.perf_counter() - t0)
+
+            next(w for w in at.selectbox if w.label == "Select a tool/category").select(tool_name)
+            at.run()
+            answers = make_answers(tool, 64)
+            for q in tool.questions:
+                if q.type == "text":
+                    next(w for w in at.text_input if w.label == q.label).input(answers[q.id])
+            next(b for b in at.button if b.label == "Generate Prompt").click()
+            t0 = time.perf_counter()
+            at.run()
+            best_generate = min(best_generate, time.perf_counter() - t0)
+            if at.exception:
+                raise RuntimeError(f"{tool_name}: {at.exception[0].message}")
+        results[f"page/{tool_name}/load"] = best_load
+        results[f"page/{tool_name}/generate"] = best_generate
+    return results
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def compare(current: dict, baseline: dict, threshold: float, min_delta: float = 0.0) -> list:
+    # min_delta (seconds) ignores timer noise on sub-microsecond benchmarks
+    regressions = []
+    for name, seconds in sorted(current.items()):
+        old = baseline.get(name)
+        if not old or seconds - old < min_delta:
+            continue
+        ratio = seconds / old
+        if ratio > 1 + threshold:
+            regressions.append((name, old, seconds, ratio))
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run the Prompt Builder benchmark suite.")
+    parser.add_argument("-o", "--output", help="Write results JSON here (default: stdout).")
+    parser.add_argument("--compare", help="Baseline results JSON to compare against.")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown ratio, e.g. 0.25 = 25%%.")
+    parser.add_argument("--min-delta-us", type=float, default=1.0,
+                        help="Ignore slowdowns smaller than this many microseconds.")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--quick", action="store_true", help="Fewer answer sizes.")
+    parser.add_argument("--no-page", action="store_true", help="Skip the headless Streamlit page runs.")
+    args = parser.parse_args(argv)
+
+    sizes = QUICK_SIZES if args.quick else tuple(SIZES)
+    results = bench_core(sizes, args.repeats)
+    results.update(bench_fanout(sizes, args.repeats))
+    if not args.no_page:
+        results.update(bench_app(max(1, args.repeats // 2)))
+
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "unit": "seconds per call",
+        },
+        "results": results,
+    }
+    data = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(data + "\n")
+        print(f"wrote {len(results)} results to {args.output}", file=sys.stderr)
+    else:
+        print(data)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold, args.min_delta_us / 1e6)
+        for name, old, new, ratio in regressions:
+            print(f"REGRESSION {name}: {old * 1e6:.1f} us -> {new * 1e6:.1f} us ({ratio:.2f}x)", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"no regressions above {args.threshold:.0%} vs {args.compare}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+# ------------------------------------------------------------
+# Tool search latency at large registry sizes
+# - Builds N tools (the built-in ones under new names, each with a few
+#   words of its own so the vocabulary grows like a real registry)
+# - Times the index build, a refresh with no changes and a refresh after one
+#   tool was replaced
+# - Times queries: exact words, prefixes (typing in progress), one-typo words
+#   and two-word queries; p50/p95 per kind, next to a plain scan that
+#   substring-matches every tool's text on each query (no typo tolerance)
+# - Usage: python benchmarks/tool_search.py [--tools 1000] [--queries 500]
+# ------------------------------------------------------------
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from prompt_builder.core import TOOLS  # noqa: E402
+from prompt_builder.schema import compile_tool  # noqa: E402
+from prompt_builder.search import ToolIndex  # noqa: E402
+
+SYLLABLES = "ka lo mi ra sen tor vel qua dri fen bal cor nim pax zu ter lum gor fi san".split()
+
+
+def make_lexicon(rng: random.Random, size: int) -> list:
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def make_registry(rng: random.Random, count: int, lexicon: list) -> dict:
+    names = list(TOOLS)
+    registry = {}
+    for i in range(count):
+        base = TOOLS[names[i % len(names)]]
+        own = rng.sample(lexicon, 6)
+        name = f"{own[0].capitalize()} {names[i % len(names)]} {i}"
+        schema = dict(base, desc=f"{base['desc']} {' '.join(own[1:4])}")
+        schema["questions"] = [dict(q, help=f"{q.get('help') or ''} {own[4]}") for q in base["questions"]]
+        schema["questions"][0]["label"] += f" ({own[5]})"
+        registry[name] = compile_tool(name, schema)
+    return registry
+
+
+def typo(rng: random.Random, word: str) -> str:
+    i = rng.randrange(len(word) - 1)
+    kind = rng.randrange(3)
+    if kind == 0:
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]   # swap
+    if kind == 1:
+        return word[:i] + word[i + 1:]                          # drop
+    return word[:i] + rng.choice("aeiou") + word[i + 1:]         # substitute
+
+
+def scan_search(texts: dict, query: str) -> list:
+    # The flat-list approach: lowercase substring test over every tool
+    words = query.lower().split()
+    return [name for name, text in texts.items() if all(w in text for w in words)]
+
+
+def timed_ms(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return (time.perf_counter() - t0) * 1000
+
+
+def summary(values: list) -> str:
+    values = sorted(values)
+    p95 = values[min(len(values) - 1, int(len(values) * 0.95))]
+    return f"p50 {statistics.median(values):7.3f} ms  p95 {p95:7.3f} ms"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure tool search index build and query latency.")
+    parser.add_argument("--tools", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    lexicon = make_lexicon(rng, max(args.tools * 3, 1000))
+    registry = make_registry(rng, args.tools, lexicon)
+
+    index = ToolIndex()
+    build = timed_ms(lambda: index.refresh(registry))
+    idle = statistics.median(timed_ms(lambda: index.refresh(registry)) for _ in range(20))
+    edited = dict(registry)
+    name = next(iter(edited))
+    edited[name] = make_registry(rng, 1, lexicon).popitem()[1]
+    one = timed_ms(lambda: index.refresh(edited))
+    index.refresh(registry)
+
+    vocabulary = [t for t in index.postings if len(t) >= 5]
+    queries = {
+        "exact": [rng.choice(vocabulary) for _ in range(args.queries)],
+        "prefix": [w[:rng.randint(2, 4)] for w in (rng.choice(vocabulary) for _ in range(args.queries))],
+        "typo": [typo(rng, rng.choice(vocabulary)) for _ in range(args.queries)],
+        "two words": [f"{rng.choice(vocabulary)} {rng.choice(vocabulary)}" for _ in range(args.queries)],
+    }
+    texts = {
+        n: " ".join([n, t.desc, t.who] + [f"{q.label} {q.help or ''} {' '.join(q.options)}" for q in t.questions]).lower()
+        for n, t in registry.items()
+    }
+
+    print(f"tools: {args.tools}, indexed terms: {len(index.postings)}")
+    print(f"build              {build:8.2f} ms")
+    print(f"refresh, no change {idle:8.3f} ms")
+    print(f"refresh, one tool  {one:8.3f} ms")
+    for kind, batch in queries.items():
+        hits = 0
+        indexed = []
+        for q in batch:
+            t0 = time.perf_counter()
+            hits += bool(index.search(q, limit=20))
+            indexed.append((time.perf_counter() - t0) * 1000)
+        scanned = [timed_ms(lambda: scan_search(texts, q)) for q in batch]
+        print(f"{kind:<10} index {summary(indexed)}  found {hits / len(batch):4.0%}   scan {summary(scanned)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
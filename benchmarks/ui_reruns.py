@@ -0,0 +1,99 @@
+# ------------------------------------------------------------
+# Reruns and server CPU per completed prompt (headless, via AppTest)
+# - Drives the page like a user: pick a tool, type every text answer,
+#   click "Generate Prompt"
+# - Counts the script runs a browser would trigger: widgets outside a form
+#   rerun on every committed edit, widgets inside a form only on submit
+# - Reports reruns and CPU ms per completed prompt, per tool
+# - Usage: python benchmarks/ui_reruns.py [--app path/to/page.py] [--json]
+# ------------------------------------------------------------
+
+import argparse
+import json
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from prompt_builder.core import TOOLS  # noqa: E402
+
+DEFAULT_APP = os.path.join(REPO_ROOT, "prompt_builder_v1_1_help_export.py")
+
+
+class Session:
+    def __init__(self, app_path: str):
+        self.at = AppTest.from_file(app_path, default_timeout=60)
+        self.reruns = 0
+        self.cpu = 0.0
+
+    def run(self):
+        t0 = time.process_time()
+        self.at.run()
+        self.cpu += time.process_time() - t0
+        self.reruns += 1
+        if self.at.exception:
+            raise RuntimeError(self.at.exception[0].message)
+
+    def interact(self, widget):
+        # A widget inside a form only stages its value; the browser reruns
+        # the script for widgets outside a form.
+        if not getattr(widget, "form_id", ""):
+            self.run()
+
+
+def complete_prompt(app_path: str, tool_name: str) -> dict:
+    s = Session(app_path)
+    s.run()  # page load
+
+    tool_select = next(w for w in s.at.selectbox if w.label == "Select a tool/category")
+    if tool_select.value != tool_name:
+        tool_select.select(tool_name)
+        s.interact(tool_select)
+
+    for q in TOOLS[tool_name]["questions"]:
+        if q["type"] != "text":
+            continue
+        widget = next(w for w in s.at.text_input if w.label == q["label"])
+        widget.input(f"Sample answer for {q['id']}")
+        s.interact(widget)
+
+    button = next(b for b in s.at.button if b.label == "Generate Prompt")
+    button.click()
+    s.run()
+    if "last" not in s.at.session_state:
+        raise RuntimeError(f"{tool_name}: no prompt generated")
+
+    return {"tool": tool_name, "reruns": s.reruns, "cpu_ms": round(s.cpu * 1000, 2)}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure reruns and CPU per completed prompt.")
+    parser.add_argument("--app", default=DEFAULT_APP, help="Streamlit page to drive.")
+    parser.add_argument("--repeat", type=int, default=3, help="Flows per tool; the median CPU is reported.")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = parser.parse_args(argv)
+
+    rows = []
+    for tool_name in TOOLS:
+        runs = [complete_prompt(os.path.abspath(args.app), tool_name) for _ in range(args.repeat)]
+        runs.sort(key=lambda r: r["cpu_ms"])
+        rows.append(runs[len(runs) // 2])
+
+    if args.json:
+        print(json.dumps(rows))
+        return 0
+    print(f"{'tool':<20} {'reruns':>7} {'cpu_ms':>9}")
+    for r in rows:
+        print(f"{r['tool']:<20} {r['reruns']:>7} {r['cpu_ms']:>9.2f}")
+    total_reruns = sum(r["reruns"] for r in rows)
+    total_cpu = sum(r["cpu_ms"] for r in rows)
+    print(f"{'mean':<20} {total_reruns / len(rows):>7.1f} {total_cpu / len(rows):>9.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
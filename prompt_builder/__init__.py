@@ -0,0 +1,15 @@
+# Importable Prompt Builder core (no Streamlit dependency).
+from prompt_builder.core import REGISTRY, STRICT_RULES, TOOLS, assemble_prompt, validate_required
+from prompt_builder.schema import Question, SchemaError, Tool, compile_registry
+
+__all__ = [
+    "REGISTRY",
+    "STRICT_RULES",
+    "TOOLS",
+    "Question",
+    "SchemaError",
+    "Tool",
+    "assemble_prompt",
+    "compile_registry",
+    "validate_required",
+]
@@ -0,0 +1,369 @@
+# ------------------------------------------------------------
+# Deduplicated prompt archive
+# - One file holds many generated prompts. Tool definitions (template,
+#   questions, blocks) and boilerplate text (STRICT_RULES, visual blocks)
+#   are written once each and addressed by a content hash; every prompt is
+#   a short record of tool, flags, timestamp and its answers in question
+#   order ("single" answers as option indexes)
+# - Prompts are rebuilt on read from the stored definitions, so an archive
+#   reads back the prompts it was written with even after the live
+#   templates change
+# - JSON lines, gzip-compressed unless the file name is not *.gz. Appending
+#   scans the definitions already in the file and adds a gzip member, so
+#   neither writing, appending nor reading holds the archive in memory
+#
+# Line kinds:
+#   {"archive": "prompt_builder", "version": 2}        starts a new ref table
+#   {"ref": 0, "hash": ..., "text": ...}               boilerplate text
+#   {"ref": 1, "hash": ..., "tool": ..., "schema": {...}, "visual": 0}
+#   [tool ref, strict rules ref or null, visual 0/1, generated_at or null, answer, ...]
+#   (an answer is a string, an option index, null for a null answer, or
+#   false when it was not given; version 1 wrote null for both, and reads
+#   back as not given)
+#
+# Usage:
+#   python -m prompt_builder.archive pack inputs.jsonl -o prompts.jsonl.gz [--append]
+#   python -m prompt_builder.archive unpack prompts.jsonl.gz -o prompts.jsonl
+# ------------------------------------------------------------
+
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import sys
+
+from prompt_builder.core import (
+    REGISTRY,
+    STRICT_RULES,
+    non_bool_flags,
+    non_string_answers,
+    tool_chunks,
+    validate_required,
+)
+from prompt_builder.registry import load_tools
+from prompt_builder.schema import compile_tool, tool_schema
+
+VERSION = 2
+READ_VERSIONS = (1, 2)
+HEADER = {"archive": "prompt_builder", "version": VERSION}
+# Level 3 is close to level 6 in size at about twice the speed
+COMPRESS_LEVEL = 3
+ARCHIVE_MIME = "application/gzip"
+ARCHIVE_EXT = ".jsonl.gz"
+
+
+class ArchiveError(ValueError):
+    pass
+
+
+def content_hash(value) -> str:
+    data = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.blake2b(data.encode("utf-8"), digest_size=8).hexdigest()
+
+
+_encode_line = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+def _answer_codes(tool) -> tuple:
+    # (question id, {option: index} or None) per question, in order
+    return tuple(
+        (q.id, {option: i for i, option in reversed(list(enumerate(q.options)))} if q.type == "single" else None)
+        for q in tool.questions
+    )
+
+
+def _open_read(source):
+    # (text stream over the archive's decompressed lines, file it reads from)
+    f = open(source, "rb") if isinstance(source, str) else source
+    head = f.peek(2)[:2] if hasattr(f, "peek") else None
+    if head is None:
+        head = f.read(2)
+        f.seek(0)
+    stream = gzip.GzipFile(fileobj=f, mode="rb") if head == b"\x1f\x8b" else f
+    return io.TextIOWrapper(stream, encoding="utf-8"), f
+
+
+def _close_read(text, f, source):
+    # Leaves a caller's file object open
+    if f is source:
+        text.detach()
+    else:
+        text.close()
+        f.close()
+
+
+class ArchiveWriter:
+    """Writes prompts to an archive; a path or a binary file object."""
+
+    def __init__(self, target, compress: bool = None, append: bool = False,
+                 compress_level: int = COMPRESS_LEVEL):
+        self._refs = {}       # content hash -> ref
+        self._tools = {}      # id(Tool) -> (Tool, ref, answer codes)
+        self._strict = None   # (strict rules text, ref) last used
+        self._next_ref = 0
+        self.count = 0
+        fresh = True
+        if isinstance(target, str):
+            if append:
+                try:
+                    fresh, gzipped = self._scan(target)
+                except FileNotFoundError:
+                    pass
+                else:
+                    if gzipped is not None:
+                        compress = gzipped
+            self._raw = open(target, "ab" if append else "wb")
+            self._close_raw = True
+            if compress is None:
+                compress = target.endswith(".gz")
+        else:
+            self._raw = target
+            self._close_raw = False
+            if compress is None:
+                compress = True
+        self._gzip = gzip.GzipFile(fileobj=self._raw, mode="wb", compresslevel=compress_level) if compress else None
+        self._out = io.TextIOWrapper(self._gzip or self._raw, encoding="utf-8", newline="\n")
+        if fresh:
+            self._line(HEADER)
+
+    def _scan(self, path: str) -> tuple:
+        # Loads the ref table an existing archive ends with; (needs a header,
+        # gzipped or None when empty). An archive that ends in an older
+        # version gets a new header, and with it a new ref table
+        text, raw = _open_read(path)
+        try:
+            gzipped = text.buffer is not raw
+            empty = True
+            version = VERSION
+            for line in text:
+                empty = False
+                if line.startswith("{"):
+                    entry = json.loads(line)
+                    if "archive" in entry:
+                        version = _check_header(entry)
+                        self._refs = {}
+                        self._next_ref = 0
+                    else:
+                        self._refs[entry["hash"]] = entry["ref"]
+                        self._next_ref = max(self._next_ref, entry["ref"] + 1)
+            if empty:
+                return True, None
+            if version != VERSION:
+                self._refs = {}
+                self._next_ref = 0
+                return True, gzipped
+            return False, gzipped
+        finally:
+            _close_read(text, raw, path)
+
+    def _line(self, value):
+        self._out.write(_encode_line(value) + "\n")
+
+    def _define(self, key: str, entry: dict) -> int:
+        ref = self._refs.get(key)
+        if ref is None:
+            ref = self._refs[key] = self._next_ref
+            self._next_ref += 1
+            self._line({"ref": ref, "hash": key, **entry})
+        return ref
+
+    def _text_ref(self, text: str) -> int:
+        return self._define(content_hash(["text", text]), {"text": text})
+
+    def _tool_entry(self, tool) -> tuple:
+        entry = self._tools.get(id(tool))
+        if entry is None or entry[0] is not tool:
+            # The visual block and strict rules are stored as texts of their own
+            schema = tool_schema(tool)
+            schema.pop("visual_block", None)
+            schema.pop("strict_rules", None)
+            visual = self._text_ref(tool.visual_block) if tool.visual_block else None
+            visual_hash = content_hash(["text", tool.visual_block]) if tool.visual_block else None
+            key = content_hash(["tool", tool.name, schema, visual_hash])
+            ref = self._define(key, {"tool": tool.name, "schema": schema, "visual": visual})
+            entry = self._tools[id(tool)] = (tool, ref, _answer_codes(tool))
+        return entry
+
+    def add(self, tool_name: str, answers: dict, strict_mode: bool, include_visual: bool, generated_at=None):
+        tool = REGISTRY.get(tool_name)
+        if tool is None:
+            raise ArchiveError(f"unknown tool: {tool_name!r}")
+        _, ref, codes = self._tool_entry(tool)
+        strict = None
+        if strict_mode:
+            rules = tool.strict_rules or STRICT_RULES
+            if self._strict is None or self._strict[0] is not rules:
+                self._strict = (rules, self._text_ref(rules))
+            strict = self._strict[1]
+        record = [ref, strict, 1 if include_visual and tool.visual_block else 0, generated_at]
+        for qid, options in codes:
+            if qid not in answers:
+                record.append(False)
+                continue
+            v = answers[qid]
+            if v is not None:
+                if not isinstance(v, str):
+                    v = str(v)
+                if options is not None:
+                    v = options.get(v, v)
+            record.append(v)
+        self._line(record)
+        self.count += 1
+
+    def close(self):
+        self._out.flush()
+        self._out.detach()
+        if self._gzip is not None:
+            self._gzip.close()
+        if self._close_raw:
+            self._raw.close()
+        else:
+            self._raw.flush()
+
+
+def _check_header(entry: dict) -> int:
+    if entry.get("archive") != HEADER["archive"] or entry.get("version") not in READ_VERSIONS:
+        raise ArchiveError(f"unsupported archive header: {entry}")
+    return entry["version"]
+
+
+def iter_archive(source, prompts: bool = True):
+    """Yield every archived prompt as a payload dict, rebuilding "prompt" unless prompts=False."""
+    text, raw = _open_read(source)
+    texts = {}   # ref -> text
+    tools = {}   # ref -> compiled Tool
+    version = VERSION
+    try:
+        for line_no, line in enumerate(text, start=1):
+            try:
+                value = json.loads(line)
+            except ValueError as exc:
+                raise ArchiveError(f"line {line_no}: invalid JSON: {exc}")
+            if isinstance(value, list):
+                yield _decode(value, tools, texts, prompts, line_no, version)
+            elif "archive" in value:
+                version = _check_header(value)
+                texts.clear()
+                tools.clear()
+            else:
+                _load_definition(value, tools, texts, line_no)
+    finally:
+        _close_read(text, raw, source)
+
+
+def _load_definition(entry: dict, tools: dict, texts: dict, line_no: int):
+    if "text" in entry:
+        key = content_hash(["text", entry["text"]])
+        texts[entry["ref"]] = entry["text"]
+    else:
+        visual = texts[entry["visual"]] if entry.get("visual") is not None else None
+        key = content_hash(["tool", entry["tool"], entry["schema"],
+                            content_hash(["text", visual]) if visual else None])
+        tools[entry["ref"]] = compile_tool(entry["tool"], dict(entry["schema"], visual_block=visual))
+    if key != entry["hash"]:
+        raise ArchiveError(f"line {line_no}: content does not match its hash {entry['hash']}")
+
+
+def _decode(record: list, tools: dict, texts: dict, prompts: bool, line_no: int, version: int = VERSION) -> dict:
+    try:
+        tool = tools[record[0]]
+        strict_rules = texts[record[1]] if record[1] is not None else None
+    except KeyError as exc:
+        raise ArchiveError(f"line {line_no}: undefined ref {exc}")
+    answers = {}
+    for q, v in zip(tool.questions, record[4:]):
+        if v is False or (v is None and version < 2):
+            continue
+        answers[q.id] = q.options[v] if type(v) is int else v
+    payload = {
+        "tool": tool.name,
+        "strict_mode": strict_rules is not None,
+        "include_visual_step": bool(record[2]),
+        "answers": answers,
+        "generated_at": record[3],
+    }
+    if prompts:
+        payload["prompt"] = "".join(
+            tool_chunks(tool, answers, strict_rules is not None, bool(record[2]), strict_rules)
+        )
+    return payload
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m prompt_builder.archive",
+        description="Pack Prompt Builder input payloads into a deduplicated archive, or unpack one.",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    pack = sub.add_parser("pack", help="Add JSONL input payloads to an archive.")
+    pack.add_argument("input", nargs="?", default="-", help="JSONL input file (default: stdin).")
+    pack.add_argument("-o", "--output", required=True, help="Archive file (gzip unless it does not end in .gz).")
+    pack.add_argument("--append", action="store_true", help="Add to an existing archive instead of replacing it.")
+    unpack = sub.add_parser("unpack", help="Write the archived prompts as JSONL.")
+    unpack.add_argument("archive")
+    unpack.add_argument("-o", "--output", default="-", help="JSONL output file (default: stdout).")
+    unpack.add_argument("--no-prompts", action="store_true", help="Only the inputs; do not rebuild the prompts.")
+    args = parser.parse_args(argv)
+
+    load_tools()
+    if args.command == "unpack":
+        out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+        count = 0
+        try:
+            for payload in iter_archive(args.archive, prompts=not args.no_prompts):
+                out.write(json.dumps(payload, ensure_ascii=False) + "\n")
+                count += 1
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        print(f"unpacked {count} prompts", file=sys.stderr)
+        return 0
+
+    lines = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    writer = ArchiveWriter(args.output, append=args.append)
+    errors = 0
+    try:
+        for line_no, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                try:
+                    payload = json.loads(line)
+                except ValueError as exc:
+                    raise ArchiveError(f"invalid JSON: {exc}")
+                if not isinstance(payload, dict) or not isinstance(payload.get("answers"), dict):
+                    raise ArchiveError("not an input payload")
+                tool_name = payload.get("tool")
+                if not isinstance(tool_name, str):
+                    raise ArchiveError("tool must be a string")
+                bad = non_string_answers(payload["answers"])
+                if bad:
+                    raise ArchiveError(f"answers must be strings: {', '.join(bad)}")
+                bad = non_bool_flags(payload)
+                if bad:
+                    raise ArchiveError(f"flags must be true or false: {', '.join(bad)}")
+                if tool_name in REGISTRY:
+                    missing = validate_required(REGISTRY[tool_name], payload["answers"])
+                    if missing:
+                        raise ArchiveError(f"missing required fields: {', '.join(missing)}")
+                writer.add(
+                    tool_name,
+                    payload["answers"],
+                    payload.get("strict_mode", True),
+                    payload.get("include_visual_step", False),
+                    payload.get("generated_at"),
+                )
+            except ValueError as exc:
+                errors += 1
+                print(f"line {line_no}: {exc}", file=sys.stderr)
+    finally:
+        writer.close()
+        if lines is not sys.stdin:
+            lines.close()
+    print(f"archived {writer.count} prompts, {errors} invalid records", file=sys.stderr)
+    return 1 if errors and not writer.count else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,246 @@
+# ------------------------------------------------------------
+# Batch prompt generation
+# - Reads "Download Inputs (.json)" payloads, one JSON object per line,
+#   from a file or stdin
+# - Validates and renders them on a process pool in bounded chunks, so
+#   memory stays flat no matter how large the input is
+# - Streams prompts to JSONL (file or stdout), a directory of .txt files or
+#   a zip of .txt files;
+#   invalid records go to a separate error stream instead of aborting the run
+# - Rendered prompts are linted (prompt_builder.lint); issues go into the
+#   JSONL result as "lint"
+#
+# Usage:
+#   python -m prompt_builder.batch inputs.jsonl -o prompts.jsonl --errors errors.jsonl
+#   cat inputs.jsonl | python -m prompt_builder.batch --out-dir prompts/
+#   python -m prompt_builder.batch inputs.jsonl --zip prompts.zip
+# ------------------------------------------------------------
+
+import argparse
+import itertools
+import json
+import os
+import sys
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from prompt_builder.core import REGISTRY, assemble_prompt, non_bool_flags, non_string_answers, validate_required
+from prompt_builder.lint import LINT_ENABLED, lint_prompt
+from prompt_builder.registry import load_tools
+from prompt_builder.tokens import estimate_tokens
+
+
+def render_prompt(record) -> dict:
+    # Validates and renders one record: {"ok": True, "tool", "prompt"} or an
+    # error result. No token count and no lint, for callers that only need
+    # the prompt (replay)
+    if not isinstance(record, dict):
+        return {"ok": False, "error": "record is not a JSON object"}
+
+    tool_name = record.get("tool")
+    if not isinstance(tool_name, str):
+        return {"ok": False, "error": "tool must be a string"}
+    if tool_name not in REGISTRY:
+        return {"ok": False, "tool": tool_name, "error": f"unknown tool: {tool_name!r}"}
+
+    answers = record.get("answers")
+    if not isinstance(answers, dict):
+        return {"ok": False, "tool": tool_name, "error": "answers must be a JSON object"}
+    bad = non_string_answers(answers)
+    if bad:
+        return {"ok": False, "tool": tool_name, "error": "answers must be strings", "fields": bad}
+    bad = non_bool_flags(record)
+    if bad:
+        return {"ok": False, "tool": tool_name, "error": "flags must be true or false", "fields": bad}
+
+    missing = validate_required(REGISTRY[tool_name], answers)
+    if missing:
+        return {"ok": False, "tool": tool_name, "error": "missing required fields", "missing": missing}
+
+    prompt = assemble_prompt(
+        tool_name,
+        answers,
+        record.get("strict_mode", True),
+        record.get("include_visual_step", False),
+    )
+    return {"ok": True, "tool": tool_name, "prompt": prompt}
+
+
+def render_record(record) -> dict:
+    # render_prompt() plus the token estimate and lint issues
+    result = render_prompt(record)
+    if not result["ok"]:
+        return result
+    tool_name = result["tool"]
+    answers = record["answers"]
+    result["tokens"] = estimate_tokens(
+        tool_name, answers, record.get("strict_mode", True), record.get("include_visual_step", False)
+    )
+    if LINT_ENABLED:
+        issues = lint_prompt(REGISTRY[tool_name], result["prompt"], answers)
+        if issues:
+            result["lint"] = issues
+    return result
+
+
+def render_lines(chunk: list) -> list:
+    # Runs in a worker: chunk is a list of (line_no, raw_line)
+    results = []
+    for line_no, raw in chunk:
+        try:
+            record = json.loads(raw)
+        except ValueError as exc:
+            result = {"ok": False, "error": f"invalid JSON: {exc}"}
+        else:
+            result = render_record(record)
+        result["line"] = line_no
+        results.append(result)
+    return results
+
+
+def iter_chunks(lines, chunk_size: int):
+    numbered = ((n, line) for n, line in enumerate(lines, start=1) if line.strip())
+    while True:
+        chunk = list(itertools.islice(numbered, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def map_chunks(fn, chunks, workers: int = 0):
+    """Yield fn(chunk) for every chunk, in order, on a process pool."""
+    workers = workers or os.cpu_count() or 1
+    load_tools()
+
+    if workers == 1:
+        for chunk in chunks:
+            yield fn(chunk)
+        return
+
+    # Keep at most 2 chunks per worker in flight; the rest of the input is
+    # not read until earlier results have been written out.
+    max_pending = workers * 2
+    # Workers load PROMPT_BUILDER_TOOLS_DIR (and locales) themselves in case they are spawned
+    with ProcessPoolExecutor(max_workers=workers, initializer=load_tools) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(fn, chunk))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def run_batch(lines, workers: int = 0, chunk_size: int = 256):
+    """Yield one result dict per non-blank input line, in input order."""
+    for results in map_chunks(render_lines, iter_chunks(lines, chunk_size), workers):
+        yield from results
+
+
+def prompt_file_name(result: dict) -> str:
+    safe_tool = result["tool"].replace(" ", "_").lower()
+    return f"prompt_{safe_tool}_{result['line']:08d}.txt"
+
+
+class TxtDirWriter:
+    def __init__(self, out_dir: str):
+        self.out_dir = out_dir
+        os.makedirs(out_dir, exist_ok=True)
+
+    def write(self, result: dict):
+        path = os.path.join(self.out_dir, prompt_file_name(result))
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(result["prompt"])
+
+    def close(self):
+        pass
+
+
+class ZipWriter:
+    # One deflated .txt entry per prompt, written as results arrive; the
+    # target can be a path or any seekable binary file object
+    def __init__(self, target):
+        self.zip = zipfile.ZipFile(target, "w", compression=zipfile.ZIP_DEFLATED)
+
+    def write(self, result: dict):
+        self.zip.writestr(prompt_file_name(result), result["prompt"])
+
+    def close(self):
+        # Writes the central directory; a file object target stays open
+        self.zip.close()
+
+
+class JsonlWriter:
+    def __init__(self, stream, close_stream: bool):
+        self.stream = stream
+        self.close_stream = close_stream
+
+    def write(self, result: dict):
+        self.stream.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+    def close(self):
+        if self.close_stream:
+            self.stream.close()
+        else:
+            self.stream.flush()
+
+
+def open_jsonl(path, default_stream):
+    if path in (None, "-"):
+        return JsonlWriter(default_stream, close_stream=False)
+    return JsonlWriter(open(path, "w", encoding="utf-8"), close_stream=True)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m prompt_builder.batch",
+        description="Render prompts for a JSONL file of Prompt Builder input payloads.",
+    )
+    parser.add_argument("input", nargs="?", default="-", help="JSONL input file (default: stdin).")
+    out = parser.add_mutually_exclusive_group()
+    out.add_argument("-o", "--output", default="-", help="JSONL output file (default: stdout).")
+    out.add_argument("--out-dir", help="Write one .txt file per prompt into this directory instead of JSONL.")
+    out.add_argument("--zip", help="Write one .txt file per prompt into this zip archive instead of JSONL.")
+    parser.add_argument("--errors", default=None, help="JSONL file for invalid records (default: stderr).")
+    parser.add_argument("-j", "--workers", type=int, default=0, help="Worker processes (default: all cores).")
+    parser.add_argument("--chunk-size", type=int, default=256, help="Records per worker task.")
+    args = parser.parse_args(argv)
+
+    if args.input == "-":
+        lines = sys.stdin
+    else:
+        lines = open(args.input, encoding="utf-8")
+
+    if args.out_dir:
+        writer = TxtDirWriter(args.out_dir)
+    elif args.zip:
+        writer = ZipWriter(args.zip)
+    else:
+        writer = open_jsonl(args.output, sys.stdout)
+    errors = open_jsonl(args.errors, sys.stderr)
+
+    ok_count = 0
+    err_count = 0
+    lint_count = 0
+    try:
+        for result in run_batch(lines, workers=args.workers, chunk_size=args.chunk_size):
+            if result.pop("ok"):
+                writer.write(result)
+                ok_count += 1
+                lint_count += "lint" in result
+            else:
+                errors.write(result)
+                err_count += 1
+    finally:
+        writer.close()
+        errors.close()
+        if lines is not sys.stdin:
+            lines.close()
+
+    print(f"rendered {ok_count} prompts ({lint_count} with lint issues), {err_count} invalid records", file=sys.stderr)
+    return 1 if err_count and not ok_count else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
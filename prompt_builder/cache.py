@@ -0,0 +1,128 @@
+# ------------------------------------------------------------
+# Shared render cache
+# - Memoizes assemble_prompt on (tool, normalized answers, strict, visual)
+# - One process-wide instance, so every Streamlit session shares it
+# - LRU eviction with an entry limit, a memory ceiling and an optional TTL
+# - Counters (hits, misses, evictions, bytes held) for sizing
+#
+# Configure through environment variables:
+#   PROMPT_BUILDER_CACHE_ENTRIES   max entries          (default 4096)
+#   PROMPT_BUILDER_CACHE_BYTES     memory ceiling       (default 64 MiB)
+#   PROMPT_BUILDER_CACHE_TTL       seconds, 0 = no TTL  (default 0)
+# ------------------------------------------------------------
+
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from prompt_builder.core import REGISTRY, assemble_prompt
+
+
+def cache_key(tool_name: str, answers: dict, strict_mode: bool, include_visual: bool) -> tuple:
+    # Only answers the template reads are part of the key, so unrelated keys
+    # (or a visual toggle on a tool without a visual block) still hit. The
+    # fingerprint changes whenever a reloaded tool renders differently.
+    # Non-string values keep their type: None and "None" (or 0 and "0")
+    # render differently in computed blocks.
+    tool = REGISTRY[tool_name]
+    normalized = tuple(sorted(
+        (k, v if isinstance(v, str) else (type(v).__name__, str(v)))
+        for k, v in answers.items()
+        if k in tool.inputs
+    ))
+    visual = bool(include_visual) and bool(tool.visual_block)
+    return tool_name, tool.fingerprint, normalized, bool(strict_mode), visual
+
+
+def entry_size(key: tuple, prompt: str) -> int:
+    size = sys.getsizeof(prompt)
+    for k, v in key[2]:
+        size += sys.getsizeof(k) + sys.getsizeof(v)
+    return size
+
+
+class RenderCache:
+    def __init__(self, max_entries: int = 4096, max_bytes: int = 64 * 1024 * 1024, ttl: float = 0.0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (prompt, size, stored_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.bytes = 0
+
+    def get(self, key: tuple):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            prompt, size, stored_at = entry
+            if self.ttl and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self.bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return prompt
+
+    def put(self, key: tuple, prompt: str):
+        size = entry_size(key, prompt)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self._entries[key] = (prompt, size, time.monotonic())
+            self.bytes += size
+            while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+RENDER_CACHE = RenderCache(
+    max_entries=int(os.environ.get("PROMPT_BUILDER_CACHE_ENTRIES", "4096")),
+    max_bytes=int(os.environ.get("PROMPT_BUILDER_CACHE_BYTES", str(64 * 1024 * 1024))),
+    ttl=float(os.environ.get("PROMPT_BUILDER_CACHE_TTL", "0")),
+)
+
+
+def cached_assemble_prompt(tool_name: str, answers: dict, strict_mode: bool, include_visual: bool,
+                           cache: RenderCache = None) -> str:
+    cache = RENDER_CACHE if cache is None else cache
+    key = cache_key(tool_name, answers, strict_mode, include_visual)
+    prompt = cache.get(key)
+    if prompt is None:
+        prompt = assemble_prompt(tool_name, answers, strict_mode=strict_mode, include_visual=include_visual)
+        cache.put(key, prompt)
+    return prompt
@@ -0,0 +1,591 @@
+# ------------------------------------------------------------
+# Prompt Builder core
+# - Tool schemas (TOOLS), validation and prompt rendering
+# - No UI imports and no side effects at import time, so batch jobs,
+#   workers and tests can use it without loading Streamlit
+# ------------------------------------------------------------
+
+import threading
+
+from prompt_builder.schema import Tool, compile_registry
+
+STRICT_RULES = """Strict rules (recommended):
+- Do not invent facts, names, features, prices, or statistics.
+- If required information is missing, ask up to 3 clarifying questions before proceeding.
+- Clearly label any assumptions.
+- Prefer accuracy and clarity over creativity.
+"""
+
+PODCAST_NOTICE = (
+    "NOTE (Podcast planning):\n"
+    "- Podcast Mode inside this Prompt Builder is marked as COMING SOON.\n"
+    "- For now, use this prompt to create a podcast plan grounded in your sources.\n"
+    "- Ask for an episode outline, talking points, and a script draft.\n"
+    "- Clearly separate what is sourced vs. what is suggested.\n"
+)
+
+TOOLS = {
+    "ChatGPT": {
+        "desc": "For writing, planning, brainstorming, and structured outputs.",
+        "who": "Creators, marketers, students, and builders who want clear output with constraints.",
+        "token_budget": 128_000,
+        "questions": [
+            {
+                "id": "Goal",
+                "label": "What do you want ChatGPT to produce?",
+                "type": "text",
+                "help": "One sentence is enough. Example: 'Write a LinkedIn post announcing Prompt Builder.'",
+                "ph": "E.g., Write a LinkedIn post announcing Prompt Builder."
+            },
+            {
+                "id": "Audience",
+                "label": "Who is this for?",
+                "type": "text",
+                "help": "Example: 'Beginners exploring AI tools' or 'Small business owners'.",
+                "ph": "E.g., Beginners exploring AI tools"
+            },
+            {
+                "id": "Tone",
+                "label": "Tone",
+                "type": "single",
+                "options": ["Neutral", "Professional", "Friendly", "Direct (no fluff)", "Persuasive"],
+                "help": "Pick the voice you want in the output."
+            },
+            {
+                "id": "Format",
+                "label": "Output format",
+                "type": "single",
+                "options": ["Bullets", "Numbered steps", "Short paragraphs", "Checklist", "Table"],
+                "help": "How should the answer be structured?"
+            },
+            {
+                "id": "Constraints",
+                "label": "Any constraints or must-includes?",
+                "type": "text",
+                "help": "Optional, but helpful. Example: 'Include 3 bullet benefits and a call-to-action.'",
+                "ph": "E.g., Include 3 benefits and a call-to-action.",
+                "optional": True
+            },
+            {
+                "id": "Role",
+                "label": "Role (optional)",
+                "type": "text",
+                "help": "Optional: 'marketing strategist', 'copy editor', 'product manager'. Leave blank if unsure.",
+                "ph": "E.g., marketing strategist",
+                "optional": True
+            },
+        ],
+        "blocks": {
+            # Only when Role is filled in
+            "ROLE_BLOCK": {"source": "Role", "format": "Act as: {value}\n\n"},
+        },
+        "template": """{ROLE_BLOCK}Task:
+{Goal}
+
+Audience:
+{Audience}
+
+Tone:
+{Tone}
+
+Format:
+{Format}
+
+Constraints / must-includes:
+{Constraints}
+"""
+    },
+
+    "Gemini": {
+        "desc": "For structured workflows, calendars, plans, and multi-step outputs.",
+        "who": "Anyone who wants a reusable workflow or a structured plan.",
+        "token_budget": 1_000_000,
+        "questions": [
+            {
+                "id": "Task",
+                "label": "What should Gemini do?",
+                "type": "text",
+                "help": "Example: 'Create a 2-week LinkedIn content calendar for Prompt Builder.'",
+                "ph": "E.g., Create a 2-week LinkedIn content calendar for Prompt Builder."
+            },
+            {
+                "id": "Goal",
+                "label": "What does success look like?",
+                "type": "text",
+                "help": "Example: 'A day-by-day calendar with post ideas and short outlines.'",
+                "ph": "E.g., Day-by-day calendar with post ideas and short outlines."
+            },
+            {
+                "id": "Structure",
+                "label": "Preferred structure",
+                "type": "single",
+                "options": ["Numbered steps", "Outline", "Table", "Headings + bullets"],
+                "help": "How should Gemini format the output?"
+            },
+            {
+                "id": "Detail",
+                "label": "Detail level",
+                "type": "single",
+                "options": ["High-level", "Practical detail", "Very detailed"],
+                "help": "How much detail do you want?"
+            },
+            {
+                "id": "Constraints",
+                "label": "Constraints (optional)",
+                "type": "text",
+                "help": "Example: 'No jargon, include examples, keep each post under 1200 characters.'",
+                "ph": "E.g., No jargon; include examples; keep it short.",
+                "optional": True
+            },
+        ],
+        "template": """Task:
+{Task}
+
+Success criteria:
+{Goal}
+
+Structure:
+{Structure}
+
+Detail level:
+{Detail}
+
+Constraints:
+{Constraints}
+""",
+        "visual_block": """Optional visual creative step (Flow / Nano Banana Pro workflow):
+- Create a short creative brief for one supporting image that matches the task above.
+- Provide 2 image prompt variations.
+- Do NOT assume brand colors, logos, or assets.
+- If visual inputs (brand colors, product name, style) are missing, ask first.
+"""
+    },
+
+    "NotebookLM": {
+        "desc": "For source-based research and step-by-step learning grounded in your uploaded sources.",
+        "who": "People who want grounded output that stays tied to their sources.",
+        "token_budget": 500_000,
+        "questions": [
+            {
+                "id": "UseCase",
+                "label": "What are you using NotebookLM for?",
+                "type": "single",
+                "options": [
+                    "Research a topic from my sources",
+                    "Learn step-by-step from my sources",
+                    "Create a plan/blueprint from my sources",
+                    "Podcast planning (coming soon)"
+                ],
+                "help": "Pick the closest match. Podcast planning is shown as 'coming soon' to be honest and avoid confusion."
+            },
+            {
+                "id": "Sources",
+                "label": "What sources will you add to NotebookLM?",
+                "type": "single",
+                "options": ["PDF(s)", "Google Doc(s)", "Web articles", "Mixed sources"],
+                "help": "NotebookLM works best when you upload the sources first."
+            },
+            {
+                "id": "Goal",
+                "label": "What do you want NotebookLM to produce from your sources?",
+                "type": "text",
+                "help": "Be specific. Example: 'Summarize and produce a step-by-step launch checklist.'",
+                "ph": "E.g., Summarize my notes and produce a step-by-step checklist."
+            },
+            {
+                "id": "Experience",
+                "label": "Your experience level",
+                "type": "single",
+                "options": ["Beginner", "Intermediate", "Advanced"],
+                "help": "This controls how technical the explanations should be."
+            },
+            {
+                "id": "StepMode",
+                "label": "How should it guide you?",
+                "type": "single",
+                "options": ["One stage at a time (type 'next')", "All at once"],
+                "help": "The transcript demonstrated the 'type next' approach."
+            },
+        ],
+        "blocks": {
+            "PODCAST_NOTICE": {"source": "UseCase", "contains": "Podcast planning", "text": PODCAST_NOTICE},
+        },
+        "template": """You are an AI research assistant using ONLY my provided sources in NotebookLM.
+
+My sources type:
+{Sources}
+
+My goal:
+{Goal}
+
+My experience level:
+{Experience}
+
+Guidance mode:
+{StepMode}
+
+Rules:
+- Use my sources first. Stay grounded in them.
+- If something is missing from my sources, ask up to 3 clarifying questions.
+- Clearly label anything that is not supported by sources.
+
+Use case:
+{UseCase}
+
+{PODCAST_NOTICE}
+"""
+    },
+
+    "Gemini Gems": {
+        "desc": "For creating a focused, reusable assistant with boundaries (a ‘Gem’).",
+        "who": "Users who want a reusable assistant that stays focused on one job.",
+        "token_budget": 1_000_000,
+        "questions": [
+            {
+                "id": "GemName",
+                "label": "Name your Gem",
+                "type": "text",
+                "help": "Example: 'Email Calendar Helper' or 'LinkedIn Post Assistant'.",
+                "ph": "E.g., LinkedIn Post Assistant"
+            },
+            {
+                "id": "Role",
+                "label": "What role should it play?",
+                "type": "text",
+                "help": "Example: 'Act as a social media marketing assistant.'",
+                "ph": "E.g., Act as a social media marketing assistant."
+            },
+            {
+                "id": "Scope",
+                "label": "What is it allowed to do?",
+                "type": "text",
+                "help": "Keep it narrow and clear. Example: 'Create outlines and calendars; don't write final copy unless asked.'",
+                "ph": "E.g., Create outlines + calendars; don't write final copy unless asked."
+            },
+            {
+                "id": "Avoid",
+                "label": "What should it NOT do?",
+                "type": "text",
+                "help": "Example: 'Do not guess; ask questions when unclear; no legal advice.'",
+                "ph": "E.g., Do not invent facts; ask questions when unclear."
+            },
+            {
+                "id": "OutputStyle",
+                "label": "Preferred output style",
+                "type": "single",
+                "options": ["Bullets", "Numbered steps", "Table", "Short paragraphs"],
+                "help": "How you want the Gem to respond by default."
+            },
+        ],
+        "template": """Create a Gemini Gem with the following configuration.
+
+Gem name:
+{GemName}
+
+Role:
+{Role}
+
+Allowed scope:
+{Scope}
+
+Must NOT do:
+{Avoid}
+
+Default output style:
+{OutputStyle}
+
+Before starting, confirm you understand the role and boundaries.
+"""
+    },
+
+    "Google AI Studio": {
+        "desc": "For generating small web apps/tools when you provide clear inputs and outputs.",
+        "who": "Builders who want small functional utilities (calculators, generators, simple tools).",
+        "token_budget": 1_000_000,
+        "questions": [
+            {
+                "id": "AppType",
+                "label": "What type of app do you want to build?",
+                "type": "single",
+                "options": ["Calculator", "Generator", "Form-based tool", "Dashboard"],
+                "help": "Pick the closest match."
+            },
+            {
+                "id": "Users",
+                "label": "Who is the app for?",
+                "type": "text",
+                "help": "Example: 'investors', 'students', 'small business owners'.",
+                "ph": "E.g., small business owners"
+            },
+            {
+                "id": "Problem",
+                "label": "What problem does this app solve?",
+                "type": "text",
+                "help": "One sentence. Example: 'Estimate monthly taxes from a portfolio.'",
+                "ph": "E.g., Estimate monthly costs from user inputs."
+            },
+            {
+                "id": "Inputs",
+                "label": "What inputs does the user provide?",
+                "type": "text",
+                "help": "List the fields. Example: 'income, expenses, tax rate'.",
+                "ph": "E.g., income, rent, utilities, food, transport"
+            },
+            {
+                "id": "Outputs",
+                "label": "What outputs should the app show?",
+                "type": "text",
+                "help": "Example: 'total + breakdown table + chart'.",
+                "ph": "E.g., total + breakdown table"
+            },
+            {
+                "id": "Constraints",
+                "label": "Build constraints",
+                "type": "single",
+                "options": ["Fully functional + input validation", "Minimal demo only", "Explain logic with comments"],
+                "help": "Choose how robust it should be."
+            },
+        ],
+        "template": """Build a {AppType} web app.
+
+Target users:
+{Users}
+
+Problem to solve:
+{Problem}
+
+Inputs (fields and types):
+{Inputs}
+
+Outputs (what to show):
+{Outputs}
+
+Constraints:
+{Constraints}
+
+Requirements:
+- Provide complete working code.
+- Validate inputs and handle edge cases.
+- Ask clarifying questions only if required details are missing.
+"""
+    },
+
+    "Google Antigravity": {
+        "desc": "For reframing a problem and breaking mental blocks before execution.",
+        "who": "Anyone who feels stuck and wants better angles before taking action.",
+        "token_budget": 1_000_000,
+        "questions": [
+            {
+                "id": "Situation",
+                "label": "Describe the situation",
+                "type": "text",
+                "help": "1–3 sentences about what’s going on.",
+                "ph": "E.g., I want to grow my tool but I’m unsure what to focus on first."
+            },
+            {
+                "id": "Outcome",
+                "label": "What outcome do you want?",
+                "type": "text",
+                "help": "Example: 'Give me 5 alternative approaches and the best next step.'",
+                "ph": "E.g., Give me 5 alternative approaches and the best next step."
+            },
+            {
+                "id": "Pushback",
+                "label": "How hard should it challenge assumptions?",
+                "type": "single",
+                "options": ["Gentle", "Balanced", "Hard pushback"],
+                "help": "Pick how direct you want it to be."
+            },
+            {
+                "id": "Constraints",
+                "label": "Constraints (optional)",
+                "type": "text",
+                "help": "Example: 'No therapy tone. No pep talk. Just practical reframes.'",
+                "ph": "E.g., No pep talk; give practical reframes.",
+                "optional": True
+            },
+        ],
+        "template": """You are a reframing assistant.
+
+Situation:
+{Situation}
+
+Desired outcome:
+{Outcome}
+
+Challenge level:
+{Pushback}
+
+Constraints:
+{Constraints}
+
+Instructions:
+- Challenge assumptions and propose alternative perspectives.
+- Focus on reframing and options, not execution.
+- If anything is unclear, ask up to 3 clarifying questions before proceeding.
+"""
+    },
+}
+
+
+# -------------------------
+# Compiled registry
+# -------------------------
+# TOOLS is compiled once at import into frozen Tool/Question objects with
+# precomputed template segments and required-field lists (see schema.py).
+# Rendering is a single join over the segments; answer text is never
+# scanned again, so a value like "{Goal}" is emitted verbatim.
+
+# Built-in tools. REGISTRY starts as a copy and is updated through
+# publish_tools() when tool files (prompt_builder.registry) or locale
+# catalogs (prompt_builder.i18n) are loaded. Lookups (REGISTRY[name], `in`)
+# are safe at any time; code that iterates the tools uses registry_view(),
+# so a reload in another session cannot change the dict under it.
+BUILTIN_REGISTRY = compile_registry(TOOLS)
+REGISTRY = dict(BUILTIN_REGISTRY)
+_view = dict(REGISTRY)
+_publish_lock = threading.Lock()
+
+
+def registry_view(registry: dict = None) -> dict:
+    # The tools to iterate, in registry order. For REGISTRY (the default),
+    # the dict published last: replaced on every publish, never changed, so
+    # take it once and iterate it freely. Any other dict is copied.
+    if registry is None or registry is REGISTRY:
+        return _view
+    return dict(registry)
+
+
+def publish_tools(target: dict, tools: dict):
+    # Makes target hold exactly `tools`; names already there keep their place
+    global _view
+    with _publish_lock:
+        target.update(tools)
+        for name in [n for n in target if n not in tools]:
+            del target[name]
+        if target is REGISTRY:
+            _view = dict(REGISTRY)
+
+
+def validate_required(tool_schema, answers: dict):
+    # Accepts a compiled Tool (fast path) or a raw TOOLS-style dict
+    if isinstance(tool_schema, Tool):
+        required = tool_schema.required_text
+    else:
+        required = [
+            (q["id"], q.get("label", q["id"]))
+            for q in tool_schema["questions"]
+            if not q.get("optional") and q.get("type") == "text"
+        ]
+    return [label for qid, label in required if not (answers.get(qid, "") or "").strip()]
+
+
+def non_string_answers(answers: dict) -> list:
+    # Answer ids whose value is neither a string nor null (e.g. numbers from JSON);
+    # validation and rendering only handle text
+    return sorted(str(qid) for qid, v in answers.items() if v is not None and not isinstance(v, str))
+
+
+def non_bool_flags(payload: dict) -> list:
+    # Payload flags given with a value other than true/false (e.g. "false",
+    # which bool() would read as true); an absent flag takes its default
+    return [flag for flag in ("strict_mode", "include_visual_step")
+            if flag in payload and not isinstance(payload[flag], bool)]
+
+
+def _strip_pieces(pieces: list):
+    # Equivalent to "".join(pieces).strip(), but only touches the edge pieces.
+    i = 0
+    while i < len(pieces):
+        pieces[i] = pieces[i].lstrip()
+        if pieces[i]:
+            break
+        i += 1
+    j = len(pieces) - 1
+    while j >= i:
+        pieces[j] = pieces[j].rstrip()
+        if pieces[j]:
+            break
+        j -= 1
+    return pieces
+
+
+def _block_text(block, answers: dict) -> str:
+    # Computed blocks (ROLE_BLOCK, PODCAST_NOTICE, ...) declared in a tool's "blocks"
+    v = answers.get(block.source, "") or ""
+    if not isinstance(v, str):
+        v = str(v)
+    if block.contains is not None:
+        active = block.contains in v
+    else:
+        v = v.strip()
+        active = bool(v)
+    if not active:
+        return ""
+    if block.format is not None:
+        return block.format.replace("{value}", v)
+    return block.text
+
+
+def render_field(tool, field: str, answers: dict) -> str:
+    # The text one template placeholder renders to
+    if field in tool.blocks:
+        return _block_text(tool.blocks[field], answers)
+    if field in answers:
+        v = answers[field]
+        return v if isinstance(v, str) else str(v)
+    # Unknown ids stay as literal "{id}" tokens
+    return "{" + field + "}"
+
+
+def finish_pieces(tool, pieces: list, strict_mode: bool, include_visual: bool,
+                  strict_rules: str = None) -> list:
+    # Strips the filled template and appends the optional trailers, in place
+    _strip_pieces(pieces)
+
+    trailers = []
+    # Optional Gemini visual step
+    if include_visual and tool.visual_block:
+        trailers.append(tool.visual_block)
+    # Strict mode
+    if strict_mode:
+        trailers.append(strict_rules or tool.strict_rules or STRICT_RULES)
+
+    for block in trailers:
+        block = block.rstrip()
+        if not block:
+            continue
+        if any(pieces):
+            pieces.append("\n\n")
+        else:
+            block = block.lstrip()
+        pieces.append(block)
+
+    pieces.append("\n")
+    return pieces
+
+
+def prompt_chunks(tool_name: str, answers: dict, strict_mode: bool, include_visual: bool) -> list:
+    # The prompt as a list of pieces that reference the template segments and
+    # answer strings (no copies); "".join() of it is the rendered prompt.
+    return tool_chunks(REGISTRY[tool_name], answers, strict_mode, include_visual)
+
+
+def tool_chunks(tool, answers: dict, strict_mode: bool, include_visual: bool,
+                strict_rules: str = None) -> list:
+    # prompt_chunks() for a compiled Tool that need not be in the registry
+    literals = tool.literals
+
+    pieces = [literals[0]]
+    for field, literal in zip(tool.fields, literals[1:]):
+        pieces.append(render_field(tool, field, answers))
+        pieces.append(literal)
+    return finish_pieces(tool, pieces, strict_mode, include_visual, strict_rules)
+
+
+def iter_prompt_chunks(tool_name: str, answers: dict, strict_mode: bool, include_visual: bool):
+    return iter(prompt_chunks(tool_name, answers, strict_mode, include_visual))
+
+
+def assemble_prompt(tool_name: str, answers: dict, strict_mode: bool, include_visual: bool) -> str:
+    return "".join(prompt_chunks(tool_name, answers, strict_mode, include_visual))
@@ -0,0 +1,134 @@
+# ------------------------------------------------------------
+# Multi-tool fan-out
+# - A cross-tool field index (question id -> every tool that asks it) built
+#   once per registry state
+# - plan() splits the selected tools' questions into shared fields, asked
+#   once, and each tool's own questions; an id is shared when at least two
+#   selected tools ask it with the same type and options
+# - fan_out() renders every selected tool in one pass: shared answers are
+#   normalized and checked once, then referenced (not copied) by each tool
+# ------------------------------------------------------------
+
+import re
+import threading
+
+from prompt_builder.core import REGISTRY, prompt_chunks, registry_view
+from prompt_builder.schema import Question
+from prompt_builder.tokens import TOKEN_COUNTER
+
+
+def _shared_label(qid: str) -> str:
+    # "UseCase" -> "Use case"
+    words = re.sub(r"(?<=[a-z0-9])(?=[A-Z])", " ", qid).split()
+    return " ".join([words[0]] + [w.lower() for w in words[1:]]) if words else qid
+
+
+class FanoutPlan:
+    __slots__ = ("tools", "shared", "shared_tools", "own")
+
+    def __init__(self, tools: tuple, shared: tuple, shared_tools: dict, own: dict):
+        self.tools = tools                # selected tool names, in registry order
+        self.shared = shared              # Question per shared id
+        self.shared_tools = shared_tools  # shared id -> tool names that read it
+        self.own = own                    # tool name -> questions asked for that tool only
+
+
+class FieldIndex:
+    def __init__(self, registry: dict):
+        self.registry = registry  # a registry_view(); never changed
+        self._tools = tuple(registry.values())
+        self.by_id = {}  # question id -> ((tool name, Question), ...)
+        for tool in self._tools:
+            for q in tool.questions:
+                self.by_id.setdefault(q.id, []).append((tool.name, q))
+        self.by_id = {qid: tuple(entries) for qid, entries in self.by_id.items()}
+
+    def is_current(self, registry: dict) -> bool:
+        tools = self._tools
+        return len(tools) == len(registry) and all(a is b for a, b in zip(tools, registry.values()))
+
+    def plan(self, tool_names) -> FanoutPlan:
+        wanted = set(tool_names)
+        selected = [name for name in self.registry if name in wanted]
+        chosen = set(selected)
+        shared = []
+        shared_tools = {}
+        shared_pairs = set()
+        for qid, entries in self.by_id.items():
+            groups = {}
+            for name, q in entries:
+                if name in chosen:
+                    groups.setdefault((q.type, q.options), []).append((name, q))
+            if not groups:
+                continue
+            # Largest group of compatible questions; ties go to registry order
+            group = max(groups.values(), key=len)
+            if len(group) < 2:
+                continue
+            first = group[0][1]
+            shared.append(Question(
+                id=qid,
+                label=_shared_label(qid),
+                type=first.type,
+                help="\n".join(f"{name}: {q.label}" for name, q in group),
+                ph=first.ph,
+                options=first.options,
+                optional=all(q.optional for _, q in group),
+            ))
+            shared_tools[qid] = tuple(name for name, _ in group)
+            shared_pairs.update((name, qid) for name, _ in group)
+        own = {
+            name: tuple(q for q in self.registry[name].questions if (name, q.id) not in shared_pairs)
+            for name in selected
+        }
+        return FanoutPlan(tuple(selected), tuple(shared), shared_tools, own)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_field_index() -> FieldIndex:
+    # Rebuilt only when the registry changed (e.g. a tool file was reloaded)
+    global _index
+    with _index_lock:
+        registry = registry_view()
+        if _index is None or not _index.is_current(registry):
+            _index = FieldIndex(registry)
+        return _index
+
+
+def fan_out(plan: FanoutPlan, shared_answers: dict, own_answers: dict, strict_mode: bool, include_visual: bool,
+            counter=TOKEN_COUNTER) -> dict:
+    """{tool name: {"prompt": str or None, "missing": [labels], "tokens": int}} for every planned tool."""
+    # Shared work, once: normalize shared answers and note which are filled
+    shared = {}
+    filled = {}
+    for qid in plan.shared_tools:
+        v = shared_answers.get(qid, "") or ""
+        if not isinstance(v, str):
+            v = str(v)
+        shared[qid] = v
+        filled[qid] = bool(v.strip())
+
+    results = {}
+    for name in plan.tools:
+        tool = REGISTRY[name]
+        answers = dict(own_answers.get(name, {}))
+        uses_shared = [qid for qid, tools in plan.shared_tools.items() if name in tools]
+        for qid in uses_shared:
+            answers[qid] = shared[qid]
+        missing = [
+            label for qid, label in tool.required_text
+            if not (filled[qid] if qid in uses_shared else (answers.get(qid, "") or "").strip())
+        ]
+        if missing:
+            results[name] = {"prompt": None, "missing": missing, "tokens": 0}
+            continue
+        chunks = prompt_chunks(name, answers, strict_mode, include_visual)
+        results[name] = {
+            "prompt": "".join(chunks),
+            "missing": [],
+            "tokens": counter.chunks_tokens(tool, chunks),
+        }
+    return results
@@ -0,0 +1,240 @@
+# ------------------------------------------------------------
+# Prompt history (embedded SQLite)
+# - Every generated prompt is stored with its tool, timestamp and a content
+#   hash of (tool, answers, strict, visual); the hash is unique, so an exact
+#   duplicate submission is served from the store instead of rebuilt
+# - Paginated listing uses keyset pagination on (created_at, id) and returns
+#   only a short preview; the full prompt is loaded when an entry is opened
+# - Writes from all sessions go through one writer thread that commits in
+#   batches (WAL mode), so concurrent sessions never fight over the lock
+# - The store is shared by every session of the process: anyone using the
+#   page can list and restore every stored prompt and its answers. It is
+#   off unless a path is set; turn it on only where all users may see each
+#   other's inputs (a personal or team-internal deployment)
+# - Entries older than the age limit, and the oldest beyond the size limit,
+#   are pruned by the writer thread (at most once per PRUNE_INTERVAL)
+#
+# Configure through environment variables:
+#   PROMPT_BUILDER_HISTORY_DB            database path (default: unset, history off)
+#   PROMPT_BUILDER_HISTORY_MAX_ENTRIES   entries kept, 0 = no limit  (default 10000)
+#   PROMPT_BUILDER_HISTORY_MAX_DAYS      days kept, 0 = no limit     (default 30)
+# ------------------------------------------------------------
+
+import hashlib
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from prompt_builder.cache import cache_key
+
+PREVIEW_CHARS = 160
+WRITE_BATCH = 256
+PRUNE_INTERVAL = 60.0
+MAX_ENTRIES = int(os.environ.get("PROMPT_BUILDER_HISTORY_MAX_ENTRIES", "10000"))
+MAX_DAYS = float(os.environ.get("PROMPT_BUILDER_HISTORY_MAX_DAYS", "30"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS prompts (
+    id          INTEGER PRIMARY KEY,
+    answers_hash TEXT NOT NULL UNIQUE,
+    tool        TEXT NOT NULL,
+    created_at  REAL NOT NULL,
+    strict_mode INTEGER NOT NULL,
+    include_visual INTEGER NOT NULL,
+    answers     TEXT NOT NULL,
+    preview     TEXT NOT NULL,
+    prompt      TEXT NOT NULL,
+    uses        INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS prompts_tool_created ON prompts (tool, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS prompts_created ON prompts (created_at DESC, id DESC);
+"""
+
+UPSERT = """
+INSERT INTO prompts (answers_hash, tool, created_at, strict_mode, include_visual, answers, preview, prompt)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (answers_hash) DO UPDATE SET created_at = excluded.created_at, uses = uses + 1
+"""
+
+
+def answers_hash(tool_name: str, answers: dict, strict_mode: bool, include_visual: bool) -> str:
+    # Same normalization as the render cache, so equal prompts hash equally
+    key = cache_key(tool_name, answers, strict_mode, include_visual)
+    return hashlib.sha256(json.dumps(key, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class HistoryStore:
+    def __init__(self, path: str, max_entries: int = MAX_ENTRIES, max_days: float = MAX_DAYS):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_days = max_days
+        self._last_prune = 0.0
+        self._local = threading.local()
+        self._queue = queue.Queue()
+        self._writer = None
+        self._writer_lock = threading.Lock()
+        self.write_errors = 0
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+        self.prune()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # -- reads (any thread) -------------------------------------------------
+
+    def lookup(self, key_hash: str):
+        # (entry id, prompt) of a stored duplicate, or None
+        row = self._conn().execute(
+            "SELECT id, prompt FROM prompts WHERE answers_hash = ?", (key_hash,)
+        ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def page(self, tool_name: str = None, before: tuple = None, limit: int = 20) -> list:
+        # Newest first; pass the last row's (created_at, id) as `before` for the next page
+        sql = "SELECT id, tool, created_at, preview, uses FROM prompts"
+        where = []
+        params = []
+        if tool_name:
+            where.append("tool = ?")
+            params.append(tool_name)
+        if before:
+            where.append("(created_at, id) < (?, ?)")
+            params.extend(before)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY created_at DESC, id DESC LIMIT ?"
+        params.append(limit)
+        return [
+            {"id": r[0], "tool": r[1], "created_at": r[2], "preview": r[3], "uses": r[4]}
+            for r in self._conn().execute(sql, params)
+        ]
+
+    def get(self, entry_id: int):
+        row = self._conn().execute(
+            "SELECT tool, created_at, strict_mode, include_visual, answers, prompt FROM prompts WHERE id = ?",
+            (entry_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            "id": entry_id,
+            "tool": row[0],
+            "created_at": row[1],
+            "strict_mode": bool(row[2]),
+            "include_visual": bool(row[3]),
+            "answers": json.loads(row[4]),
+            "prompt": row[5],
+        }
+
+    def iter_entries(self, tool_name: str = None):
+        # Oldest first, without the prompt text; rows are fetched as iterated
+        sql = "SELECT id, tool, created_at, strict_mode, include_visual, answers FROM prompts"
+        params = ()
+        if tool_name:
+            sql += " WHERE tool = ?"
+            params = (tool_name,)
+        for row in self._conn().execute(sql + " ORDER BY created_at, id", params):
+            yield {
+                "id": row[0],
+                "tool": row[1],
+                "created_at": row[2],
+                "strict_mode": bool(row[3]),
+                "include_visual": bool(row[4]),
+                "answers": json.loads(row[5]),
+            }
+
+    def count(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM prompts").fetchone()[0]
+
+    # -- writes (queued, one writer thread) ---------------------------------
+
+    def prune(self) -> int:
+        # Drops entries past the age and size limits; returns how many
+        self._last_prune = time.monotonic()
+        conn = self._conn()
+        removed = 0
+        with conn:
+            if self.max_days > 0:
+                cutoff = time.time() - self.max_days * 86400
+                removed += conn.execute("DELETE FROM prompts WHERE created_at < ?", (cutoff,)).rowcount
+            if self.max_entries > 0:
+                removed += conn.execute(
+                    "DELETE FROM prompts WHERE id IN "
+                    "(SELECT id FROM prompts ORDER BY created_at DESC, id DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                ).rowcount
+        return removed
+
+    def record(self, tool_name: str, answers: dict, strict_mode: bool, include_visual: bool, prompt: str,
+               key_hash: str = None):
+        key_hash = key_hash or answers_hash(tool_name, answers, strict_mode, include_visual)
+        self._queue.put((
+            key_hash,
+            tool_name,
+            time.time(),
+            int(bool(strict_mode)),
+            int(bool(include_visual)),
+            json.dumps(answers, ensure_ascii=False),
+            " ".join(prompt[:PREVIEW_CHARS].split()),
+            prompt,
+        ))
+        self._ensure_writer()
+
+    def flush(self):
+        # Block until every queued write is committed
+        self._queue.join()
+
+    def _ensure_writer(self):
+        if self._writer is not None:
+            return
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name="prompt-history-writer", daemon=True)
+                self._writer.start()
+
+    def _write_loop(self):
+        conn = self._conn()
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < WRITE_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                with conn:
+                    conn.executemany(UPSERT, batch)
+                if time.monotonic() - self._last_prune >= PRUNE_INTERVAL:
+                    self.prune()
+            except sqlite3.Error:
+                # History is best-effort: drop the batch, keep serving prompts
+                self.write_errors += len(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    # Process-wide store shared by all sessions; None when history is disabled
+    global _store
+    path = os.environ.get("PROMPT_BUILDER_HISTORY_DB", "")
+    if not path:
+        return None
+    with _store_lock:
+        if _store is None or _store.path != path:
+            _store = HistoryStore(path)
+        return _store
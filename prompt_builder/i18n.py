@@ -0,0 +1,362 @@
+# ------------------------------------------------------------
+# Localization
+# - A locale catalog maps English source strings to translations: tool
+#   descriptions, question labels, help, placeholders and options,
+#   templates, blocks, the visual block, STRICT_RULES and the page texts.
+#   Strings a catalog lacks stay English
+# - Catalogs are compiled once per process: each tool gets a translated,
+#   compiled copy in REGISTRY under a name of its own ("ChatGPT [de]"), so
+#   validation, rendering, caches and history work unchanged. A session
+#   switches language by picking the other names, like picking a tool
+# - <locale>.json ({"language": ..., "strings": {source: translation}}) or
+#   a gettext <locale>.mo file; both are read only while compiling
+# - A catalog, or a tool whose translation does not compile (e.g. a
+#   template that lost a placeholder), is reported in .errors; that tool
+#   stays English in that locale
+# - Translated tools are kept by (locale, catalog hash, source tool), so a
+#   cold-start snapshot (prompt_builder.snapshot) can hand them over
+#
+# Configure through environment variables:
+#   PROMPT_BUILDER_LOCALES_DIR   directory of catalogs (unset = English only)
+#
+# Usage (a catalog to fill in: every source string, empty translations):
+#   python -m prompt_builder.i18n extract > de.json
+# ------------------------------------------------------------
+
+import argparse
+import ast
+import gettext
+import hashlib
+import io
+import json
+import os
+import sys
+import threading
+
+from prompt_builder.core import REGISTRY, STRICT_RULES, publish_tools, registry_view
+from prompt_builder.schema import SchemaError, compile_tool, tool_schema
+from prompt_builder.snapshot import get_snapshot
+
+DEFAULT_LOCALE = "en"
+DEFAULT_LANGUAGE = "English"
+EXTENSIONS = (".json", ".mo")
+
+# Page constants translated by their English text; extract reads them from
+# the page script
+PAGE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         "prompt_builder_v1_1_help_export.py")
+PAGE_TEXTS = ("APP_TAGLINE", "APP_SUBTEXT")
+
+
+class CatalogError(ValueError):
+    pass
+
+
+# localized tool name -> (source tool name, locale), for every name ever made
+_localized = {}
+
+
+def localized_name(name: str, locale: str) -> str:
+    if locale == DEFAULT_LOCALE:
+        return name
+    localized = f"{name} [{locale}]"
+    _localized.setdefault(localized, (name, locale))
+    return localized
+
+
+def base_name(name: str) -> str:
+    # The source tool's name; the name itself for an English tool
+    entry = _localized.get(name)
+    return name if entry is None else entry[0]
+
+
+def locale_tool_names(locale: str, registry: dict = None) -> list:
+    # Tool names a session in this locale sees, in registry order: the
+    # translated tool where there is one, else the English one
+    registry = registry_view(registry)
+    names = []
+    for name in registry:
+        if name in _localized:
+            continue
+        localized = localized_name(name, locale)
+        names.append(localized if localized in registry else name)
+    return names
+
+
+def translate_answer(q_from, q_to, value):
+    # A "single" answer becomes the option at the same index; text stays
+    if q_from.type == "single" and q_to.type == "single" and value in q_from.options:
+        i = q_from.options.index(value)
+        if i < len(q_to.options):
+            return q_to.options[i]
+    return value
+
+
+class Catalog:
+    __slots__ = ("locale", "language", "digest", "_lookup")
+
+    def __init__(self, locale: str, language: str, lookup, digest: str = ""):
+        self.locale = locale
+        self.language = language
+        self.digest = digest    # hash of the catalog file
+        self._lookup = lookup
+
+    def translate(self, text):
+        # Empty and missing translations fall back to the source text
+        if not text:
+            return text
+        return self._lookup(text) or text
+
+
+def load_catalog(path: str) -> Catalog:
+    locale = os.path.splitext(os.path.basename(path))[0]
+    if locale == DEFAULT_LOCALE:
+        raise CatalogError(f"{DEFAULT_LOCALE} is the source language; it has no catalog")
+    with open(path, "rb") as f:
+        raw = f.read()
+    digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+    if path.endswith(".mo"):
+        translations = gettext.GNUTranslations(io.BytesIO(raw))
+        language = translations.info().get("language") or locale
+        return Catalog(locale, language, translations.gettext, digest)
+    data = json.loads(raw.decode("utf-8"))
+    strings = data.get("strings") if isinstance(data, dict) else None
+    if not isinstance(strings, dict) or not all(
+        isinstance(k, str) and isinstance(v, str) for k, v in strings.items()
+    ):
+        raise CatalogError('a catalog needs "strings": {source text: translation}')
+    return Catalog(locale, data.get("language") or locale, strings.get, digest)
+
+
+def translate_schema(schema: dict, catalog: Catalog) -> dict:
+    # A TOOLS-style schema with every user-facing string translated
+    t = catalog.translate
+    out = dict(schema)
+    for key in ("desc", "who", "template", "visual_block"):
+        if out.get(key):
+            out[key] = t(out[key])
+    rules = schema.get("strict_rules") or STRICT_RULES
+    if t(rules) != rules:
+        out["strict_rules"] = t(rules)
+    questions = []
+    for q in schema["questions"]:
+        q = dict(q, label=t(q["label"]))
+        for key in ("help", "ph"):
+            if q.get(key):
+                q[key] = t(q[key])
+        if "options" in q:
+            q["options"] = [t(o) for o in q["options"]]
+        questions.append(q)
+    out["questions"] = questions
+    if "blocks" in schema:
+        out["blocks"] = {
+            name: {k: t(v) if k in ("contains", "format", "text") else v for k, v in spec.items()}
+            for name, spec in schema["blocks"].items()
+        }
+    return out
+
+
+def localize_tool(tool, catalog: Catalog):
+    """The tool compiled in the catalog's language, or None when nothing in it is translated."""
+    source = tool_schema(tool)
+    schema = translate_schema(source, catalog)
+    if schema == source:
+        return None
+    localized = compile_tool(localized_name(tool.name, catalog.locale), schema)
+    if set(localized.fields) != set(tool.fields):
+        differ = sorted(set(tool.fields) ^ set(localized.fields))
+        raise SchemaError(f"translated template placeholders differ: {differ}")
+    # A block that fires on an option must still find it once both are translated
+    for name, block in tool.blocks.items():
+        if block.contains is None:
+            continue
+        q_from, q_to = tool.question(block.source), localized.question(block.source)
+        contains = localized.blocks[name].contains
+        if any(block.contains in o for o in q_from.options) and not any(contains in o for o in q_to.options):
+            raise SchemaError(f"block {name!r}: translated {contains!r} matches no translated option")
+    return localized
+
+
+class Locales:
+    def __init__(self, directory: str, target: dict = REGISTRY, compiled: dict = None):
+        self.directory = directory
+        self.target = target
+        self.catalogs = {}     # locale -> Catalog, sorted by locale
+        self.errors = {}       # catalog path or "locale: tool" -> message
+        # (locale, catalog digest, source Tool) -> (localized Tool or None, error or None)
+        self._compiled = {}
+        self._seeds = dict(compiled or {})  # same, from a snapshot; taken on first use
+        self._texts = {}       # (locale, source text) -> translated page text
+        self._lock = threading.Lock()
+
+    def load(self):
+        catalogs = {}
+        try:
+            paths = sorted(e.path for e in os.scandir(self.directory) if e.name.endswith(EXTENSIONS))
+        except FileNotFoundError:
+            paths = []
+        for path in paths:
+            try:
+                catalog = load_catalog(path)
+            except Exception as exc:
+                # Unreadable file, bad JSON or .mo, or a bad shape
+                self.errors[path] = f"{type(exc).__name__}: {exc}"
+                continue
+            if catalog.locale in catalogs:
+                self.errors[path] = f"duplicate locale {catalog.locale!r}"
+                continue
+            catalogs[catalog.locale] = catalog
+        with self._lock:
+            self.catalogs = dict(sorted(catalogs.items()))
+            self._texts.clear()
+        self.publish()
+
+    def languages(self) -> dict:
+        # locale -> language name, English first
+        return {DEFAULT_LOCALE: DEFAULT_LANGUAGE, **{k: c.language for k, c in self.catalogs.items()}}
+
+    def localize(self, tools: dict) -> dict:
+        """{localized name: Tool} for every English tool in `tools` and every catalog."""
+        out = {}
+        with self._lock:
+            live = {}
+            for locale, catalog in self.catalogs.items():
+                for name, tool in tools.items():
+                    if name in _localized:
+                        continue
+                    # Tools compare by value: an unchanged reloaded tool
+                    # keeps its translation
+                    key = (locale, catalog.digest, tool)
+                    entry = self._compiled.get(key)
+                    if entry is None:
+                        entry = self._seeds.pop(key, None)
+                    if entry is None:
+                        try:
+                            entry = (localize_tool(tool, catalog), None)
+                        except SchemaError as exc:
+                            entry = (None, str(exc))
+                    error_key = f"{locale}: {name}"
+                    if entry[1] is None:
+                        self.errors.pop(error_key, None)
+                    else:
+                        self.errors[error_key] = entry[1]
+                    live[key] = entry
+                    if entry[0] is not None:
+                        out[entry[0].name] = entry[0]
+            # Copies of changed catalogs and reloaded or removed tools are let go
+            self._compiled = live
+            for key in [k for k in self.errors if ": " in k and k.split(": ", 1)[1] not in tools]:
+                del self.errors[key]
+        return out
+
+    def snapshot_state(self) -> dict:
+        with self._lock:
+            return dict(self._compiled)
+
+    def publish(self):
+        # Brings the translated tools in the target up to date with its English ones
+        tools = registry_view(self.target)
+        localized = self.localize(tools)
+        tools = {name: tool for name, tool in tools.items() if name not in _localized}
+        tools.update(localized)
+        publish_tools(self.target, tools)
+
+    def text(self, locale: str, text: str) -> str:
+        # A page text in this locale; translated once per process
+        key = (locale, text)
+        out = self._texts.get(key)
+        if out is None:
+            catalog = self.catalogs.get(locale)
+            out = self._texts[key] = catalog.translate(text) if catalog is not None else text
+        return out
+
+
+_locales = None
+_locales_lock = threading.Lock()
+
+
+def get_locales():
+    # Process-wide catalogs for PROMPT_BUILDER_LOCALES_DIR; None when unset
+    global _locales
+    directory = os.environ.get("PROMPT_BUILDER_LOCALES_DIR", "")
+    if not directory:
+        return None
+    with _locales_lock:
+        if _locales is None or _locales.directory != directory:
+            snapshot = get_snapshot()
+            _locales = Locales(directory, compiled=snapshot.localized if snapshot is not None else None)
+            _locales.load()
+        return _locales
+
+
+def localize_tools(tools: dict) -> dict:
+    # Translated copies of `tools` for the configured catalogs; {} when none
+    locales = get_locales()
+    return locales.localize(tools) if locales is not None else {}
+
+
+def page_texts(path: str = PAGE_FILE) -> list:
+    # Values of the PAGE_TEXTS constants, read without running the page
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    texts = []
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(t, "id", None) in PAGE_TEXTS for t in node.targets):
+            texts.append(ast.literal_eval(node.value))
+    return texts
+
+
+def source_strings(tools: dict) -> list:
+    # Every translatable string, in first-use order
+    strings = {}
+    for name, tool in tools.items():
+        if name in _localized:
+            continue
+        schema = tool_schema(tool)
+        texts = [schema["desc"], schema["who"], schema["template"], schema.get("visual_block")]
+        for q in schema["questions"]:
+            texts.extend([q["label"], q.get("help"), q.get("ph")])
+            texts.extend(q.get("options", ()))
+        for spec in schema.get("blocks", {}).values():
+            texts.extend([spec.get("contains"), spec.get("format"), spec.get("text")])
+        for text in texts:
+            if text:
+                strings.setdefault(text, "")
+    strings.setdefault(STRICT_RULES, "")
+    return list(strings)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m prompt_builder.i18n", description="Locale catalog tools.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    extract = sub.add_parser("extract", help="Print a JSON catalog with every source string to translate.")
+    extract.add_argument("--language", default="", help="Language name shown in the page's language menu.")
+    check = sub.add_parser("check", help="Compile the catalogs in PROMPT_BUILDER_LOCALES_DIR and report coverage.")
+    check.add_argument("--dir", help="Catalog directory (default: PROMPT_BUILDER_LOCALES_DIR).")
+    args = parser.parse_args(argv)
+
+    from prompt_builder.registry import get_tool_registry
+    get_tool_registry()
+    strings = page_texts() + source_strings(registry_view())
+    if args.command == "extract":
+        catalog = {"language": args.language, "strings": dict.fromkeys(strings, "")}
+        print(json.dumps(catalog, ensure_ascii=False, indent=2))
+        return 0
+
+    if args.dir:
+        os.environ["PROMPT_BUILDER_LOCALES_DIR"] = args.dir
+    locales = get_locales()
+    if locales is None:
+        print("no catalog directory: set PROMPT_BUILDER_LOCALES_DIR or pass --dir", file=sys.stderr)
+        return 2
+    for locale, catalog in locales.catalogs.items():
+        done = sum(catalog.translate(s) != s for s in strings)
+        tools = sum(1 for n in registry_view() if _localized.get(n, (None, None))[1] == locale)
+        print(f"{locale} ({catalog.language}): {done}/{len(strings)} strings, {tools} tools translated")
+    for key, error in locales.errors.items():
+        print(f"error: {key}: {error}", file=sys.stderr)
+    return 1 if locales.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+# ------------------------------------------------------------
+# Prompt linter
+# - Checks a rendered prompt against the answers it was rendered from:
+#   * placeholder: a template {Field} with no answer (missing or null), so
+#     it was left in the output
+#   * empty_section: a template label such as "Constraints:" with nothing
+#     before the next label or the end
+#   * duplicate_section: a template label more often than the template has
+#     it, e.g. strict rules pasted into an answer on top of strict mode
+#   * long_section: a section longer than the size limit
+# - Placeholders are found from the answers, not the text, and only the
+#   tool's own labels count, so answers that happen to contain "Notes:" or
+#   "{Goal}" are not reported
+# - The section scan jumps between ":"-at-line-end with str.find (C speed)
+#   and only looks closer there, so cost grows with the prompt size at a few
+#   hundred MB/s rather than one regex step per character
+# - Issues are plain dicts (kind, severity, message, pos) so they go into
+#   JSON output as they are
+#
+# Configure through environment variables:
+#   PROMPT_BUILDER_LINT                 0 turns the checks off  (default on)
+#   PROMPT_BUILDER_LINT_SECTION_CHARS   size limit per section  (default 20000)
+# ------------------------------------------------------------
+
+import os
+import re
+import threading
+
+from prompt_builder.core import STRICT_RULES
+
+LINT_ENABLED = os.environ.get("PROMPT_BUILDER_LINT", "1") not in ("", "0")
+SECTION_CHARS = int(os.environ.get("PROMPT_BUILDER_LINT_SECTION_CHARS", "20000"))
+
+# Template label lines ("Label:" alone on its line)
+LABEL_RE = re.compile(r"^([^\n{}]+):$", re.M)
+SPACE_RE = re.compile(r"\s*")
+
+SEVERITY = {
+    "placeholder": "error",
+    "empty_section": "warning",
+    "duplicate_section": "warning",
+    "long_section": "warning",
+}
+
+
+def _issue(kind: str, message: str, pos: int) -> dict:
+    return {"kind": kind, "severity": SEVERITY[kind], "message": message, "pos": pos}
+
+
+_labels = {}  # tool fingerprint -> ({label: times the template and trailers have it}, longest label)
+_labels_lock = threading.Lock()
+
+
+def template_labels(tool) -> tuple:
+    entry = _labels.get(tool.fingerprint)
+    if entry is None:
+        labels = {}
+        texts = ["".join(tool.literals), tool.strict_rules or STRICT_RULES]
+        if tool.visual_block:
+            texts.append(tool.visual_block)
+        for text in texts:
+            for label in LABEL_RE.findall(text):
+                labels[label] = labels.get(label, 0) + 1
+        entry = (labels, max(map(len, labels), default=0))
+        with _labels_lock:
+            _labels[tool.fingerprint] = entry
+    return entry
+
+
+def lint_prompt(tool, text: str, answers: dict, section_chars: int = SECTION_CHARS) -> list:
+    """Issues found in one prompt of this tool rendered from answers, in text order."""
+    issues = []
+
+    # Placeholders: template fields the answers leave unset (blocks always render)
+    for field in dict.fromkeys(tool.fields):
+        if field not in tool.blocks and answers.get(field) is None:
+            token = "{" + field + "}"
+            issues.append(_issue("placeholder", f"unresolved placeholder {token}", max(text.find(token), 0)))
+
+    # Sections: only a ":" at a line end is looked at; its line is a label
+    # when the template has the same one
+    labels, longest = template_labels(tool)
+    seen = {}
+    section = None  # (label, label start, end of the label)
+    for end in _colon_line_ends(text):
+        start = text.rfind("\n", max(end - longest - 1, 0), end) + 1
+        if end - start > longest:
+            continue
+        label = text[start:end]
+        if label not in labels:
+            continue
+        if section is not None:
+            _close_section(text, section, start, section_chars, issues)
+        count = seen[label] = seen.get(label, 0) + 1
+        if count == labels[label] + 1:
+            issues.append(_issue("duplicate_section", f'"{label}:" appears more than once', start))
+        section = (label, start, end + 1)
+    if section is not None:
+        _close_section(text, section, len(text), section_chars, issues)
+
+    issues.sort(key=lambda issue: issue["pos"])
+    return issues
+
+
+def _colon_line_ends(text: str):
+    # Positions of ":" that end a line
+    find = text.find
+    end = find(":\n")
+    while end != -1:
+        yield end
+        end = find(":\n", end + 2)
+    if text.endswith(":"):
+        yield len(text) - 1
+
+
+def _close_section(text: str, section: tuple, end: int, section_chars: int, issues: list):
+    # The body runs from the end of the label line to the next label (or the end)
+    label, start, body = section
+    if SPACE_RE.match(text, body, end).end() == end:
+        issues.append(_issue("empty_section", f'"{label}:" is empty', start))
+    elif end - body > section_chars:
+        issues.append(_issue("long_section", f'"{label}:" is {end - body:,} characters (limit {section_chars:,})', start))
+
+
+def lint_summary(issues: list) -> str:
+    # "1 error, 2 warnings"
+    errors = sum(1 for issue in issues if issue["severity"] == "error")
+    warnings = len(issues) - errors
+    parts = []
+    if errors:
+        parts.append(f"{errors} error" + ("s" if errors != 1 else ""))
+    if warnings:
+        parts.append(f"{warnings} warning" + ("s" if warnings != 1 else ""))
+    return ", ".join(parts)
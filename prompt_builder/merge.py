@@ -0,0 +1,227 @@
+# ------------------------------------------------------------
+# Spreadsheet mail merge
+# - Reads an uploaded CSV or .xlsx sheet row by row (header row = column
+#   names), never loading the whole sheet into Python objects
+# - Maps columns to one tool's question ids; empty "single" answers fall
+#   back to a per-question default
+# - Renders rows in chunks through the batch renderer and reports progress
+#   after each chunk
+# - Prompts stream into a zip of .txt files or a JSONL file, and failed rows
+#   into a CSV error report; both are spooled to disk past a few MB
+# ------------------------------------------------------------
+
+import csv
+import io
+import tempfile
+
+from prompt_builder.batch import JsonlWriter, ZipWriter, render_record
+from prompt_builder.core import REGISTRY
+
+CHUNK_ROWS = 500
+SPOOL_BYTES = 8 * 1024 * 1024
+# Failed rows kept in memory for display; the CSV report has all of them
+MAX_SHOWN_ERRORS = 200
+
+FORMATS = {
+    "zip": ("application/zip", ".zip"),
+    "jsonl": ("application/jsonl", ".jsonl"),
+}
+
+
+class MergeError(ValueError):
+    pass
+
+
+class CsvSheet:
+    def __init__(self, fileobj):
+        self._raw = fileobj
+        self._raw.seek(0, io.SEEK_END)
+        self._size = self._raw.tell() or 1
+        self._raw.seek(0)
+        self._text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+        self._reader = csv.reader(self._text)
+        try:
+            header = next(self._reader)
+        except StopIteration:
+            raise MergeError("the sheet is empty")
+        except (csv.Error, UnicodeDecodeError) as exc:
+            raise MergeError(f"not a readable UTF-8 CSV file: {exc}")
+        self.columns = [c.strip() for c in header]
+
+    def rows(self):
+        # (sheet row number, {column: value}); the header is row 1
+        columns = self.columns
+        try:
+            for n, values in enumerate(self._reader, start=2):
+                if any(values):
+                    yield n, dict(zip(columns, values))
+        except (csv.Error, UnicodeDecodeError) as exc:
+            raise MergeError(f"row {self._reader.line_num}: {exc}")
+
+    def fraction(self) -> float:
+        return min(self._raw.tell() / self._size, 1.0)
+
+    def close(self):
+        # Leave the caller's file object open
+        self._text.detach()
+
+
+class XlsxSheet:
+    def __init__(self, fileobj):
+        try:
+            import openpyxl
+        except ImportError:
+            raise MergeError("reading .xlsx needs openpyxl (pip install openpyxl); or upload a CSV export")
+        try:
+            self._book = openpyxl.load_workbook(fileobj, read_only=True, data_only=True)
+        except Exception as exc:
+            raise MergeError(f"not a readable .xlsx file: {exc}")
+        sheet = self._book.active
+        self._rows = sheet.iter_rows(values_only=True)
+        self._total = sheet.max_row or 0
+        self._done = 1
+        header = next(self._rows, None)
+        if header is None:
+            raise MergeError("the sheet is empty")
+        self.columns = ["" if c is None else str(c).strip() for c in header]
+
+    def rows(self):
+        columns = self.columns
+        for n, values in enumerate(self._rows, start=2):
+            self._done = n
+            if any(v not in (None, "") for v in values):
+                yield n, {c: ("" if v is None else v) for c, v in zip(columns, values)}
+
+    def fraction(self) -> float:
+        return min(self._done / self._total, 1.0) if self._total else 0.0
+
+    def close(self):
+        self._book.close()
+
+
+def open_sheet(fileobj, filename: str):
+    if filename.lower().endswith((".xlsx", ".xlsm")):
+        return XlsxSheet(fileobj)
+    return CsvSheet(fileobj)
+
+
+def suggest_mapping(tool_name: str, columns: list) -> dict:
+    # question id -> column whose name matches the id or the label
+    by_name = {c.casefold(): c for c in columns if c}
+    mapping = {}
+    for q in REGISTRY[tool_name].questions:
+        column = by_name.get(q.id.casefold()) or by_name.get(q.label.casefold())
+        if column:
+            mapping[q.id] = column
+    return mapping
+
+
+def row_answers(tool, row: dict, mapping: dict, defaults: dict):
+    # (answers, problems) for one sheet row
+    answers = {}
+    problems = []
+    for q in tool.questions:
+        column = mapping.get(q.id)
+        v = row.get(column, "") if column else ""
+        if not isinstance(v, str):
+            v = str(v)
+        if q.type == "single":
+            if not v.strip():
+                v = defaults.get(q.id) or q.options[0]
+            elif v not in q.options:
+                problems.append(f"{q.label}: {v!r} is not one of the options")
+        answers[q.id] = v
+    return answers, problems
+
+
+class ErrorReport:
+    # Failed rows as CSV (row, error, missing), spooled like the archive
+    def __init__(self):
+        self.file = tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES)
+        self._text = io.TextIOWrapper(self.file, encoding="utf-8", newline="")
+        self._csv = csv.writer(self._text)
+        self._csv.writerow(["row", "error", "missing"])
+        self.shown = []
+        self.count = 0
+
+    def add(self, row: int, error: str, missing=()):
+        self.count += 1
+        self._csv.writerow([row, error, "; ".join(missing)])
+        if len(self.shown) < MAX_SHOWN_ERRORS:
+            self.shown.append({"row": row, "error": error, "missing": ", ".join(missing)})
+
+    def close(self):
+        self._text.flush()
+        self._text.detach()
+        self.file.seek(0)
+
+    def discard(self):
+        # Releases the spool of a merge that failed
+        self._text.close()
+
+
+class SpoolJsonlWriter(JsonlWriter):
+    def __init__(self, spool):
+        super().__init__(io.TextIOWrapper(spool, encoding="utf-8", newline="\n"), close_stream=False)
+
+    def close(self):
+        super().close()
+        # Leave the spool open for the download
+        self.stream.detach()
+
+
+def open_archive(fmt: str):
+    # (spooled file, writer) for the rendered prompts
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES)
+    if fmt == "zip":
+        return spool, ZipWriter(spool)
+    return spool, SpoolJsonlWriter(spool)
+
+
+def run_merge(tool_name: str, sheet, mapping: dict, defaults: dict, strict_mode: bool, include_visual: bool,
+              writer, errors: ErrorReport, chunk_rows: int = CHUNK_ROWS):
+    """Render every sheet row; yields {"rows", "ok", "failed", "fraction"} after each chunk."""
+    tool = REGISTRY[tool_name]
+    progress = {"rows": 0, "ok": 0, "failed": 0, "fraction": 0.0}
+    for row_no, row in sheet.rows():
+        answers, problems = row_answers(tool, row, mapping, defaults)
+        if problems:
+            errors.add(row_no, "; ".join(problems))
+        else:
+            result = render_record({
+                "tool": tool_name,
+                "strict_mode": strict_mode,
+                "include_visual_step": include_visual,
+                "answers": answers,
+            })
+            if result.pop("ok"):
+                result["line"] = row_no
+                writer.write(result)
+            else:
+                errors.add(row_no, result["error"], result.get("missing", ()))
+        progress["rows"] += 1
+        if progress["rows"] % chunk_rows == 0:
+            yield _progress(progress, sheet, errors)
+    yield _progress(progress, sheet, errors)
+
+
+def _progress(progress: dict, sheet, errors: ErrorReport) -> dict:
+    progress["failed"] = errors.count
+    progress["ok"] = progress["rows"] - errors.count
+    progress["fraction"] = sheet.fraction()
+    return dict(progress)
+
+
+def finish_archive(spool, writer):
+    writer.close()
+    spool.seek(0)
+    return spool
+
+
+def discard_archive(spool, writer):
+    # Releases the spool of a merge that failed; the writer is closed first
+    # so it does not write into a closed file later
+    try:
+        writer.close()
+    finally:
+        spool.close()
@@ -0,0 +1,257 @@
+# ------------------------------------------------------------
+# Per-rerun instrumentation
+# - Phase timers, per-tool counters and histograms, shared by every session
+#   in the process
+# - Exported in Prometheus text format: to a file (node_exporter textfile
+#   collector), on a local HTTP endpoint, or read directly by the page's
+#   debug panel
+# - Disabled unless configured; a disabled timer is one shared no-op object
+#
+# Configure through environment variables:
+#   PROMPT_BUILDER_METRICS=1             enable collection
+#   PROMPT_BUILDER_METRICS_FILE=path     also write Prometheus text here
+#   PROMPT_BUILDER_METRICS_PORT=9109     also serve http://127.0.0.1:PORT/metrics
+# Setting FILE or PORT enables collection too.
+# ------------------------------------------------------------
+
+import os
+import threading
+import time
+from bisect import bisect_left
+
+PREFIX = "prompt_builder"
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+HISTOGRAMS = {
+    "phase_seconds": ("Time spent in each phase of the page script.", LATENCY_BUCKETS),
+    "prompt_bytes": ("Size of generated prompts in UTF-8 bytes.", SIZE_BUCKETS),
+    "session_state_bytes": ("Approximate memory held by one session's state, after each run.", SIZE_BUCKETS),
+}
+COUNTERS = {
+    "renders": "Prompts rendered.",
+    "validation_failures": "Generate clicks rejected for missing required fields.",
+    "reruns": "Page script runs.",
+    "merge_rows": "Spreadsheet rows processed by mail merge.",
+}
+
+FILE_WRITE_INTERVAL = 5.0
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ("metrics", "labels", "t0")
+
+    def __init__(self, metrics, labels: tuple):
+        self.metrics = metrics
+        self.labels = labels
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics._observe("phase_seconds", self.labels, time.perf_counter() - self.t0)
+        return False
+
+
+class Histogram:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: tuple):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _label_value(value) -> str:
+    # Escaped as the text exposition format requires: backslash, quote, newline
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_str(names: tuple, values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_label_value(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Metrics:
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._counters = {}    # (name, labels) -> value
+        self._histograms = {}  # (name, labels) -> Histogram
+        self._write_lock = threading.Lock()
+        self._last_write = 0.0
+
+    # -- recording ---------------------------------------------------------
+
+    def time(self, phase: str, tool: str = ""):
+        if not self.enabled:
+            return NULL_TIMER
+        return _Timer(self, (phase, tool))
+
+    def start(self) -> float:
+        # For phases that do not fit a with-block: t0 = start(); ...; stop(phase, tool, t0)
+        return time.perf_counter() if self.enabled else 0.0
+
+    def stop(self, phase: str, tool: str, t0: float):
+        if not self.enabled:
+            return
+        self._observe("phase_seconds", (phase, tool), time.perf_counter() - t0)
+
+    def inc(self, name: str, tool: str = "", value: int = 1):
+        if not self.enabled:
+            return
+        key = (name, (tool,))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, tool: str, value: float):
+        if not self.enabled:
+            return
+        self._observe(name, (tool,), value)
+
+    def _observe(self, name: str, labels: tuple, value: float):
+        key = (name, labels)
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = Histogram(HISTOGRAMS[name][1])
+            hist.observe(value)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    # -- export ------------------------------------------------------------
+
+    def summary(self) -> dict:
+        # Compact view for the debug panel: counters, and count/mean per histogram
+        with self._lock:
+            counters = {f"{name}[{labels[0]}]": v for (name, labels), v in sorted(self._counters.items())}
+            hists = {
+                f"{name}[{'/'.join(l for l in labels if l)}]": {
+                    "count": h.count,
+                    "mean": h.sum / h.count if h.count else 0.0,
+                }
+                for (name, labels), h in sorted(self._histograms.items())
+            }
+        return {"counters": counters, "histograms": hists}
+
+    def render_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            for name, help_text in COUNTERS.items():
+                rows = [(labels, v) for (n, labels), v in sorted(self._counters.items()) if n == name]
+                if not rows:
+                    continue
+                metric = f"{PREFIX}_{name}_total"
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} counter")
+                for labels, v in rows:
+                    lines.append(f"{metric}{_label_str(('tool',), labels)} {v}")
+
+            for name, (help_text, _) in HISTOGRAMS.items():
+                rows = [(labels, h) for (n, labels), h in sorted(self._histograms.items()) if n == name]
+                if not rows:
+                    continue
+                metric = f"{PREFIX}_{name}"
+                label_names = ("phase", "tool") if name == "phase_seconds" else ("tool",)
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} histogram")
+                for labels, h in rows:
+                    cumulative = 0
+                    for bound, count in zip(h.bounds, h.counts):
+                        cumulative += count
+                        le = 'le="%s"' % bound
+                        lines.append(f"{metric}_bucket{_label_str(label_names, labels, le)} {cumulative}")
+                    le = 'le="+Inf"'
+                    lines.append(f"{metric}_bucket{_label_str(label_names, labels, le)} {h.count}")
+                    lines.append(f"{metric}_sum{_label_str(label_names, labels)} {h.sum}")
+                    lines.append(f"{metric}_count{_label_str(label_names, labels)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str, force: bool = False):
+        # Atomic replace, throttled so busy servers do not rewrite it every rerun;
+        # one writer at a time per process, and a temp file per process and thread
+        with self._write_lock:
+            now = time.monotonic()
+            if not force and now - self._last_write < FILE_WRITE_INTERVAL:
+                return
+            self._last_write = now
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(self.render_prometheus())
+            os.replace(tmp, path)
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def serve_metrics(metrics: Metrics, port: int, host: str = "127.0.0.1"):
+    # Starts once per process; later calls (e.g. from every rerun) are no-ops
+    global _server
+    with _server_lock:
+        if _server is not None:
+            return _server
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        _server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=_server.serve_forever, name="prompt-builder-metrics", daemon=True).start()
+        return _server
+
+
+METRICS_FILE = os.environ.get("PROMPT_BUILDER_METRICS_FILE", "")
+METRICS_PORT = int(os.environ.get("PROMPT_BUILDER_METRICS_PORT", "0") or 0)
+
+METRICS = Metrics(
+    enabled=os.environ.get("PROMPT_BUILDER_METRICS", "") not in ("", "0") or bool(METRICS_FILE) or bool(METRICS_PORT)
+)
+
+
+def export_metrics():
+    # Called at the end of each page run: writes the file and/or starts the endpoint
+    if not METRICS.enabled:
+        return
+    if METRICS_FILE:
+        METRICS.write_prometheus(METRICS_FILE)
+    if METRICS_PORT:
+        serve_metrics(METRICS, METRICS_PORT)
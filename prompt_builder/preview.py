@@ -0,0 +1,52 @@
+# ------------------------------------------------------------
+# Incremental live preview
+# - Keeps one tool's rendered template pieces between reruns
+# - update() compares the new answers with the last ones and re-renders only
+#   the placeholders that read a changed answer (tool.dependents), e.g.
+#   {ROLE_BLOCK} when Role changes or {PODCAST_NOTICE} when UseCase changes
+# - chunks() applies edge stripping and the strict/visual trailers to a copy,
+#   so toggling those never touches the field pieces
+# ------------------------------------------------------------
+
+from prompt_builder.core import REGISTRY, finish_pieces, render_field
+
+_MISSING = object()
+
+
+class LivePreview:
+    def __init__(self, tool_name: str):
+        self.tool_name = tool_name
+        self.tool = REGISTRY[tool_name]
+        self.pieces = [self.tool.literals[0]]
+        for field, literal in zip(self.tool.fields, self.tool.literals[1:]):
+            self.pieces.append(render_field(self.tool, field, {}))
+            self.pieces.append(literal)
+        self._seen = {}         # answer id -> value the pieces were rendered from
+        self.last_patched = 0   # placeholders re-rendered by the last update()
+
+    def is_current(self) -> bool:
+        # False once the tool was reloaded or removed from the registry
+        return REGISTRY.get(self.tool_name) is self.tool
+
+    def update(self, answers: dict) -> int:
+        # Returns how many placeholders were re-rendered
+        tool = self.tool
+        patched = 0
+        for qid, indexes in tool.dependents.items():
+            value = answers.get(qid, _MISSING)
+            old = self._seen.get(qid, _MISSING)
+            if value is old or (value is not _MISSING and old is not _MISSING and value == old):
+                continue
+            self._seen[qid] = value
+            for i in indexes:
+                self.pieces[2 * i + 1] = render_field(tool, tool.fields[i], answers)
+                patched += 1
+        self.last_patched = patched
+        return patched
+
+    def chunks(self, strict_mode: bool, include_visual: bool) -> list:
+        # Same pieces prompt_chunks() would return for the last answers
+        return finish_pieces(self.tool, list(self.pieces), strict_mode, include_visual)
+
+    def text(self, strict_mode: bool, include_visual: bool) -> str:
+        return "".join(self.chunks(strict_mode, include_visual))
@@ -0,0 +1,205 @@
+# ------------------------------------------------------------
+# External tool registry (hot reload)
+# - Loads extra tools from a directory of .json / .yaml / .yml files, one
+#   tool per file, in the same shape as a TOOLS entry plus a "name":
+#     {"name": ..., "desc": ..., "who": ..., "questions": [...],
+#      "template": ..., "blocks": {...}, "visual_block": ...}
+# - Publishes to core.REGISTRY (core.publish_tools), so every caller sees
+#   the new tools; sessions iterating the tools hold the previous
+#   registry_view() until they take it again
+# - reload() only stats files; a file is re-read when its mtime/size changes
+#   and re-parsed only when its content hash changes
+# - A bad file is reported in .errors and its last good version stays live
+# - Translated copies of every tool (prompt_builder.i18n) are published
+#   with them
+# - A cold-start snapshot (prompt_builder.snapshot) seeds the compiled tools
+#   by content hash, so unchanged files are read and hashed but not compiled
+# - Compiled tools are kept by content hash so renames and reverts are not
+#   recompiled; besides the live files, only the MAX_SPARE_COMPILED most
+#   recently used are kept
+#
+# Configure through environment variables:
+#   PROMPT_BUILDER_TOOLS_DIR   directory to load (unset = built-in tools only)
+# ------------------------------------------------------------
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from prompt_builder.core import BUILTIN_REGISTRY, REGISTRY, publish_tools
+from prompt_builder.i18n import get_locales, localize_tools
+from prompt_builder.schema import SchemaError, compile_tool
+from prompt_builder.snapshot import get_snapshot
+
+EXTENSIONS = (".json", ".yaml", ".yml")
+RELOAD_INTERVAL = 2.0
+MAX_SPARE_COMPILED = 64
+
+
+def parse_tool_file(path: str, data: bytes) -> dict:
+    if path.endswith(".json"):
+        return json.loads(data.decode("utf-8"))
+    try:
+        import yaml
+    except ImportError:
+        raise SchemaError("PyYAML is not installed; use .json tool files")
+    return yaml.safe_load(data)
+
+
+class _FileEntry:
+    __slots__ = ("stat_key", "digest", "tool")
+
+    def __init__(self, stat_key: tuple, digest: str, tool):
+        self.stat_key = stat_key
+        self.digest = digest
+        self.tool = tool
+
+
+class ToolRegistry:
+    def __init__(self, directory: str, target: dict = REGISTRY, builtins: dict = BUILTIN_REGISTRY,
+                 compiled: dict = None):
+        self.directory = directory
+        self.target = target
+        self.builtins = builtins
+        self.errors = {}       # path -> message for files that failed to load
+        self._files = {}       # path -> _FileEntry (last good version)
+        self._failed = {}      # path -> stat key of the bad version, not retried until it changes
+        self._compiled = OrderedDict(compiled or {})  # content digest -> Tool, least recently used first
+        self._lock = threading.Lock()
+        self._last_check = 0.0
+
+    def _scan(self) -> dict:
+        found = {}
+        try:
+            entries = os.scandir(self.directory)
+        except FileNotFoundError:
+            return found
+        with entries:
+            for entry in entries:
+                if entry.name.startswith(".") or not entry.name.endswith(EXTENSIONS):
+                    continue
+                st = entry.stat()
+                found[entry.path] = (st.st_mtime_ns, st.st_size)
+        return found
+
+    def _load_file(self, path: str, stat_key: tuple) -> _FileEntry:
+        with open(path, "rb") as f:
+            data = f.read()
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        old = self._files.get(path)
+        if old is not None and old.digest == digest:
+            return _FileEntry(stat_key, digest, old.tool)
+        tool = self._compiled.get(digest)
+        if tool is None:
+            schema = parse_tool_file(path, data)
+            if not isinstance(schema, dict):
+                raise SchemaError("tool file must contain one object")
+            name = schema.get("name") or os.path.splitext(os.path.basename(path))[0]
+            tool = compile_tool(name, schema)
+            self._compiled[digest] = tool
+        else:
+            self._compiled.move_to_end(digest)
+        return _FileEntry(stat_key, digest, tool)
+
+    def _trim_compiled(self):
+        # Drops the least recently used compiled tools no live file uses
+        live = {entry.digest for entry in self._files.values()}
+        spare = sum(1 for digest in self._compiled if digest not in live)
+        for digest in list(self._compiled):
+            if spare <= MAX_SPARE_COMPILED:
+                break
+            if digest not in live:
+                del self._compiled[digest]
+                spare -= 1
+
+    def reload(self) -> dict:
+        """Apply changes on disk; returns {"changed": [...], "removed": [...], "errors": {...}}."""
+        with self._lock:
+            self._last_check = time.monotonic()
+            found = self._scan()
+            changed = []
+            removed = [p for p in self._files if p not in found]
+
+            for path, stat_key in found.items():
+                old = self._files.get(path)
+                if self._failed.get(path, old and old.stat_key) == stat_key:
+                    continue
+                try:
+                    entry = self._load_file(path, stat_key)
+                except Exception as exc:
+                    # Parse and schema errors (JSON, YAML, SchemaError) or a
+                    # file that vanished mid-scan; the last good version stays
+                    self._failed[path] = stat_key
+                    self.errors[path] = f"{type(exc).__name__}: {exc}"
+                    continue
+                self._failed.pop(path, None)
+                self.errors.pop(path, None)
+                if old is None or old.digest != entry.digest:
+                    changed.append(path)
+                self._files[path] = entry
+
+            for path in removed:
+                del self._files[path]
+            for path in [p for p in self.errors if p not in found]:
+                self._failed.pop(path, None)
+                del self.errors[path]
+
+            if changed or removed:
+                self._publish()
+            self._trim_compiled()
+            return {"changed": changed, "removed": removed, "errors": dict(self.errors)}
+
+    def maybe_reload(self, interval: float = RELOAD_INTERVAL):
+        # Cheap enough to call on every rerun: at most one scan per interval
+        if time.monotonic() - self._last_check >= interval:
+            self.reload()
+
+    def snapshot_state(self) -> dict:
+        # Content digest -> Tool for the files loaded now
+        with self._lock:
+            return {entry.digest: entry.tool for entry in self._files.values()}
+
+    def _publish(self):
+        # External tools override built-ins of the same name; between two
+        # files the first path in sort order wins and the other is reported
+        tools = dict(self.builtins)
+        seen = {}
+        for path in sorted(self._files):
+            tool = self._files[path].tool
+            if tool.name in seen:
+                self.errors[path] = f"duplicate tool name {tool.name!r} (also in {seen[tool.name]})"
+                continue
+            if path not in self._failed:
+                self.errors.pop(path, None)
+            seen[tool.name] = path
+            tools[tool.name] = tool
+        tools.update(localize_tools(tools))
+        publish_tools(self.target, tools)
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_tool_registry():
+    # Process-wide loader for PROMPT_BUILDER_TOOLS_DIR; None when unset
+    global _registry
+    directory = os.environ.get("PROMPT_BUILDER_TOOLS_DIR", "")
+    if not directory:
+        return None
+    with _registry_lock:
+        if _registry is None or _registry.directory != directory:
+            snapshot = get_snapshot()
+            _registry = ToolRegistry(directory, compiled=snapshot.files if snapshot is not None else None)
+            _registry.reload()
+        return _registry
+
+
+def load_tools():
+    # Brings REGISTRY up to date with PROMPT_BUILDER_LOCALES_DIR and
+    # PROMPT_BUILDER_TOOLS_DIR; returns the tool file loader (or None)
+    get_locales()
+    return get_tool_registry()
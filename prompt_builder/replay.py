@@ -0,0 +1,183 @@
+# ------------------------------------------------------------
+# Replay / regression check for "Download Inputs (.json)" payloads
+# - Re-renders every payload under a directory on a process pool and
+#   compares each prompt with a stored golden prompt (same relative path,
+#   .txt instead of .json, under the golden directory)
+# - Payloads are only rendered (batch.render_prompt): no token counts or
+#   lint. Only mismatches are diffed, in the worker; matches cost one compare
+# - Summarizes same / changed / new / error per tool; exit status 1 when
+#   anything changed, has no golden yet or failed, so it can gate template
+#   edits in CI
+# - --update (re)writes the goldens from the current templates
+#
+# Usage:
+#   python -m prompt_builder.replay payloads/ --golden goldens/ --update
+#   python -m prompt_builder.replay payloads/ --golden goldens/ --report changes.jsonl
+# ------------------------------------------------------------
+
+import argparse
+import difflib
+import itertools
+import json
+import os
+import sys
+import time
+
+from prompt_builder.batch import map_chunks, render_prompt
+from prompt_builder.core import non_bool_flags
+
+CHUNK_FILES = 256
+DIFF_LINES = 200
+
+STATUSES = ("same", "changed", "new", "error")
+
+
+def load_payload(data) -> dict:
+    # Parses and checks an exported payload; raises ValueError with a
+    # message fit for the page
+    try:
+        payload = json.loads(data)
+    except ValueError as exc:
+        raise ValueError(f"not a JSON file: {exc}")
+    if not isinstance(payload, dict) or not isinstance(payload.get("answers"), dict):
+        raise ValueError('expected a "Download Inputs (.json)" file with "tool" and "answers"')
+    if not isinstance(payload.get("tool"), str):
+        raise ValueError('the file has no "tool" name')
+    bad = non_bool_flags(payload)
+    if bad:
+        raise ValueError(f"{', '.join(bad)} must be true or false")
+    return payload
+
+
+def iter_payload_files(root: str):
+    # Relative paths of *.json files under root, in a stable order
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.endswith(".json"):
+                yield os.path.relpath(os.path.join(dirpath, name), root)
+
+
+def golden_path(golden_dir: str, rel: str) -> str:
+    return os.path.join(golden_dir, os.path.splitext(rel)[0] + ".txt")
+
+
+def diff_prompts(golden: str, prompt: str, rel: str) -> str:
+    lines = difflib.unified_diff(
+        golden.splitlines(keepends=True),
+        prompt.splitlines(keepends=True),
+        fromfile=f"golden/{rel}",
+        tofile=f"current/{rel}",
+    )
+    return "".join(itertools.islice(lines, DIFF_LINES))
+
+
+def replay_files(job: tuple) -> list:
+    # Runs in a worker: job is (payload_dir, golden_dir, update, [relative paths])
+    payload_dir, golden_dir, update, rels = job
+    results = []
+    for rel in rels:
+        result = {"file": rel, "tool": None}
+        try:
+            with open(os.path.join(payload_dir, rel), "rb") as f:
+                payload = load_payload(f.read())
+        except (OSError, ValueError) as exc:
+            result.update(status="error", error=str(exc))
+            results.append(result)
+            continue
+        rendered = render_prompt(payload)
+        result["tool"] = rendered.get("tool")
+        if not rendered["ok"]:
+            result.update(status="error", error=rendered["error"])
+            for key in ("missing", "fields"):
+                if key in rendered:
+                    result[key] = rendered[key]
+            results.append(result)
+            continue
+
+        prompt = rendered["prompt"]
+        gpath = golden_path(golden_dir, rel)
+        try:
+            with open(gpath, encoding="utf-8", newline="") as f:
+                golden = f.read()
+        except FileNotFoundError:
+            golden = None
+
+        if golden == prompt:
+            result["status"] = "same"
+        elif golden is None:
+            result["status"] = "new"
+        else:
+            result["status"] = "changed"
+            result["diff"] = diff_prompts(golden, prompt, rel)
+        if update and result["status"] != "same":
+            os.makedirs(os.path.dirname(gpath) or ".", exist_ok=True)
+            with open(gpath, "w", encoding="utf-8", newline="") as f:
+                f.write(prompt)
+        results.append(result)
+    return results
+
+
+def run_replay(payload_dir: str, golden_dir: str, update: bool = False, workers: int = 0,
+               chunk_files: int = CHUNK_FILES):
+    """Yield one result dict per payload file, in path order."""
+    rels = iter_payload_files(payload_dir)
+    jobs = (
+        (payload_dir, golden_dir, update, chunk)
+        for chunk in iter(lambda: list(itertools.islice(rels, chunk_files)), [])
+    )
+    for results in map_chunks(replay_files, jobs, workers):
+        yield from results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m prompt_builder.replay",
+        description="Re-render exported input payloads and compare them with golden prompts.",
+    )
+    parser.add_argument("payloads", help="Directory of .json input payloads (searched recursively).")
+    parser.add_argument("--golden", required=True, help="Directory of golden .txt prompts (mirrors payloads).")
+    parser.add_argument("--update", action="store_true", help="Write new and changed prompts as the goldens.")
+    parser.add_argument("--report", help="JSONL file for every result that is not 'same' (with diffs).")
+    parser.add_argument("--show", type=int, default=3, help="Print this many diffs (default 3).")
+    parser.add_argument("-j", "--workers", type=int, default=0, help="Worker processes (default: all cores).")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_FILES, help="Files per worker task.")
+    args = parser.parse_args(argv)
+
+    report = open(args.report, "w", encoding="utf-8") if args.report else None
+    summary = {}
+    shown = 0
+    t0 = time.perf_counter()
+    try:
+        for result in run_replay(args.payloads, args.golden, args.update, args.workers, args.chunk_size):
+            counts = summary.setdefault(result["tool"] or "?", dict.fromkeys(STATUSES, 0))
+            counts[result["status"]] += 1
+            if result["status"] == "same":
+                continue
+            if report:
+                report.write(json.dumps(result, ensure_ascii=False) + "\n")
+            if shown < args.show and result["status"] in ("changed", "error"):
+                shown += 1
+                print(result.get("diff") or f"{result['file']}: {result.get('error')}", file=sys.stderr)
+    finally:
+        if report:
+            report.close()
+    elapsed = time.perf_counter() - t0
+
+    total = dict.fromkeys(STATUSES, 0)
+    print(f"{'tool':<24}" + "".join(f"{s:>9}" for s in STATUSES))
+    for tool in sorted(summary):
+        counts = summary[tool]
+        for s in STATUSES:
+            total[s] += counts[s]
+        print(f"{tool:<24}" + "".join(f"{counts[s]:>9}" for s in STATUSES))
+    print(f"{'total':<24}" + "".join(f"{total[s]:>9}" for s in STATUSES))
+    print(f"{sum(total.values())} payloads in {elapsed:.2f}s" + (" (goldens updated)" if args.update else ""))
+
+    if args.update:
+        return 1 if total["error"] else 0
+    return 1 if total["changed"] or total["error"] or total["new"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,265 @@
+# ------------------------------------------------------------
+# Compiled tool schemas
+# - Turns the TOOLS dict into frozen, slotted objects once at startup
+# - Precomputes what validation and rendering need on every click:
+#   required text fields, template segments, placeholder sets, option tuples
+# - Rejects broken schemas at load time (SchemaError) instead of at render
+# ------------------------------------------------------------
+
+import hashlib
+import json
+import re
+
+QUESTION_TYPES = ("text", "single")
+
+PLACEHOLDER_RE = re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
+
+class SchemaError(ValueError):
+    pass
+
+
+class _Frozen:
+    # Immutable slotted record; subclasses list their fields in __slots__
+    # (positional order) and set defaults in _defaults.
+    __slots__ = ()
+    _defaults = {}
+
+    def __init__(self, *args, **kwargs):
+        values = dict(zip(self.__slots__, args))
+        values.update(kwargs)
+        for name in self.__slots__:
+            if name in values:
+                object.__setattr__(self, name, values[name])
+            elif name in self._defaults:
+                object.__setattr__(self, name, self._defaults[name])
+            else:
+                raise TypeError(f"{type(self).__name__} missing field {name!r}")
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def _astuple(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __reduce__(self):
+        return type(self), self._astuple()
+
+    def __eq__(self, other):
+        return type(other) is type(self) and other._astuple() == self._astuple()
+
+    def __hash__(self):
+        return hash(self._astuple())
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class Question(_Frozen):
+    __slots__ = ("id", "label", "type", "help", "ph", "options", "optional")
+    _defaults = {"help": None, "ph": "", "options": (), "optional": False}
+
+
+class Block(_Frozen):
+    # A computed placeholder filled from one answer (e.g. ROLE_BLOCK from Role).
+    # Active when the answer contains `contains`, or when it is non-blank if
+    # `contains` is None. Emits `format` with {value} replaced by the stripped
+    # answer, or the fixed `text`.
+    __slots__ = ("name", "source", "contains", "format", "text")
+    _defaults = {"contains": None, "format": None, "text": ""}
+
+
+class Tool(_Frozen):
+    __slots__ = (
+        "name",
+        "desc",
+        "who",
+        "questions",      # tuple of Question
+        "template",
+        "literals",       # template text between placeholders
+        "fields",         # placeholder names, len(literals) - 1 of them
+        "placeholders",   # frozenset(fields)
+        "inputs",         # answer ids that can change the prompt
+        "dependents",     # answer id -> indexes into fields that render from it
+        "required_text",  # (id, label) of non-optional text questions
+        "blocks",         # placeholder name -> Block
+        "visual_block",
+        "fingerprint",    # hash of everything that affects rendering
+        "token_budget",   # estimated tokens the target model accepts, or None
+        "strict_rules",   # strict mode text when not core.STRICT_RULES (e.g. translated), or None
+    )
+    _defaults = {
+        "dependents": {}, "blocks": {}, "visual_block": None, "fingerprint": "", "token_budget": None,
+        "strict_rules": None,
+    }
+
+    def __hash__(self):
+        # blocks is a dict; name + template identify a tool well enough
+        return hash((self.name, self.template))
+
+    def question(self, qid: str) -> Question:
+        for q in self.questions:
+            if q.id == qid:
+                return q
+        raise KeyError(qid)
+
+
+def compile_template(template: str):
+    # Alternating literal text and placeholder names:
+    # literals[0], fields[0], literals[1], ..., literals[-1]
+    literals = []
+    fields = []
+    pos = 0
+    for m in PLACEHOLDER_RE.finditer(template):
+        literals.append(template[pos:m.start()])
+        fields.append(m.group(1))
+        pos = m.end()
+    literals.append(template[pos:])
+    return tuple(literals), tuple(fields)
+
+
+def compile_question(tool_name: str, q: dict) -> Question:
+    if not isinstance(q, dict) or "id" not in q:
+        raise SchemaError(f"{tool_name}: every question needs an 'id'")
+    qid = q["id"]
+    qtype = q.get("type")
+    if qtype not in QUESTION_TYPES:
+        raise SchemaError(f"{tool_name}: question {qid!r} has unsupported type {qtype!r}")
+    options = tuple(q.get("options", ()))
+    if qtype == "single" and not options:
+        raise SchemaError(f"{tool_name}: single-choice question {qid!r} has no options")
+    return Question(
+        id=qid,
+        label=q.get("label", qid),
+        type=qtype,
+        help=q.get("help", None),
+        ph=q.get("ph", ""),
+        options=options,
+        optional=bool(q.get("optional")),
+    )
+
+
+def compile_block(tool_name: str, name: str, spec: dict, ids: set) -> Block:
+    if not isinstance(spec, dict):
+        raise SchemaError(f"{tool_name}: block {name!r} must be an object")
+    source = spec.get("source")
+    if source not in ids:
+        raise SchemaError(f"{tool_name}: block {name!r} reads unknown question {source!r}")
+    if ("format" in spec) == ("text" in spec):
+        raise SchemaError(f"{tool_name}: block {name!r} needs exactly one of 'format' or 'text'")
+    return Block(
+        name=name,
+        source=source,
+        contains=spec.get("contains"),
+        format=spec.get("format"),
+        text=spec.get("text", ""),
+    )
+
+
+def compile_tool(tool_name: str, schema: dict) -> Tool:
+    for key in ("desc", "who", "questions", "template"):
+        if key not in schema:
+            raise SchemaError(f"{tool_name}: missing {key!r}")
+
+    questions = tuple(compile_question(tool_name, q) for q in schema["questions"])
+    ids = [q.id for q in questions]
+    dupes = sorted({qid for qid in ids if ids.count(qid) > 1})
+    if dupes:
+        raise SchemaError(f"{tool_name}: duplicate question ids {dupes}")
+
+    blocks = {
+        name: compile_block(tool_name, name, spec, set(ids))
+        for name, spec in schema.get("blocks", {}).items()
+    }
+    clashes = sorted(set(blocks) & set(ids))
+    if clashes:
+        raise SchemaError(f"{tool_name}: block names clash with question ids {clashes}")
+
+    literals, fields = compile_template(schema["template"])
+    known = set(ids) | set(blocks)
+    unknown = sorted(set(fields) - known)
+    if unknown:
+        raise SchemaError(f"{tool_name}: template placeholders with no matching question: {unknown}")
+
+    token_budget = schema.get("token_budget")
+    if token_budget is not None and (
+        not isinstance(token_budget, int) or isinstance(token_budget, bool) or token_budget <= 0
+    ):
+        raise SchemaError(f"{tool_name}: token_budget must be a positive integer")
+
+    strict_rules = schema.get("strict_rules")
+    if strict_rules is not None and not isinstance(strict_rules, str):
+        raise SchemaError(f"{tool_name}: strict_rules must be a string")
+
+    dependents = {}
+    for i, field in enumerate(fields):
+        source = blocks[field].source if field in blocks else field
+        dependents.setdefault(source, []).append(i)
+    dependents = {source: tuple(idx) for source, idx in dependents.items()}
+    inputs = frozenset(dependents)
+    fingerprint = hashlib.blake2b(
+        json.dumps(
+            [schema["template"], schema.get("blocks", {}), schema.get("visual_block")]
+            + ([strict_rules] if strict_rules is not None else []),
+            sort_keys=True,
+        ).encode("utf-8"),
+        digest_size=8,
+    ).hexdigest()
+    required_text = tuple(
+        (q.id, q.label) for q in questions if q.type == "text" and not q.optional
+    )
+    return Tool(
+        name=tool_name,
+        desc=schema["desc"],
+        who=schema["who"],
+        questions=questions,
+        template=schema["template"],
+        literals=literals,
+        fields=fields,
+        placeholders=frozenset(fields),
+        inputs=inputs,
+        dependents=dependents,
+        required_text=required_text,
+        blocks=blocks,
+        visual_block=schema.get("visual_block"),
+        fingerprint=fingerprint,
+        token_budget=token_budget,
+        strict_rules=strict_rules,
+    )
+
+
+def tool_schema(tool: Tool) -> dict:
+    # The TOOLS-style schema compile_tool() turns back into this tool
+    questions = []
+    for q in tool.questions:
+        spec = {"id": q.id, "label": q.label, "type": q.type}
+        for name, default in Question._defaults.items():
+            value = getattr(q, name)
+            if value != default:
+                spec[name] = list(value) if name == "options" else value
+        questions.append(spec)
+    blocks = {}
+    for name, block in tool.blocks.items():
+        spec = {"source": block.source}
+        if block.contains is not None:
+            spec["contains"] = block.contains
+        if block.format is not None:
+            spec["format"] = block.format
+        else:
+            spec["text"] = block.text
+        blocks[name] = spec
+    schema = {"desc": tool.desc, "who": tool.who, "questions": questions, "template": tool.template}
+    if blocks:
+        schema["blocks"] = blocks
+    for name in ("visual_block", "token_budget", "strict_rules"):
+        if getattr(tool, name) is not None:
+            schema[name] = getattr(tool, name)
+    return schema
+
+
+def compile_registry(tools: dict) -> dict:
+    return {name: compile_tool(name, schema) for name, schema in tools.items()}
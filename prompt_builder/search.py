@@ -0,0 +1,245 @@
+# ------------------------------------------------------------
+# Tool and question search
+# - An inverted index over every tool's name, desc, who and its questions'
+#   label, help text and options: term -> {tool name: weight}
+# - refresh() re-indexes only the tools that were added, replaced (e.g. a
+#   reloaded tool file) or removed since the last call
+# - search() ranks tools for a free-text query: each query word matches
+#   exact terms and terms one edit away (typos, via a delete-neighbourhood
+#   map); the last word also matches terms it is a prefix of (typing in
+#   progress). Rarer terms and heavier fields (name, labels) count more
+# - Each hit names the question whose label, help or options matched best,
+#   if any
+# - Terms are Unicode words, NFKC-normalized and case-folded, so translated
+#   tools ("Tool [de]") are found by their own text; runs of CJK characters
+#   are single terms, matched whole, by prefix or with one typo
+# - The index pickles (without its lock); a cold-start snapshot
+#   (prompt_builder.snapshot) hands a built one to a new process
+# ------------------------------------------------------------
+
+import heapq
+import math
+import re
+import threading
+import unicodedata
+
+from prompt_builder.core import registry_view
+from prompt_builder.snapshot import get_snapshot
+
+TOKEN_RE = re.compile(r"\w+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from how if in is it of on or that the this to what when which who with you your"
+    .split()
+)
+
+# Weight of a term per field it appears in
+FIELD_WEIGHTS = {"name": 4.0, "label": 2.0, "desc": 2.0, "who": 1.0, "help": 1.0, "options": 1.0}
+
+MIN_PREFIX = 2      # shortest query word that matches as a prefix
+MAX_PREFIX_TERMS = 64  # a short prefix expands to its most common terms only
+MIN_TYPO = 4        # shortest word (query or indexed) that matches with one typo
+PREFIX_FACTOR = 0.7
+TYPO_FACTOR = 0.5
+
+
+def tokenize(text: str) -> list:
+    # One-letter ASCII words are noise; one CJK character can be a whole word
+    text = unicodedata.normalize("NFKC", text or "").casefold()
+    return [t for t in TOKEN_RE.findall(text) if (len(t) > 1 or not t.isascii()) and t not in STOPWORDS]
+
+
+def _deletes(term: str):
+    return {term[:i] + term[i + 1:] for i in range(len(term))}
+
+
+def _within_one_edit(a: str, b: str) -> bool:
+    # Levenshtein distance <= 1, or one swap of adjacent letters
+    if a == b:
+        return True
+    la, lb = len(a), len(b)
+    if abs(la - lb) > 1:
+        return False
+    i = 0
+    while i < min(la, lb) and a[i] == b[i]:
+        i += 1
+    if la == lb:
+        return a[i + 1:] == b[i + 1:] or (a[i + 1:i + 2] == b[i:i + 1] and a[i:i + 1] == b[i + 1:i + 2]
+                                           and a[i + 2:] == b[i + 2:])
+    if la < lb:
+        return a[i:] == b[i + 1:]
+    return a[i + 1:] == b[i:]
+
+
+class SearchHit:
+    __slots__ = ("tool", "score", "question")
+
+    def __init__(self, tool: str, score: float, question):
+        self.tool = tool
+        self.score = score
+        self.question = question  # id of the best-matching question, or None
+
+    def __repr__(self):
+        return f"SearchHit({self.tool!r}, {self.score:.2f}, {self.question!r})"
+
+
+class ToolIndex:
+    def __init__(self):
+        self.postings = {}   # term -> {tool name: weight}
+        self._where = {}     # (term, tool name) -> question id with the heaviest use of the term
+        self._tools = {}     # tool name -> (Tool it was indexed from, its terms)
+        self._prefixes = {}  # prefix -> set of terms
+        self._typos = {}     # term or one-letter delete of a term -> set of terms
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        with self._lock:
+            return {k: v for k, v in self.__dict__.items() if k != "_lock"}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def refresh(self, registry: dict = None) -> int:
+        # Returns how many tools were (re-)indexed or dropped
+        registry = registry_view(registry)
+        with self._lock:
+            changed = 0
+            for name in [n for n in self._tools if n not in registry]:
+                self._drop(name)
+                changed += 1
+            for name, tool in registry.items():
+                entry = self._tools.get(name)
+                if entry is not None and entry[0] is tool:
+                    continue
+                if entry is not None and entry[0] == tool:
+                    # The same tool compiled elsewhere (e.g. a snapshot)
+                    self._tools[name] = (tool, entry[1])
+                    continue
+                if entry is not None:
+                    self._drop(name)
+                self._add(name, tool)
+                changed += 1
+            return changed
+
+    def _add(self, name: str, tool):
+        weights = {}
+        own = {}    # term -> weight from the tool's own name/desc/who
+        where = {}  # term -> (question id, weight) of its heaviest question
+        fields = [("name", name, None), ("desc", tool.desc, None), ("who", tool.who, None)]
+        for q in tool.questions:
+            fields.append(("label", q.label, q.id))
+            fields.append(("help", q.help, q.id))
+            fields.append(("options", " ".join(q.options), q.id))
+        for field, text, qid in fields:
+            w = FIELD_WEIGHTS[field]
+            for term in set(tokenize(text)):
+                weights[term] = weights.get(term, 0.0) + w
+                if qid is None:
+                    own[term] = own.get(term, 0.0) + w
+                elif w > where.get(term, (None, 0.0))[1]:
+                    where[term] = (qid, w)
+        for term, w in weights.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = {}
+                self._add_term(term)
+            postings[name] = w
+        for term, (qid, w) in where.items():
+            # A term the tool's name or description carries is not credited
+            # to a question
+            if w > own.get(term, 0.0):
+                self._where[term, name] = qid
+        self._tools[name] = (tool, tuple(weights))
+
+    def _drop(self, name: str):
+        _, terms = self._tools.pop(name)
+        for term in terms:
+            postings = self.postings[term]
+            del postings[name]
+            self._where.pop((term, name), None)
+            if not postings:
+                del self.postings[term]
+                self._drop_term(term)
+
+    def _add_term(self, term: str):
+        for i in range(MIN_PREFIX, len(term) + 1):
+            self._prefixes.setdefault(term[:i], set()).add(term)
+        if len(term) >= MIN_TYPO:
+            for key in _deletes(term) | {term}:
+                self._typos.setdefault(key, set()).add(term)
+
+    def _drop_term(self, term: str):
+        for i in range(MIN_PREFIX, len(term) + 1):
+            terms = self._prefixes[term[:i]]
+            terms.discard(term)
+            if not terms:
+                del self._prefixes[term[:i]]
+        if len(term) >= MIN_TYPO:
+            for key in _deletes(term) | {term}:
+                terms = self._typos[key]
+                terms.discard(term)
+                if not terms:
+                    del self._typos[key]
+
+    def _matches(self, word: str, prefix: bool) -> dict:
+        # indexed term -> match factor for one query word
+        found = {}
+        if word in self.postings:
+            found[word] = 1.0
+        if prefix and len(word) >= MIN_PREFIX:
+            terms = self._prefixes.get(word, ())
+            if len(terms) > MAX_PREFIX_TERMS:
+                terms = heapq.nlargest(MAX_PREFIX_TERMS, terms, key=lambda t: len(self.postings[t]))
+            for term in terms:
+                found.setdefault(term, PREFIX_FACTOR)
+        if len(word) >= MIN_TYPO:
+            for key in _deletes(word) | {word}:
+                for term in self._typos.get(key, ()):
+                    if term not in found and _within_one_edit(word, term):
+                        found[term] = TYPO_FACTOR
+        return found
+
+    def search(self, query: str, limit: int = 20) -> list:
+        words = tokenize(query)
+        if not words:
+            return []
+        with self._lock:
+            total = max(len(self._tools), 1)
+            scores = {}    # tool name -> [query words matched, score]
+            best = {}      # tool name -> (contribution, question id) of its best term
+            words = list(dict.fromkeys(words))
+            for n, word in enumerate(words, start=1):
+                per_tool = {}
+                for term, factor in self._matches(word, prefix=n == len(words)).items():
+                    postings = self.postings[term]
+                    idf = math.log(1.0 + total / len(postings))
+                    for name, w in postings.items():
+                        s = factor * w * idf
+                        if s > per_tool.get(name, (0.0,))[0]:
+                            per_tool[name] = (s, term)
+                for name, (s, term) in per_tool.items():
+                    entry = scores.setdefault(name, [0, 0.0])
+                    entry[0] += 1
+                    entry[1] += s
+                    qid = self._where.get((term, name))
+                    if qid is not None and s > best.get(name, (0.0, None))[0]:
+                        best[name] = (s, qid)
+        ranked = sorted(scores.items(), key=lambda item: (-item[1][0], -item[1][1], item[0]))
+        return [SearchHit(name, score, best.get(name, (0.0, None))[1]) for name, (_, score) in ranked[:limit]]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_search_index() -> ToolIndex:
+    # One index per process, brought up to date with the registry on each call
+    global _index
+    with _index_lock:
+        if _index is None:
+            snapshot = get_snapshot()
+            _index = snapshot.load_index() if snapshot is not None else None
+            if _index is None:
+                _index = ToolIndex()
+        _index.refresh()
+        return _index
@@ -0,0 +1,257 @@
+# ------------------------------------------------------------
+# Prompt rendering HTTP service (asyncio, stdlib only)
+# - GET  /tools                 list tools
+# - GET  /tools/<name>          question schema for one tool
+# - POST /render                render one payload
+# - POST /render/batch          render {"records": [payload, ...]}
+# Payloads use the "Download Inputs (.json)" shape:
+#   {"tool": ..., "strict_mode": ..., "include_visual_step": ..., "answers": {...}}
+# - An idle keep-alive connection is closed after IDLE_TIMEOUT; once a
+#   request has started, its headers and its body must each arrive within
+#   the read timeout, or it is answered with 408 and closed
+#
+# Usage:
+#   python -m prompt_builder.server --port 8765
+# ------------------------------------------------------------
+
+import argparse
+import asyncio
+import json
+import sys
+import traceback
+from urllib.parse import unquote, urlsplit
+
+from prompt_builder.batch import render_record
+from prompt_builder.core import REGISTRY, registry_view
+from prompt_builder.registry import load_tools
+
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 1024 * 1024
+MAX_BATCH_RECORDS = 1000
+MAX_CONNECTIONS = 256
+IDLE_TIMEOUT = 30.0
+READ_TIMEOUT = 10.0
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    408: "Request Timeout",
+    411: "Length Required",
+    413: "Payload Too Large",
+    422: "Unprocessable Entity",
+    431: "Request Header Fields Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str, **extra):
+        super().__init__(message)
+        self.status = status
+        self.body = {"error": message, **extra}
+
+
+def question_dict(q) -> dict:
+    # Same shape as a TOOLS question: fields left at their default are omitted
+    out = {"id": q.id, "label": q.label, "type": q.type}
+    for field, default in q._defaults.items():
+        value = getattr(q, field)
+        if value != default:
+            out[field] = list(value) if field == "options" else value
+    return out
+
+
+def tool_summary(tool_name: str, tool=None) -> dict:
+    tool = tool or REGISTRY[tool_name]
+    return {"name": tool_name, "desc": tool.desc, "who": tool.who}
+
+
+def tool_detail(tool_name: str, tool=None) -> dict:
+    tool = tool or REGISTRY[tool_name]
+    return {
+        **tool_summary(tool_name, tool),
+        "questions": [question_dict(q) for q in tool.questions],
+        "has_visual_step": bool(tool.visual_block),
+    }
+
+
+def render_one(payload) -> dict:
+    result = render_record(payload)
+    if not result.pop("ok"):
+        raise HttpError(422, result.pop("error"), **result)
+    return result
+
+
+def render_many(payload, max_records: int) -> dict:
+    records = payload.get("records") if isinstance(payload, dict) else None
+    if not isinstance(records, list):
+        raise HttpError(400, 'expected {"records": [...]}')
+    if len(records) > max_records:
+        raise HttpError(413, f"batch too large: {len(records)} records (max {max_records})")
+    return {"results": [render_record(r) for r in records]}
+
+
+class PromptServer:
+    def __init__(self, max_body: int = MAX_BODY_BYTES, max_batch: int = MAX_BATCH_RECORDS,
+                 max_connections: int = MAX_CONNECTIONS, read_timeout: float = READ_TIMEOUT):
+        self.max_body = max_body
+        self.max_batch = max_batch
+        self.max_connections = max_connections
+        self.read_timeout = read_timeout
+        self.connections = 0
+        self.tools = load_tools()
+
+    def route(self, method: str, path: str, body: bytes):
+        if self.tools is not None:
+            self.tools.maybe_reload()
+        parts = [unquote(p) for p in urlsplit(path).path.strip("/").split("/")]
+
+        if parts[0] == "tools":
+            if method != "GET":
+                raise HttpError(405, "use GET")
+            if len(parts) == 1:
+                return {"tools": [tool_summary(name, tool) for name, tool in registry_view().items()]}
+            tool = REGISTRY.get(parts[1]) if len(parts) == 2 else None
+            if tool is not None:
+                return tool_detail(parts[1], tool)
+            raise HttpError(404, f"unknown tool: {parts[-1]!r}")
+
+        if parts[0] == "render" and len(parts) <= 2:
+            if method != "POST":
+                raise HttpError(405, "use POST")
+            try:
+                payload = json.loads(body or b"null")
+            except ValueError as exc:
+                raise HttpError(400, f"invalid JSON: {exc}")
+            if len(parts) == 1:
+                return render_one(payload)
+            if parts[1] == "batch":
+                return render_many(payload, self.max_batch)
+
+        raise HttpError(404, f"no route for {path}")
+
+    async def read_request(self, reader: asyncio.StreamReader):
+        # Waiting for the next request on an idle connection: no answer when it ends
+        try:
+            head = await asyncio.wait_for(reader.readexactly(1), IDLE_TIMEOUT)
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+            return None
+        try:
+            head += await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self.read_timeout)
+        except asyncio.LimitOverrunError:
+            raise HttpError(431, "request headers too large")
+        except asyncio.TimeoutError:
+            raise HttpError(408, "request headers not received in time")
+
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, path, version = lines[0].split(" ", 2)
+        except ValueError:
+            raise HttpError(400, "malformed request line")
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                k, v = line.split(":", 1)
+                headers[k.strip().lower()] = v.strip()
+
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            raise HttpError(411, "chunked bodies are not supported; send Content-Length")
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            raise HttpError(400, "invalid Content-Length")
+        if length < 0:
+            raise HttpError(400, "invalid Content-Length")
+        if length > self.max_body:
+            raise HttpError(413, f"body too large: {length} bytes (max {self.max_body})")
+        try:
+            body = await asyncio.wait_for(reader.readexactly(length), self.read_timeout) if length else b""
+        except asyncio.TimeoutError:
+            raise HttpError(408, "request body not received in time")
+
+        keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+        return method, path, body, keep_alive
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    request = await self.read_request(reader)
+                    if request is None:
+                        break
+                    method, path, body, keep_alive = request
+                    if self.connections > self.max_connections:
+                        keep_alive = False
+                        raise HttpError(503, "server busy, retry later")
+                    # Rendering is CPU-bound and short, so it runs inline on the loop
+                    status, result = 200, self.route(method, path, body)
+                except HttpError as exc:
+                    status, result = exc.status, exc.body
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    raise
+                except Exception as exc:
+                    # A bug in routing or rendering: answer it, close the connection
+                    traceback.print_exc(file=sys.stderr)
+                    keep_alive = False
+                    status, result = 500, {"error": f"internal error: {type(exc).__name__}"}
+
+                data = json.dumps(result, ensure_ascii=False).encode("utf-8")
+                writer.write(
+                    (
+                        f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                        "Content-Type: application/json; charset=utf-8\r\n"
+                        f"Content-Length: {len(data)}\r\n"
+                        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+                        "\r\n"
+                    ).encode("latin-1")
+                    + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self.handle, host, port, limit=MAX_HEADER_BYTES)
+
+
+async def serve(host: str, port: int, server: PromptServer):
+    srv = await server.start(host, port)
+    addr = srv.sockets[0].getsockname()
+    print(f"Prompt Builder API listening on http://{addr[0]}:{addr[1]}", file=sys.stderr)
+    async with srv:
+        await srv.serve_forever()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m prompt_builder.server", description="Serve prompt rendering over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-body", type=int, default=MAX_BODY_BYTES, help="Max request body in bytes.")
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH_RECORDS, help="Max records per batch request.")
+    parser.add_argument("--max-connections", type=int, default=MAX_CONNECTIONS,
+                        help="Max open client connections; extra requests get 503.")
+    parser.add_argument("--read-timeout", type=float, default=READ_TIMEOUT,
+                        help="Seconds a started request has for its headers, and again for its body (408 after).")
+    args = parser.parse_args(argv)
+
+    server = PromptServer(max_body=args.max_body, max_batch=args.max_batch, max_connections=args.max_connections,
+                          read_timeout=args.read_timeout)
+    try:
+        asyncio.run(serve(args.host, args.port, server))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
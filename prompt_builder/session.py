@@ -0,0 +1,130 @@
+# ------------------------------------------------------------
+# Compact per-session state
+# - LastPrompt: what a session keeps about its last generated prompt. Holds
+#   a tool index, the flags, and one answer per question; "single" answers
+#   are the registry's own option strings (interned), so only free text is
+#   stored per session
+# - The prompt text is not kept: prompt() re-renders it through the shared
+#   render cache, or reads the history entry it was loaded from or
+#   duplicates
+# - session_bytes(): approximate memory one session's state holds, leaving
+#   out objects every session shares (compiled tools)
+# ------------------------------------------------------------
+
+import sys
+import threading
+
+from prompt_builder.cache import cached_assemble_prompt
+from prompt_builder.core import REGISTRY, registry_view
+
+# Tool names get a small index for the life of the process; append-only, so
+# an index stays valid when tools are reloaded or removed
+_tool_names = []
+_tool_index = {}
+_names_lock = threading.Lock()
+
+
+def tool_index(tool_name: str) -> int:
+    i = _tool_index.get(tool_name)
+    if i is None:
+        with _names_lock:
+            i = _tool_index.get(tool_name)
+            if i is None:
+                i = len(_tool_names)
+                _tool_names.append(tool_name)
+                _tool_index[tool_name] = i
+    return i
+
+
+def tool_name_at(index: int) -> str:
+    return _tool_names[index]
+
+
+def _intern_option(q, v: str) -> str:
+    for option in q.options:
+        if option == v:
+            return option
+    return sys.intern(v)
+
+
+class LastPrompt:
+    __slots__ = ("tool", "questions", "values", "strict", "visual", "large", "history_id")
+
+    def __init__(self, tool_name: str, answers: dict, strict_mode: bool, include_visual: bool,
+                 large: bool = False, history_id: int = None):
+        schema = REGISTRY[tool_name]
+        values = []
+        for q in schema.questions:
+            v = answers.get(q.id, "") or ""
+            if not isinstance(v, str):
+                v = str(v)
+            values.append(_intern_option(q, v) if q.type == "single" else v)
+        self.tool = tool_index(tool_name)
+        self.questions = schema.questions  # shared with the compiled tool
+        self.values = tuple(values)
+        self.strict = bool(strict_mode)
+        self.visual = bool(include_visual)
+        self.large = bool(large)
+        self.history_id = history_id
+
+    @property
+    def tool_name(self) -> str:
+        return tool_name_at(self.tool)
+
+    def answers(self) -> dict:
+        return {q.id: v for q, v in zip(self.questions, self.values)}
+
+    def render_args(self) -> tuple:
+        # (tool name, answers, strict, visual) for the core render functions
+        return self.tool_name, self.answers(), self.strict, self.visual
+
+    def prompt(self, store=None) -> str:
+        if self.history_id is not None and store is not None:
+            entry = store.get(self.history_id)
+            if entry is not None:
+                return entry["prompt"]
+        return cached_assemble_prompt(*self.render_args())
+
+
+# -- memory ----------------------------------------------------------------
+
+_shared = (None, frozenset())
+
+
+def _shared_ids() -> frozenset:
+    # ids of everything reachable from the registry; recomputed when it changes
+    global _shared
+    registry = registry_view()
+    key = tuple(map(id, registry.values()))
+    if _shared[0] != key:
+        seen = set()
+        deep_size(registry, seen)
+        _shared = (key, frozenset(seen))
+    return _shared[1]
+
+
+def deep_size(obj, seen: set) -> int:
+    # sys.getsizeof over containers, instance dicts and slots; functions,
+    # classes and objects already in `seen` count as zero
+    if id(obj) in seen or isinstance(obj, type) or callable(obj):
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if obj is None or isinstance(obj, (str, bytes, bytearray, int, float)):
+        return size
+    if isinstance(obj, dict):
+        return size + sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return size + sum(deep_size(v, seen) for v in obj)
+    if hasattr(obj, "__dict__"):
+        size += deep_size(vars(obj), seen)
+    for cls in type(obj).__mro__:
+        slots = getattr(cls, "__slots__", ())
+        for name in (slots,) if isinstance(slots, str) else slots:
+            size += deep_size(getattr(obj, name, None), seen)
+    return size
+
+
+def session_bytes(state: dict) -> int:
+    """Approximate bytes held by one session's state (e.g. st.session_state.to_dict())."""
+    return deep_size(state, set(_shared_ids()))
@@ -0,0 +1,222 @@
+# ------------------------------------------------------------
+# Cold-start snapshot
+# - A build step pickles what a fresh process otherwise compiles before it
+#   can serve: compiled tool files (by content hash), translated tools (by
+#   locale, catalog hash and source tool) and the search index
+# - At startup the tool file loader, the locale catalogs and the search
+#   index start from the snapshot; anything that changed since the build
+#   misses it and is compiled as usual, so a snapshot is never wrong, only
+#   less useful
+# - The file is memory-mapped. Tools are unpickled at startup; the search
+#   index, a second pickle that refers to those tools by position, only
+#   when the first search needs it
+# - The file starts with a one-line JSON header holding a key over the
+#   snapshot format, the Python version and the modules that define the
+#   compiled layout (built-in TOOLS included). A snapshot built from other
+#   sources is stale: it is not unpickled and everything is compiled
+# - Pickle runs code while loading: only point this at files you built
+#
+# Configure through environment variables:
+#   PROMPT_BUILDER_SNAPSHOT   snapshot file (unset = compile at startup)
+#
+# Usage (at build/deploy time, with the same environment as the app):
+#   python -m prompt_builder.snapshot build
+#   python -m prompt_builder.snapshot check
+# ------------------------------------------------------------
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import sys
+import threading
+import time
+from datetime import datetime
+
+from prompt_builder.schema import Tool
+
+VERSION = 1
+FORMAT = "prompt_builder.snapshot"
+
+# Modules whose source decides what a compiled tool or index looks like
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE_FILES = ("core.py", "schema.py", "registry.py", "i18n.py", "search.py", "snapshot.py")
+
+
+def source_key() -> str:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{FORMAT} {VERSION} {sys.implementation.cache_tag} {pickle.HIGHEST_PROTOCOL}".encode())
+    for name in SOURCE_FILES:
+        with open(os.path.join(PACKAGE_DIR, name), "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+class Snapshot:
+    __slots__ = ("path", "status", "files", "localized", "load_ms", "_tools", "_map", "_lock")
+
+    def __init__(self, path: str, status: str, state: dict = None, mapped=None, load_ms: float = 0.0):
+        state = state or {}
+        self.path = path
+        self.status = status        # "loaded", "missing", "stale" or "unreadable: ..."
+        self.files = state.get("files", {})          # tool file content digest -> Tool
+        self.localized = state.get("localized", {})  # (locale, catalog digest, source Tool) -> (Tool or None, error or None)
+        self.load_ms = load_ms
+        self._tools = state.get("tools", [])  # every Tool in the snapshot; the index refers to them by position
+        self._map = mapped                    # the file, positioned at the index, until it is read
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self.status == "loaded"
+
+    def load_index(self):
+        # The search index from the snapshot, once; None after that or when there is none
+        with self._lock:
+            mapped, self._map = self._map, None
+            tools, self._tools = self._tools, []
+        if mapped is None:
+            return None
+        with mapped:
+            unpickler = pickle.Unpickler(mapped)
+            unpickler.persistent_load = tools.__getitem__
+            try:
+                return unpickler.load()
+            except Exception:
+                # Corrupt index part; the caller builds one
+                return None
+
+
+def load_snapshot(path: str) -> Snapshot:
+    t0 = time.perf_counter()
+    try:
+        with open(path, "rb") as f:
+            # The mapping outlives a rebuild: os.replace() leaves this file intact
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except FileNotFoundError:
+        return Snapshot(path, "missing")
+    except (OSError, ValueError) as exc:
+        # Unreadable, or empty (nothing to map)
+        return Snapshot(path, f"unreadable: {exc}")
+    try:
+        header = json.loads(mapped.readline())
+    except ValueError:
+        header = None
+    if not isinstance(header, dict) or header.get("format") != FORMAT:
+        mapped.close()
+        return Snapshot(path, "unreadable: not a snapshot file")
+    if header.get("key") != source_key():
+        mapped.close()
+        return Snapshot(path, "stale")
+    try:
+        state = pickle.load(mapped)
+    except Exception as exc:
+        # Truncated or corrupt payload
+        mapped.close()
+        return Snapshot(path, f"unreadable: {type(exc).__name__}: {exc}")
+    load_ms = (time.perf_counter() - t0) * 1000
+    return Snapshot(path, "loaded", state, mapped, load_ms)
+
+
+def write_snapshot(path: str) -> dict:
+    """Compile everything for the current environment and write it to path; returns the header."""
+    from prompt_builder.core import registry_view
+    from prompt_builder.i18n import get_locales
+    from prompt_builder.registry import load_tools
+    from prompt_builder.search import get_search_index
+
+    loader = load_tools()
+    locales = get_locales()
+    index = get_search_index()
+    registry = registry_view()
+    files = loader.snapshot_state() if loader is not None else {}
+    localized = locales.snapshot_state() if locales is not None else {}
+    tools = {}
+    for tool in [*registry.values(), *files.values(), *(key[2] for key in localized),
+                 *(entry[0] for entry in localized.values() if entry[0] is not None)]:
+        tools.setdefault(id(tool), tool)
+    tools = list(tools.values())
+    positions = {id(tool): i for i, tool in enumerate(tools)}
+    state = {"tools": tools, "files": files, "localized": localized}
+    header = {
+        "format": FORMAT,
+        "version": VERSION,
+        "key": source_key(),
+        "built_at": datetime.now().isoformat(timespec="seconds"),
+        "tools": len(registry),
+        "files": len(state["files"]),
+        "localized": sum(1 for tool, _ in localized.values() if tool is not None),
+    }
+    # Atomic replace: running processes keep the file they opened
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(json.dumps(header).encode("utf-8") + b"\n")
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        pickler = pickle.Pickler(f, protocol=pickle.HIGHEST_PROTOCOL)
+        pickler.persistent_id = lambda obj: positions.get(id(obj)) if type(obj) is Tool else None
+        pickler.dump(index)
+    os.replace(tmp, path)
+    return header
+
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+
+def get_snapshot():
+    # Process-wide snapshot for PROMPT_BUILDER_SNAPSHOT, read once; None when unset
+    global _snapshot
+    path = os.environ.get("PROMPT_BUILDER_SNAPSHOT", "")
+    if not path:
+        return None
+    with _snapshot_lock:
+        if _snapshot is None or _snapshot.path != path:
+            _snapshot = load_snapshot(path)
+        return _snapshot
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m prompt_builder.snapshot", description="Cold-start snapshot tools.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Compile the registry, translations and search index into a snapshot.")
+    build.add_argument("-o", "--output", help="Snapshot file (default: PROMPT_BUILDER_SNAPSHOT).")
+    check = sub.add_parser("check", help="Report whether a snapshot is current for these sources.")
+    check.add_argument("path", nargs="?", help="Snapshot file (default: PROMPT_BUILDER_SNAPSHOT).")
+    args = parser.parse_args(argv)
+
+    path = (args.output if args.command == "build" else args.path) or os.environ.get("PROMPT_BUILDER_SNAPSHOT", "")
+    if not path:
+        print("no snapshot file: set PROMPT_BUILDER_SNAPSHOT or pass a path", file=sys.stderr)
+        return 2
+
+    if args.command == "check":
+        snapshot = load_snapshot(path)
+        print(f"{path}: {snapshot.status}")
+        if snapshot.loaded:
+            translated = sum(1 for tool, _ in snapshot.localized.values() if tool is not None)
+            print(f"{len(snapshot.files)} tool files, {translated} translated tools, "
+                  f"loaded in {snapshot.load_ms:.1f} ms")
+        return 0 if snapshot.loaded else 1
+
+    # Build from source, not from the snapshot being replaced
+    os.environ.pop("PROMPT_BUILDER_SNAPSHOT", None)
+    t0 = time.perf_counter()
+    header = write_snapshot(path)
+    print(f"wrote {path}: {header['tools']} tools ({header['files']} from files, "
+          f"{header['localized']} translated) in {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+    from prompt_builder.i18n import get_locales
+    from prompt_builder.registry import get_tool_registry
+    errors = {}
+    for loader in (get_tool_registry(), get_locales()):
+        if loader is not None:
+            errors.update(loader.errors)
+    for key, error in errors.items():
+        print(f"error: {key}: {error}", file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+# ------------------------------------------------------------
+# Large-input support
+# - Size budgets per answer field and for the whole prompt, checked before
+#   anything is rendered
+# - Prompt and inputs downloads encoded chunk by chunk from the prompt
+#   pieces, without first building the full prompt string
+# - A bounded preview for the page, so a 10 MB prompt is not pushed
+#   through the text area
+# ------------------------------------------------------------
+
+import json
+
+from prompt_builder.core import REGISTRY, prompt_chunks
+
+CHUNK_CHARS = 64 * 1024
+
+DEFAULT_MAX_FIELD_CHARS = 16 * 1024 * 1024
+DEFAULT_MAX_TOTAL_CHARS = 32 * 1024 * 1024
+
+
+def check_size_budgets(tool_name: str, answers: dict, strict_mode: bool, include_visual: bool,
+                       max_field_chars: int = DEFAULT_MAX_FIELD_CHARS,
+                       max_total_chars: int = DEFAULT_MAX_TOTAL_CHARS):
+    # Returns human-readable problems, like validate_required; empty = OK
+    problems = []
+    for q in REGISTRY[tool_name].questions:
+        v = answers.get(q.id, "")
+        size = len(v) if isinstance(v, str) else len(str(v))
+        if max_field_chars and size > max_field_chars:
+            problems.append(f"{q.label} is {size:,} characters (limit {max_field_chars:,})")
+
+    if max_total_chars:
+        total = sum(len(p) for p in prompt_chunks(tool_name, answers, strict_mode, include_visual))
+        if total > max_total_chars:
+            problems.append(f"The full prompt would be {total:,} characters (limit {max_total_chars:,})")
+    return problems
+
+
+def iter_prompt_text(tool_name: str, answers: dict, strict_mode: bool, include_visual: bool,
+                     chunk_chars: int = CHUNK_CHARS):
+    # Prompt text in slices of at most chunk_chars characters
+    for piece in prompt_chunks(tool_name, answers, strict_mode, include_visual):
+        if len(piece) <= chunk_chars:
+            yield piece
+            continue
+        for i in range(0, len(piece), chunk_chars):
+            yield piece[i:i + chunk_chars]
+
+
+def iter_prompt_bytes(tool_name: str, answers: dict, strict_mode: bool, include_visual: bool,
+                      chunk_chars: int = CHUNK_CHARS):
+    for text in iter_prompt_text(tool_name, answers, strict_mode, include_visual, chunk_chars):
+        yield text.encode("utf-8")
+
+
+def prompt_bytes(tool_name: str, answers: dict, strict_mode: bool, include_visual: bool) -> bytes:
+    # UTF-8 prompt for download; never holds the prompt as one str
+    return b"".join(iter_prompt_bytes(tool_name, answers, strict_mode, include_visual))
+
+
+def inputs_json_bytes(payload: dict) -> bytes:
+    # Same bytes as json.dumps(payload, indent=2).encode("utf-8"), built from
+    # the encoder's pieces instead of one full-size str
+    encoder = json.JSONEncoder(indent=2)
+    return b"".join(piece.encode("utf-8") for piece in encoder.iterencode(payload))
+
+
+def clip_chunks(chunks, max_chars: int) -> tuple:
+    # (first max_chars characters of the joined chunks, total characters)
+    parts = []
+    remaining = max_chars
+    total = 0
+    for piece in chunks:
+        total += len(piece)
+        if remaining > 0:
+            parts.append(piece[:remaining])
+            remaining -= len(parts[-1])
+    return "".join(parts), total
+
+
+def prompt_preview(tool_name: str, answers: dict, strict_mode: bool, include_visual: bool,
+                   max_chars: int) -> tuple:
+    # (first max_chars characters, total characters)
+    return clip_chunks(prompt_chunks(tool_name, answers, strict_mode, include_visual), max_chars)
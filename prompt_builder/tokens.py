@@ -0,0 +1,111 @@
+# ------------------------------------------------------------
+# Offline token estimates
+# - A tokenizer-free estimate of how many tokens a prompt uses, close enough
+#   to warn before pasting into a model with a limited context window
+# - Counts are kept per prompt piece: template text, STRICT_RULES and the
+#   visual block are counted once per tool, and answers are cached by
+#   content, so a rerun only counts answers that changed
+# - Per-tool budgets come from the tool's "token_budget"
+# ------------------------------------------------------------
+
+import re
+import threading
+from collections import OrderedDict
+
+from prompt_builder.core import REGISTRY, STRICT_RULES, prompt_chunks
+
+# Rough BPE shape: a common word is one token and long words split every
+# 6 letters, digits group by three, a run of newlines is one token, and
+# every other symbol (punctuation, non-Latin characters) is a token.
+TOKEN_RE = re.compile(r"[A-Za-z]{1,6}|\d{1,3}|\n+|[^\sA-Za-z\d]")
+SLICE_CHARS = 64 * 1024
+
+# Share of the budget at which the page starts warning
+WARN_RATIO = 0.8
+
+
+def count_tokens(text: str) -> int:
+    if len(text) <= SLICE_CHARS:
+        return len(TOKEN_RE.findall(text))
+    # Long answers are counted in slices cut at whitespace, so memory stays
+    # bounded by the slice size instead of one match object per token
+    count = 0
+    start = 0
+    while start < len(text):
+        end = start + SLICE_CHARS
+        if end < len(text):
+            cut = text.rfind(" ", start, end)
+            end = cut + 1 if cut > start else end
+        count += len(TOKEN_RE.findall(text[start:end]))
+        start = end
+    return count
+
+
+class TokenCounter:
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._static = {}              # tool fingerprint -> {segment: count}
+        self._answers = OrderedDict()  # (len, hash) of a piece -> count
+        self._lock = threading.Lock()
+        self.counted_chars = 0         # characters actually scanned (cache misses)
+
+    def _static_counts(self, tool) -> dict:
+        counts = self._static.get(tool.fingerprint)
+        if counts is None:
+            segments = set(tool.literals)
+            segments.update(("\n", "\n\n", (tool.strict_rules or STRICT_RULES).rstrip()))
+            if tool.visual_block:
+                segments.add(tool.visual_block.rstrip())
+            counts = {s: count_tokens(s) for s in segments}
+            self._static[tool.fingerprint] = counts
+        return counts
+
+    def count(self, text: str) -> int:
+        # Keyed by length and hash rather than the string itself, so a cached
+        # 10 MB answer does not keep the answer alive
+        key = (len(text), hash(text))
+        with self._lock:
+            n = self._answers.get(key)
+            if n is not None:
+                self._answers.move_to_end(key)
+                return n
+        n = count_tokens(text)
+        with self._lock:
+            self.counted_chars += len(text)
+            self._answers[key] = n
+            while len(self._answers) > self.max_entries:
+                self._answers.popitem(last=False)
+        return n
+
+    def prompt_tokens(self, tool_name: str, answers: dict, strict_mode: bool, include_visual: bool) -> int:
+        return self.chunks_tokens(REGISTRY[tool_name], prompt_chunks(tool_name, answers, strict_mode, include_visual))
+
+    def chunks_tokens(self, tool, chunks) -> int:
+        # chunks as returned by prompt_chunks for this tool
+        static = self._static_counts(tool)
+        total = 0
+        for piece in chunks:
+            if not piece:
+                continue
+            n = static.get(piece)
+            total += n if n is not None else self.count(piece)
+        return total
+
+
+TOKEN_COUNTER = TokenCounter()
+
+
+def estimate_tokens(tool_name: str, answers: dict, strict_mode: bool, include_visual: bool,
+                    counter: TokenCounter = None) -> int:
+    counter = TOKEN_COUNTER if counter is None else counter
+    return counter.prompt_tokens(tool_name, answers, strict_mode, include_visual)
+
+
+def check_token_budget(tool_name: str, tokens: int, warn_ratio: float = WARN_RATIO):
+    # ("over" | "near" | None, message); None when within budget or no budget is set
+    budget = REGISTRY[tool_name].token_budget
+    if not budget or tokens < budget * warn_ratio:
+        return None, ""
+    if tokens > budget:
+        return "over", f"About {tokens:,} tokens: over the {budget:,}-token budget for {tool_name}."
+    return "near", f"About {tokens:,} tokens: close to the {budget:,}-token budget for {tool_name}."
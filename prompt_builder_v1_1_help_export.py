@@ -1,7 +1,52 @@
 import streamlit as st
-import json
+import io
+import os
 from datetime import datetime
 
+from prompt_builder.archive import ARCHIVE_EXT, ARCHIVE_MIME, ArchiveWriter
+from prompt_builder.cache import RENDER_CACHE, cached_assemble_prompt
+from prompt_builder.core import REGISTRY, validate_required
+from prompt_builder.fanout import fan_out, get_field_index
+from prompt_builder.history import answers_hash, get_store
+from prompt_builder.i18n import (
+    DEFAULT_LOCALE,
+    base_name,
+    get_locales,
+    locale_tool_names,
+    localized_name,
+    translate_answer,
+)
+from prompt_builder.lint import LINT_ENABLED, lint_prompt, lint_summary
+from prompt_builder.merge import (
+    FORMATS,
+    ErrorReport,
+    MergeError,
+    discard_archive,
+    finish_archive,
+    open_archive,
+    open_sheet,
+    run_merge,
+    suggest_mapping,
+)
+from prompt_builder.metrics import METRICS, export_metrics
+from prompt_builder.preview import LivePreview
+from prompt_builder.registry import load_tools
+from prompt_builder.replay import load_payload
+from prompt_builder.schema import Question
+from prompt_builder.search import get_search_index
+from prompt_builder.session import LastPrompt, session_bytes
+from prompt_builder.snapshot import get_snapshot
+from prompt_builder.streaming import (
+    DEFAULT_MAX_FIELD_CHARS,
+    DEFAULT_MAX_TOTAL_CHARS,
+    check_size_budgets,
+    clip_chunks,
+    inputs_json_bytes,
+    prompt_bytes,
+    prompt_preview,
+)
+from prompt_builder.tokens import TOKEN_COUNTER, check_token_budget, estimate_tokens
+
 st.set_page_config(page_title="Prompt Builder", layout="centered")
 
 # ------------------------------------------------------------
@@ -9,7 +54,8 @@ st.set_page_config(page_title="Prompt Builder", layout="centered")
 # - Adds question flows for every tool/category:
 #   ChatGPT, Gemini, NotebookLM, Gemini Gems, Google AI Studio, Google Antigravity
 # - Adds NotebookLM Podcast option as "Coming soon" (honest + visible)
-# - Keeps this as a single-file Streamlit app (same entrypoint filename safe)
+# - Keeps this file as the Streamlit entrypoint (same filename safe);
+#   schemas and rendering live in prompt_builder.core
 # ------------------------------------------------------------
 
 APP_TITLE = "Prompt Builder"
@@ -19,486 +65,350 @@ APP_SUBTEXT = (
     "It does not call any AI by itself — it only builds a prompt for you."
 )
 
-STRICT_RULES = """Strict rules (recommended):
-- Do not invent facts, names, features, prices, or statistics.
-- If required information is missing, ask up to 3 clarifying questions before proceeding.
-- Clearly label any assumptions.
-- Prefer accuracy and clarity over creativity.
-"""
-
-TOOLS = {
-    "ChatGPT": {
-        "desc": "For writing, planning, brainstorming, and structured outputs.",
-        "who": "Creators, marketers, students, and builders who want clear output with constraints.",
-        "questions": [
-            {
-                "id": "Goal",
-                "label": "What do you want ChatGPT to produce?",
-                "type": "text",
-                "help": "One sentence is enough. Example: 'Write a LinkedIn post announcing Prompt Builder.'",
-                "ph": "E.g., Write a LinkedIn post announcing Prompt Builder."
-            },
-            {
-                "id": "Audience",
-                "label": "Who is this for?",
-                "type": "text",
-                "help": "Example: 'Beginners exploring AI tools' or 'Small business owners'.",
-                "ph": "E.g., Beginners exploring AI tools"
-            },
-            {
-                "id": "Tone",
-                "label": "Tone",
-                "type": "single",
-                "options": ["Neutral", "Professional", "Friendly", "Direct (no fluff)", "Persuasive"],
-                "help": "Pick the voice you want in the output."
-            },
-            {
-                "id": "Format",
-                "label": "Output format",
-                "type": "single",
-                "options": ["Bullets", "Numbered steps", "Short paragraphs", "Checklist", "Table"],
-                "help": "How should the answer be structured?"
-            },
-            {
-                "id": "Constraints",
-                "label": "Any constraints or must-includes?",
-                "type": "text",
-                "help": "Optional, but helpful. Example: 'Include 3 bullet benefits and a call-to-action.'",
-                "ph": "E.g., Include 3 benefits and a call-to-action.",
-                "optional": True
-            },
-            {
-                "id": "Role",
-                "label": "Role (optional)",
-                "type": "text",
-                "help": "Optional: 'marketing strategist', 'copy editor', 'product manager'. Leave blank if unsure.",
-                "ph": "E.g., marketing strategist",
-                "optional": True
-            },
-        ],
-        "template": """{ROLE_BLOCK}Task:
-{Goal}
-
-Audience:
-{Audience}
-
-Tone:
-{Tone}
-
-Format:
-{Format}
-
-Constraints / must-includes:
-{Constraints}
-"""
-    },
-
-    "Gemini": {
-        "desc": "For structured workflows, calendars, plans, and multi-step outputs.",
-        "who": "Anyone who wants a reusable workflow or a structured plan.",
-        "questions": [
-            {
-                "id": "Task",
-                "label": "What should Gemini do?",
-                "type": "text",
-                "help": "Example: 'Create a 2-week LinkedIn content calendar for Prompt Builder.'",
-                "ph": "E.g., Create a 2-week LinkedIn content calendar for Prompt Builder."
-            },
-            {
-                "id": "Goal",
-                "label": "What does success look like?",
-                "type": "text",
-                "help": "Example: 'A day-by-day calendar with post ideas and short outlines.'",
-                "ph": "E.g., Day-by-day calendar with post ideas and short outlines."
-            },
-            {
-                "id": "Structure",
-                "label": "Preferred structure",
-                "type": "single",
-                "options": ["Numbered steps", "Outline", "Table", "Headings + bullets"],
-                "help": "How should Gemini format the output?"
-            },
-            {
-                "id": "Detail",
-                "label": "Detail level",
-                "type": "single",
-                "options": ["High-level", "Practical detail", "Very detailed"],
-                "help": "How much detail do you want?"
-            },
-            {
-                "id": "Constraints",
-                "label": "Constraints (optional)",
-                "type": "text",
-                "help": "Example: 'No jargon, include examples, keep each post under 1200 characters.'",
-                "ph": "E.g., No jargon; include examples; keep it short.",
-                "optional": True
-            },
-        ],
-        "template": """Task:
-{Task}
-
-Success criteria:
-{Goal}
-
-Structure:
-{Structure}
-
-Detail level:
-{Detail}
-
-Constraints:
-{Constraints}
-""",
-        "visual_block": """Optional visual creative step (Flow / Nano Banana Pro workflow):
-- Create a short creative brief for one supporting image that matches the task above.
-- Provide 2 image prompt variations.
-- Do NOT assume brand colors, logos, or assets.
-- If visual inputs (brand colors, product name, style) are missing, ask first.
-"""
-    },
-
-    "NotebookLM": {
-        "desc": "For source-based research and step-by-step learning grounded in your uploaded sources.",
-        "who": "People who want grounded output that stays tied to their sources.",
-        "questions": [
-            {
-                "id": "UseCase",
-                "label": "What are you using NotebookLM for?",
-                "type": "single",
-                "options": [
-                    "Research a topic from my sources",
-                    "Learn step-by-step from my sources",
-                    "Create a plan/blueprint from my sources",
-                    "Podcast planning (coming soon)"
-                ],
-                "help": "Pick the closest match. Podcast planning is shown as 'coming soon' to be honest and avoid confusion."
-            },
-            {
-                "id": "Sources",
-                "label": "What sources will you add to NotebookLM?",
-                "type": "single",
-                "options": ["PDF(s)", "Google Doc(s)", "Web articles", "Mixed sources"],
-                "help": "NotebookLM works best when you upload the sources first."
-            },
-            {
-                "id": "Goal",
-                "label": "What do you want NotebookLM to produce from your sources?",
-                "type": "text",
-                "help": "Be specific. Example: 'Summarize and produce a step-by-step launch checklist.'",
-                "ph": "E.g., Summarize my notes and produce a step-by-step checklist."
-            },
-            {
-                "id": "Experience",
-                "label": "Your experience level",
-                "type": "single",
-                "options": ["Beginner", "Intermediate", "Advanced"],
-                "help": "This controls how technical the explanations should be."
-            },
-            {
-                "id": "StepMode",
-                "label": "How should it guide you?",
-                "type": "single",
-                "options": ["One stage at a time (type 'next')", "All at once"],
-                "help": "The transcript demonstrated the 'type next' approach."
-            },
-        ],
-        "template": """You are an AI research assistant using ONLY my provided sources in NotebookLM.
-
-My sources type:
-{Sources}
-
-My goal:
-{Goal}
-
-My experience level:
-{Experience}
-
-Guidance mode:
-{StepMode}
-
-Rules:
-- Use my sources first. Stay grounded in them.
-- If something is missing from my sources, ask up to 3 clarifying questions.
-- Clearly label anything that is not supported by sources.
-
-Use case:
-{UseCase}
-
-{PODCAST_NOTICE}
-"""
-    },
-
-    "Gemini Gems": {
-        "desc": "For creating a focused, reusable assistant with boundaries (a ‘Gem’).",
-        "who": "Users who want a reusable assistant that stays focused on one job.",
-        "questions": [
-            {
-                "id": "GemName",
-                "label": "Name your Gem",
-                "type": "text",
-                "help": "Example: 'Email Calendar Helper' or 'LinkedIn Post Assistant'.",
-                "ph": "E.g., LinkedIn Post Assistant"
-            },
-            {
-                "id": "Role",
-                "label": "What role should it play?",
-                "type": "text",
-                "help": "Example: 'Act as a social media marketing assistant.'",
-                "ph": "E.g., Act as a social media marketing assistant."
-            },
-            {
-                "id": "Scope",
-                "label": "What is it allowed to do?",
-                "type": "text",
-                "help": "Keep it narrow and clear. Example: 'Create outlines and calendars; don't write final copy unless asked.'",
-                "ph": "E.g., Create outlines + calendars; don't write final copy unless asked."
-            },
-            {
-                "id": "Avoid",
-                "label": "What should it NOT do?",
-                "type": "text",
-                "help": "Example: 'Do not guess; ask questions when unclear; no legal advice.'",
-                "ph": "E.g., Do not invent facts; ask questions when unclear."
-            },
-            {
-                "id": "OutputStyle",
-                "label": "Preferred output style",
-                "type": "single",
-                "options": ["Bullets", "Numbered steps", "Table", "Short paragraphs"],
-                "help": "How you want the Gem to respond by default."
-            },
-        ],
-        "template": """Create a Gemini Gem with the following configuration.
-
-Gem name:
-{GemName}
-
-Role:
-{Role}
-
-Allowed scope:
-{Scope}
-
-Must NOT do:
-{Avoid}
-
-Default output style:
-{OutputStyle}
-
-Before starting, confirm you understand the role and boundaries.
-"""
-    },
-
-    "Google AI Studio": {
-        "desc": "For generating small web apps/tools when you provide clear inputs and outputs.",
-        "who": "Builders who want small functional utilities (calculators, generators, simple tools).",
-        "questions": [
-            {
-                "id": "AppType",
-                "label": "What type of app do you want to build?",
-                "type": "single",
-                "options": ["Calculator", "Generator", "Form-based tool", "Dashboard"],
-                "help": "Pick the closest match."
-            },
-            {
-                "id": "Users",
-                "label": "Who is the app for?",
-                "type": "text",
-                "help": "Example: 'investors', 'students', 'small business owners'.",
-                "ph": "E.g., small business owners"
-            },
-            {
-                "id": "Problem",
-                "label": "What problem does this app solve?",
-                "type": "text",
-                "help": "One sentence. Example: 'Estimate monthly taxes from a portfolio.'",
-                "ph": "E.g., Estimate monthly costs from user inputs."
-            },
-            {
-                "id": "Inputs",
-                "label": "What inputs does the user provide?",
-                "type": "text",
-                "help": "List the fields. Example: 'income, expenses, tax rate'.",
-                "ph": "E.g., income, rent, utilities, food, transport"
-            },
-            {
-                "id": "Outputs",
-                "label": "What outputs should the app show?",
-                "type": "text",
-                "help": "Example: 'total + breakdown table + chart'.",
-                "ph": "E.g., total + breakdown table"
-            },
-            {
-                "id": "Constraints",
-                "label": "Build constraints",
-                "type": "single",
-                "options": ["Fully functional + input validation", "Minimal demo only", "Explain logic with comments"],
-                "help": "Choose how robust it should be."
-            },
-        ],
-        "template": """Build a {AppType} web app.
-
-Target users:
-{Users}
-
-Problem to solve:
-{Problem}
-
-Inputs (fields and types):
-{Inputs}
-
-Outputs (what to show):
-{Outputs}
-
-Constraints:
-{Constraints}
-
-Requirements:
-- Provide complete working code.
-- Validate inputs and handle edge cases.
-- Ask clarifying questions only if required details are missing.
-"""
-    },
-
-    "Google Antigravity": {
-        "desc": "For reframing a problem and breaking mental blocks before execution.",
-        "who": "Anyone who feels stuck and wants better angles before taking action.",
-        "questions": [
-            {
-                "id": "Situation",
-                "label": "Describe the situation",
-                "type": "text",
-                "help": "1–3 sentences about what’s going on.",
-                "ph": "E.g., I want to grow my tool but I’m unsure what to focus on first."
-            },
-            {
-                "id": "Outcome",
-                "label": "What outcome do you want?",
-                "type": "text",
-                "help": "Example: 'Give me 5 alternative approaches and the best next step.'",
-                "ph": "E.g., Give me 5 alternative approaches and the best next step."
-            },
-            {
-                "id": "Pushback",
-                "label": "How hard should it challenge assumptions?",
-                "type": "single",
-                "options": ["Gentle", "Balanced", "Hard pushback"],
-                "help": "Pick how direct you want it to be."
-            },
-            {
-                "id": "Constraints",
-                "label": "Constraints (optional)",
-                "type": "text",
-                "help": "Example: 'No therapy tone. No pep talk. Just practical reframes.'",
-                "ph": "E.g., No pep talk; give practical reframes.",
-                "optional": True
-            },
-        ],
-        "template": """You are a reframing assistant.
-
-Situation:
-{Situation}
-
-Desired outcome:
-{Outcome}
-
-Challenge level:
-{Pushback}
-
-Constraints:
-{Constraints}
-
-Instructions:
-- Challenge assumptions and propose alternative perspectives.
-- Focus on reframing and options, not execution.
-- If anything is unclear, ask up to 3 clarifying questions before proceeding.
-"""
-    },
-}
-
-
-def render_question(q: dict):
-    qid = q["id"]
-    qtype = q.get("type")
-    label = q.get("label", qid)
-    help_text = q.get("help", None)
-
-    if qtype == "text":
-        val = st.text_input(
-            label,
-            value="",
-            placeholder=q.get("ph", ""),
-            help=help_text
-        )
-        return qid, val
-    if qtype == "single":
-        opts = q.get("options", [])
-        val = st.selectbox(label, opts, index=0, help=help_text)
-        return qid, val
+# Operator-only panels (cache stats, metrics) are hidden unless this is set
+DEBUG = os.environ.get("PROMPT_BUILDER_DEBUG", "") not in ("", "0")
 
-    st.warning(f"Unsupported question type: {qtype}")
-    return qid, ""
+# Size budgets (characters) for a single answer and for the whole prompt
+MAX_FIELD_CHARS = int(os.environ.get("PROMPT_BUILDER_MAX_FIELD_CHARS", DEFAULT_MAX_FIELD_CHARS))
+MAX_TOTAL_CHARS = int(os.environ.get("PROMPT_BUILDER_MAX_TOTAL_CHARS", DEFAULT_MAX_TOTAL_CHARS))
 
+# Large-input mode shows only this much of the prompt on the page
+PREVIEW_CHARS = 20_000
 
-def validate_required(tool_schema: dict, answers: dict):
-    missing = []
-    for q in tool_schema["questions"]:
-        if q.get("optional"):
-            continue
-        if q.get("type") == "text" and not (answers.get(q["id"], "") or "").strip():
-            missing.append(q.get("label", q["id"]))
-    return missing
+HISTORY_PAGE_SIZE = 10
 
+# The live preview shows at most this much of the prompt
+LIVE_PREVIEW_CHARS = 20_000
 
-def assemble_prompt(tool_name: str, answers: dict, strict_mode: bool, include_visual: bool) -> str:
-    schema = TOOLS[tool_name]
-    prompt = schema["template"]
+# A search box above the tool list appears once there are more tools than this
+SEARCH_MIN_TOOLS = int(os.environ.get("PROMPT_BUILDER_SEARCH_MIN_TOOLS", "12"))
+SEARCH_LIMIT = 50
+
+
+def render_question(q: Question, key_prefix: str = "", multiline: bool = False):
+    # Question types are checked when the registry is compiled
+    key = f"{key_prefix}{q.id}"
+    if q.type == "text":
+        widget = st.text_area if multiline else st.text_input
+        val = widget(
+            q.label,
+            value="",
+            placeholder=q.ph,
+            help=q.help,
+            key=key
+        )
+        return q.id, val
+    val = st.selectbox(q.label, q.options, index=0, help=q.help, key=key)
+    return q.id, val
+
+
+# History entries are loaded a page at a time and only re-queried when the
+# tool changes or a new prompt is generated.
+@st.fragment
+def render_history(tool_name: str):
+    store = get_store()
+    if store is None:
+        return
+    with st.expander("History", expanded=False):
+        if st.session_state.get("history_tool") != tool_name:
+            st.session_state["history_tool"] = tool_name
+            st.session_state["history_rows"] = store.page(tool_name, limit=HISTORY_PAGE_SIZE)
+        rows = st.session_state["history_rows"]
+        if not rows:
+            st.caption("No saved prompts for this tool yet.")
+            return
+        for row in rows:
+            when = datetime.fromtimestamp(row["created_at"]).strftime("%Y-%m-%d %H:%M")
+            if st.button(f"{when} · {row['preview'][:60]}", key=f"history:{row['id']}"):
+                entry = store.get(row["id"])
+                if entry is not None and entry["tool"] in REGISTRY:
+                    st.session_state["last"] = LastPrompt(
+                        entry["tool"], entry["answers"], entry["strict_mode"], entry["include_visual"],
+                        history_id=entry["id"]
+                    )
+                    st.rerun()
+        if len(rows) % HISTORY_PAGE_SIZE == 0:
+            def load_more():
+                last = rows[-1]
+                rows.extend(store.page(tool_name, before=(last["created_at"], last["id"]), limit=HISTORY_PAGE_SIZE))
+
+            st.button("Load more", key="history:more", on_click=load_more)
+
+        # Called by the server outside the session, like the other downloads
+        def history_archive():
+            buf = io.BytesIO()
+            writer = ArchiveWriter(buf)
+            for entry in store.iter_entries(tool_name):
+                if entry["tool"] in REGISTRY:
+                    when = datetime.fromtimestamp(entry["created_at"]).strftime("%Y%m%d-%H%M%S")
+                    writer.add(entry["tool"], entry["answers"], entry["strict_mode"], entry["include_visual"], when)
+            writer.close()
+            return buf.getvalue()
+
+        safe_tool = tool_name.replace(" ", "_").lower()
+        st.download_button(
+            f"Download all as archive ({ARCHIVE_EXT})",
+            data=history_archive,
+            file_name=f"prompt_history_{safe_tool}{ARCHIVE_EXT}",
+            mime=ARCHIVE_MIME,
+            help="Every saved prompt for this tool in one compact file. "
+                 "Unpack with: python -m prompt_builder.archive unpack <file>",
+            on_click="ignore",
+            key="history:archive"
+        )
+
+
+def render_visual_toggle(schema, key: str = None) -> bool:
+    if not schema.visual_block:
+        return False
+    return st.toggle(
+        "Add optional visual creative step (Flow / Nano Banana Pro workflow)",
+        value=False,
+        help="Adds a short creative brief + image prompt block. This does NOT generate images automatically.",
+        key=key
+    )
 
-    # Role block (ChatGPT only)
-    if tool_name == "ChatGPT":
-        role = (answers.get("Role", "") or "").strip()
-        role_block = f"Act as: {role}\n\n" if role else ""
-        prompt = prompt.replace("{ROLE_BLOCK}", role_block)
-    else:
-        prompt = prompt.replace("{ROLE_BLOCK}", "")
-
-    # Podcast notice (NotebookLM)
-    if tool_name == "NotebookLM":
-        use_case = answers.get("UseCase", "")
-        podcast_notice = ""
-        if "Podcast planning" in use_case:
-            podcast_notice = (
-                "NOTE (Podcast planning):\n"
-                "- Podcast Mode inside this Prompt Builder is marked as COMING SOON.\n"
-                "- For now, use this prompt to create a podcast plan grounded in your sources.\n"
-                "- Ask for an episode outline, talking points, and a script draft.\n"
-                "- Clearly separate what is sourced vs. what is suggested.\n"
-            )
-        prompt = prompt.replace("{PODCAST_NOTICE}", podcast_notice)
-    else:
-        prompt = prompt.replace("{PODCAST_NOTICE}", "")
 
-    # Replace tokens
-    for k, v in answers.items():
-        prompt = prompt.replace("{" + k + "}", v if isinstance(v, str) else str(v))
+# Live preview: the questions run in a fragment without a form, so each edit
+# reruns only this block. The preview keeps its rendered pieces in session
+# state and re-renders just the placeholders that read the edited answer.
+@st.fragment
+def render_live_questions(tool_name: str, strict_mode: bool, large_mode: bool):
+    schema = REGISTRY[tool_name]
+    key_prefix = f"{tool_name}:large:" if large_mode else f"{tool_name}:"
+    answers = {}
+    for q in schema.questions:
+        qid, val = render_question(q, key_prefix=key_prefix, multiline=large_mode)
+        answers[qid] = val
+    include_visual = render_visual_toggle(schema, key=f"{tool_name}:visual")
+
+    preview = st.session_state.get("live_preview")
+    if preview is None or preview.tool_name != tool_name or not preview.is_current():
+        preview = LivePreview(tool_name)
+        st.session_state["live_preview"] = preview
+    with METRICS.time("preview", tool_name):
+        preview.update(answers)
+        chunks = preview.chunks(strict_mode, include_visual)
+        text, total = clip_chunks(chunks, LIVE_PREVIEW_CHARS)
+        tokens = TOKEN_COUNTER.chunks_tokens(schema, chunks)
+
+    st.markdown("#### Live preview")
+    st.caption(
+        f"About {tokens:,} tokens"
+        + (f" · showing the first {LIVE_PREVIEW_CHARS:,} of {total:,} characters" if total > LIVE_PREVIEW_CHARS else "")
+    )
+    st.text_area("Live preview", text, height=260, disabled=True, label_visibility="collapsed")
 
-    # Optional Gemini visual step
-    if tool_name == "Gemini" and include_visual:
-        prompt = prompt.strip() + "\n\n" + TOOLS["Gemini"]["visual_block"]
+    st.session_state["live_answers"] = answers
+    st.session_state["live_visual"] = include_visual
+    st.divider()
+    if st.button("Generate Prompt", type="primary"):
+        # Validation, history and downloads live in the full script run
+        st.session_state["live_generate"] = True
+        st.rerun()
+
+
+# Fan-out: one answer set for several tools. Questions that more than one
+# selected tool asks (same id, type and options) are shown once; the rest
+# are grouped per tool. Runs as a fragment with its own form.
+@st.fragment
+def render_fanout(strict_mode: bool, locale: str):
+    names = locale_tool_names(locale)
+    st.session_state.setdefault("fanout:tools", names)
+    selected = st.multiselect("Tools", names, format_func=base_name, key="fanout:tools")
+    if not selected:
+        st.caption("Pick at least one tool.")
+        return
+    plan = get_field_index().plan(selected)
+
+    shared_answers = {}
+    own_answers = {}
+    with st.form("fanout:questions", border=False):
+        if plan.shared:
+            st.markdown("### Shared answers")
+            st.caption("Used by several of the selected tools; hover “?” to see which.")
+            for q in plan.shared:
+                qid, val = render_question(q, key_prefix="fanout:shared:")
+                shared_answers[qid] = val
+        st.markdown("### Tool-specific answers")
+        for name in plan.tools:
+            if not plan.own[name]:
+                continue
+            with st.expander(base_name(name)):
+                own_answers[name] = dict(
+                    render_question(q, key_prefix=f"fanout:{name}:") for q in plan.own[name]
+                )
+        include_visual = False
+        if any(REGISTRY[name].visual_block for name in plan.tools):
+            include_visual = render_visual_toggle(REGISTRY[next(n for n in plan.tools if REGISTRY[n].visual_block)])
+        st.divider()
+        submitted = st.form_submit_button("Generate all prompts", type="primary")
+
+    if submitted:
+        with METRICS.time("fanout", ""):
+            st.session_state["fanout_results"] = fan_out(plan, shared_answers, own_answers, strict_mode, include_visual)
+        st.session_state["fanout_ts"] = datetime.now().strftime("%Y%m%d-%H%M%S")
+
+    results = st.session_state.get("fanout_results")
+    if not results:
+        return
+    ok = sum(1 for r in results.values() if r["prompt"] is not None)
+    st.markdown("### Your Prompts")
+    st.caption(f"{ok} of {len(results)} tools ready.")
+    ts = st.session_state.get("fanout_ts", "")
+    for tab, (name, result) in zip(st.tabs([base_name(n) for n in results]), results.items()):
+        with tab:
+            if result["prompt"] is None:
+                st.error("Please fill in: " + ", ".join(result["missing"]))
+                continue
+            st.caption(f"Paste into: {base_name(name)} · about {result['tokens']:,} tokens")
+            st.text_area("Copy from here:", result["prompt"], height=300, key=f"fanout:out:{name}")
+            st.download_button(
+                "Download Prompt (.txt)",
+                data=result["prompt"].encode("utf-8"),
+                file_name=f"prompt_{name.replace(' ', '_').lower()}_{ts}.txt",
+                mime="text/plain",
+                on_click="ignore",
+                key=f"fanout:download:{name}"
+            )
 
-    # Strict mode
-    if strict_mode:
-        prompt = prompt.strip() + "\n\n" + STRICT_RULES
 
-    return prompt.strip() + "\n"
+def search_tools() -> list:
+    query = st.session_state.get("tool_search", "")
+    if not query.strip():
+        return []
+    with METRICS.time("search"):
+        # Every language's tools are indexed; keep the session's
+        allowed = set(locale_tool_names(session_locale()))
+        return [hit for hit in get_search_index().search(query, limit=SEARCH_LIMIT) if hit.tool in allowed]
+
+
+def pick_top_hit():
+    # on_change of the search box: select the best match right away
+    hits = search_tools()
+    if hits:
+        st.session_state["tool"] = hits[0].tool
+
+
+def session_locale() -> str:
+    locales = get_locales()
+    locale = st.session_state.get("locale", DEFAULT_LOCALE)
+    if locales is None or locale not in locales.catalogs:
+        return DEFAULT_LOCALE
+    return locale
+
+
+def switch_locale():
+    # on_change of the language menu: moves this session's answers, tool
+    # choice and fan-out selection to the new language's tools. "single"
+    # answers become the option at the same index
+    old = st.session_state.get("active_locale", DEFAULT_LOCALE)
+    new = session_locale()
+    st.session_state["active_locale"] = new
+    renames = {}
+    for name in locale_tool_names(old):
+        target = localized_name(base_name(name), new)
+        renames[name] = target if target in REGISTRY else base_name(name)
+    prefixes = [(f"{name}:", name) for name in renames] + [(f"fanout:{name}:", name) for name in renames]
+    for key in [k for k in st.session_state if isinstance(k, str)]:
+        for prefix, name in prefixes:
+            if not key.startswith(prefix) or renames[name] == name:
+                continue
+            rest = key[len(prefix):]
+            value = st.session_state.pop(key)
+            qid = rest.rsplit(":", 1)[-1]
+            q_from = next((q for q in REGISTRY[name].questions if q.id == qid), None)
+            q_to = next((q for q in REGISTRY[renames[name]].questions if q.id == qid), None)
+            if q_from is not None and q_to is not None:
+                value = translate_answer(q_from, q_to, value)
+            st.session_state[prefix.replace(name, renames[name], 1) + rest] = value
+            break
+    if st.session_state.get("tool") in renames:
+        st.session_state["tool"] = renames[st.session_state["tool"]]
+    if "fanout:tools" in st.session_state:
+        st.session_state["fanout:tools"] = [renames.get(n, n) for n in st.session_state["fanout:tools"]]
+    # Shared fan-out answers: same question id in the old and new tools
+    for key in [k for k in st.session_state if isinstance(k, str) and k.startswith("fanout:shared:")]:
+        qid = key[len("fanout:shared:"):]
+        for name, target in renames.items():
+            q_from = next((q for q in REGISTRY[name].questions if q.id == qid), None)
+            q_to = next((q for q in REGISTRY[target].questions if q.id == qid), None)
+            if q_from is not None and q_to is not None and q_from.type == "single":
+                st.session_state[key] = translate_answer(q_from, q_to, st.session_state[key])
+                break
+
+
+def restore_payload():
+    # on_change of the restore uploader: runs before the widgets are created,
+    # so their session state can be filled from the payload
+    upload = st.session_state.get("restore_file")
+    if upload is None:
+        return
+    try:
+        payload = load_payload(upload.getvalue())
+    except ValueError as exc:
+        st.session_state["restore_message"] = ("error", str(exc))
+        return
+    source = payload["tool"]
+    if source not in REGISTRY:
+        st.session_state["restore_message"] = ("error", f"Unknown tool in file: {source}")
+        return
+    # A file saved in another language restores into this session's one
+    tool_name = localized_name(base_name(source), session_locale())
+    if tool_name not in REGISTRY:
+        tool_name = base_name(source)
+    schema = REGISTRY[tool_name]
+    restored = 0
+    skipped = []
+    for q in schema.questions:
+        value = payload["answers"].get(q.id)
+        if value is None:
+            continue
+        value = value if isinstance(value, str) else str(value)
+        if tool_name != source:
+            value = translate_answer(REGISTRY[source].question(q.id), q, value)
+        if q.type == "single" and value not in q.options:
+            skipped.append(q.label)
+            continue
+        # Both answer layouts (normal and large-input) get the value
+        st.session_state[f"{tool_name}:{q.id}"] = value
+        st.session_state[f"{tool_name}:large:{q.id}"] = value
+        restored += 1
+    st.session_state["tool"] = tool_name
+    st.session_state["strict_mode"] = bool(payload.get("strict_mode", True))
+    if schema.visual_block:
+        st.session_state[f"{tool_name}:visual"] = bool(payload.get("include_visual_step", False))
+    message = f"Restored {restored} answers for {base_name(tool_name)}."
+    if skipped:
+        message += " Not an option any more, left at the default: " + ", ".join(skipped)
+    st.session_state["restore_message"] = ("warning" if skipped else "success", message)
+
+
+def finish_run(tool_name: str):
+    METRICS.stop("rerun", tool_name, rerun_t0)
+    METRICS.inc("reruns", tool_name)
+    if METRICS.enabled:
+        METRICS.observe("session_state_bytes", tool_name, session_bytes(st.session_state.to_dict()))
+    export_metrics()
 
 
 # -------------------------
 # UI
 # -------------------------
+rerun_t0 = METRICS.start()
+
+# Extra tools from PROMPT_BUILDER_TOOLS_DIR; edited files are picked up
+# on a later rerun without restarting the app. Catalogs from
+# PROMPT_BUILDER_LOCALES_DIR are compiled on the first run.
+tool_registry = load_tools()
+if tool_registry is not None:
+    tool_registry.maybe_reload()
+locales = get_locales()
+locale = session_locale()
+
 st.title(APP_TITLE)
-st.subheader(APP_TAGLINE)
-st.caption(APP_SUBTEXT)
+st.subheader(locales.text(locale, APP_TAGLINE) if locales else APP_TAGLINE)
+st.caption(locales.text(locale, APP_SUBTEXT) if locales else APP_SUBTEXT)
 
 with st.expander("What this is / who it’s for", expanded=True):
     st.write(
@@ -509,95 +419,418 @@ with st.expander("What this is / who it’s for", expanded=True):
     st.write("**Beginner-friendly:** the questions and “?” tips show what to enter and why.")
 
 with st.sidebar:
+    if locales is not None and locales.catalogs:
+        languages = locales.languages()
+        st.selectbox(
+            "Language",
+            list(languages),
+            format_func=languages.get,
+            key="locale",
+            on_change=switch_locale
+        )
     st.header("Quick Start")
     st.write("1) Pick a tool/category")
     st.write("2) Answer the questions")
     st.write("3) Click **Generate Prompt**")
     st.write("4) Copy → paste into the tool you selected")
     st.divider()
+    st.session_state.setdefault("strict_mode", True)
     strict_mode = st.toggle(
         "Strict mode (recommended)",
-        value=True,
-        help="Adds instructions that reduce guessing and hallucinations."
+        help="Adds instructions that reduce guessing and hallucinations.",
+        key="strict_mode"
     )
+    large_mode = st.toggle(
+        "Large-input mode",
+        value=False,
+        help="For pasting whole documents: multi-line answer boxes, a preview instead of the full prompt "
+             "on the page, and downloads built in chunks."
+    )
+    live_mode = st.toggle(
+        "Live preview",
+        value=False,
+        help="Shows the prompt as you type. Each edit updates only the parts of the prompt it affects."
+    )
+    fanout_mode = st.toggle(
+        "All tools at once",
+        value=False,
+        help="Answer once and get a prompt for every selected tool. Questions several tools ask are shown once."
+    )
+    st.divider()
+    st.file_uploader(
+        "Restore answers from a Download Inputs (.json) file",
+        type=["json"],
+        key="restore_file",
+        on_change=restore_payload
+    )
+    restore_message = st.session_state.pop("restore_message", None)
+    if restore_message:
+        getattr(st, restore_message[0])(restore_message[1])
+    if DEBUG:
+        if tool_registry is not None:
+            with st.expander("Tool files", expanded=bool(tool_registry.errors)):
+                st.caption(tool_registry.directory)
+                for path, error in tool_registry.errors.items():
+                    st.error(f"{os.path.basename(path)}: {error}")
+        if locales is not None:
+            with st.expander("Locale catalogs", expanded=bool(locales.errors)):
+                st.caption(locales.directory)
+                for key, error in locales.errors.items():
+                    st.error(f"{os.path.basename(key)}: {error}")
+        snapshot = get_snapshot()
+        if snapshot is not None:
+            with st.expander("Snapshot", expanded=not snapshot.loaded):
+                st.caption(snapshot.path)
+                if snapshot.loaded:
+                    st.caption(f"Loaded in {snapshot.load_ms:.1f} ms")
+                else:
+                    st.warning(f"Not used ({snapshot.status}); tools were compiled at startup.")
+        with st.expander("Render cache", expanded=False):
+            st.json(RENDER_CACHE.stats())
+        with st.expander("Metrics", expanded=False):
+            if METRICS.enabled:
+                st.json(METRICS.summary())
+            else:
+                st.caption("Set PROMPT_BUILDER_METRICS=1 to collect timings.")
+
+if fanout_mode:
+    render_fanout(strict_mode, locale)
+    finish_run("")
+    st.stop()
+
+tool_names = locale_tool_names(locale)
+hits = {}
+if len(tool_names) > SEARCH_MIN_TOOLS:
+    st.text_input(
+        "Search tools",
+        key="tool_search",
+        placeholder="e.g. podcast, landing page, tone",
+        help="Matches tool names, descriptions and questions. Small typos are fine.",
+        on_change=pick_top_hit
+    )
+    if st.session_state.get("tool_search", "").strip():
+        hits = {hit.tool: hit for hit in search_tools()}
+        if hits:
+            current = st.session_state.get("tool")
+            tool_names = list(hits) + ([current] if current in tool_names and current not in hits else [])
+            st.caption(f"{len(hits)} matching tool" + ("s" if len(hits) != 1 else ""))
+        else:
+            st.caption("No tools match that search; showing all tools.")
 
-tool_name = st.selectbox("Select a tool/category", list(TOOLS.keys()))
-schema = TOOLS[tool_name]
+tool_name = st.selectbox("Select a tool/category", tool_names, format_func=base_name, key="tool")
+schema = REGISTRY[tool_name]
+hit = hits.get(tool_name)
+if hit is not None and hit.question is not None:
+    st.caption(f"Matched question: {schema.question(hit.question).label}")
 
-st.info(schema["desc"])
-st.caption(f"Who it’s for: {schema['who']}")
+with st.sidebar:
+    render_history(tool_name)
+
+st.info(schema.desc)
+st.caption(f"Who it’s for: {schema.who}")
 
 answers = {}
 st.markdown("### Answer these questions")
-for q in schema["questions"]:
-    qid, val = render_question(q)
-    answers[qid] = val
-
-include_visual = False
-if tool_name == "Gemini":
-    include_visual = st.toggle(
-        "Add optional visual creative step (Flow / Nano Banana Pro workflow)",
-        value=False,
-        help="Adds a short creative brief + image prompt block. This does NOT generate images automatically."
+if live_mode:
+    render_live_questions(tool_name, strict_mode, large_mode)
+    answers = st.session_state.get("live_answers", {})
+    include_visual = st.session_state.get("live_visual", False)
+    generate = st.session_state.pop("live_generate", False)
+else:
+    # Questions are batched in a form: typing does not rerun the script,
+    # only "Generate Prompt" does.
+    with st.form(f"questions:{tool_name}", border=False):
+        key_prefix = f"{tool_name}:large:" if large_mode else f"{tool_name}:"
+        for q in schema.questions:
+            qid, val = render_question(q, key_prefix=key_prefix, multiline=large_mode)
+            answers[qid] = val
+        include_visual = render_visual_toggle(schema, key=f"{tool_name}:visual")
+
+        st.divider()
+        generate = st.form_submit_button("Generate Prompt", type="primary")
+
+METRICS.stop("widgets", tool_name, rerun_t0)
+
+if generate:
+    with METRICS.time("validate", tool_name):
+        missing = validate_required(schema, answers)
+    too_large = [] if missing else check_size_budgets(
+        tool_name, answers, strict_mode, include_visual,
+        max_field_chars=MAX_FIELD_CHARS, max_total_chars=MAX_TOTAL_CHARS
     )
-
-st.divider()
-
-if st.button("Generate Prompt", type="primary"):
-    missing = validate_required(schema, answers)
     if missing:
+        METRICS.inc("validation_failures", tool_name)
         st.error("Please fill in: " + ", ".join(missing))
+    elif too_large:
+        METRICS.inc("validation_failures", tool_name)
+        st.error("Too large: " + "; ".join(too_large))
     else:
-        prompt = assemble_prompt(tool_name, answers, strict_mode=strict_mode, include_visual=include_visual)
-        st.session_state["last_prompt"] = prompt
-        st.session_state["last_tool"] = tool_name
-        st.session_state["last_answers"] = answers
-        st.session_state["last_visual"] = include_visual
+        history_id = None
+        if large_mode:
+            # Keep only the answers; preview and downloads stream from them
+            prompt = None
+        else:
+            # Exact duplicates are served from the history store, and the
+            # output keeps reading that entry instead of re-rendering
+            store = get_store()
+            key_hash = answers_hash(tool_name, answers, strict_mode, include_visual) if store else None
+            hit = store.lookup(key_hash) if store else None
+            if hit is not None:
+                history_id, prompt = hit
+            else:
+                with METRICS.time("assemble", tool_name):
+                    prompt = cached_assemble_prompt(tool_name, answers, strict_mode=strict_mode, include_visual=include_visual)
+            if store:
+                store.record(tool_name, answers, strict_mode, include_visual, prompt, key_hash=key_hash)
+                st.session_state.pop("history_tool", None)
+            if METRICS.enabled:
+                METRICS.observe("prompt_bytes", tool_name, len(prompt.encode("utf-8")))
+        METRICS.inc("renders", tool_name)
+        # The prompt itself is not kept; the output reads it from the history
+        # entry it duplicates, or re-derives it through the shared render cache
+        st.session_state["last"] = LastPrompt(tool_name, answers, strict_mode, include_visual,
+                                              large=large_mode, history_id=history_id)
         st.success("Prompt generated. Copy and paste it into your selected tool.")
 
-prompt_out = st.session_state.get("last_prompt", "")
-if prompt_out:
+
+def read_spool(spool) -> bytes:
+    spool.seek(0)
+    return spool.read()
+
+
+# Mail merge: one prompt per spreadsheet row. Runs in a fragment so mapping
+# columns and running the merge do not rerun the rest of the page; rows are
+# read and rendered in chunks, and the results are spooled to disk.
+@st.fragment
+def render_mail_merge(tool_name: str, strict_mode: bool):
+    schema = REGISTRY[tool_name]
+    key = f"merge:{tool_name}"
+    upload = st.file_uploader(
+        "CSV or Excel sheet (first row = column names, one row per prompt)",
+        type=["csv", "xlsx"],
+        key=f"{key}:file"
+    )
+    if upload is None:
+        st.caption("Columns named like a question id or label are matched automatically.")
+        return
+    try:
+        upload.seek(0)
+        sheet = open_sheet(upload, upload.name)
+        columns = sheet.columns
+        sheet.close()
+    except MergeError as exc:
+        st.error(str(exc))
+        return
+
+    suggested = suggest_mapping(tool_name, columns)
+    choices = ["(not in sheet)"] + columns
+    mapping = {}
+    defaults = {}
+    for q in schema.questions:
+        column = st.selectbox(
+            f"Column for: {q.label}",
+            choices,
+            index=choices.index(suggested[q.id]) if q.id in suggested else 0,
+            key=f"{key}:col:{q.id}"
+        )
+        if column != choices[0]:
+            mapping[q.id] = column
+        if q.type == "single":
+            defaults[q.id] = st.selectbox(
+                f"Default when empty: {q.label}", q.options, key=f"{key}:default:{q.id}"
+            )
+    include_visual = render_visual_toggle(schema, key=f"{key}:visual")
+    fmt = st.radio(
+        "Output",
+        list(FORMATS),
+        format_func={"zip": "ZIP of .txt files", "jsonl": "JSONL (one prompt per line)"}.get,
+        horizontal=True,
+        key=f"{key}:format"
+    )
+
+    if st.button("Run mail merge", key=f"{key}:run"):
+        upload.seek(0)
+        sheet = open_sheet(upload, upload.name)
+        spool, writer = open_archive(fmt)
+        errors = ErrorReport()
+        bar = st.progress(0.0, text="Reading rows…")
+        progress = {"rows": 0}
+        done = False
+        try:
+            with METRICS.time("merge", tool_name):
+                for progress in run_merge(tool_name, sheet, mapping, defaults, strict_mode, include_visual,
+                                          writer, errors):
+                    bar.progress(
+                        progress["fraction"],
+                        text=f"{progress['rows']:,} rows · {progress['ok']:,} prompts · {progress['failed']:,} errors"
+                    )
+            done = True
+        except MergeError as exc:
+            st.error(str(exc))
+        finally:
+            sheet.close()
+            METRICS.inc("merge_rows", tool_name, progress["rows"])
+            if not done:
+                # Failed or interrupted (e.g. a rerun): nothing will download these
+                discard_archive(spool, writer)
+                errors.discard()
+        if not done:
+            return
+        old = st.session_state.get("merge_result")
+        if old is not None:
+            old["archive"].close()
+            old["errors"].close()
+        errors.close()
+        st.session_state["merge_result"] = {
+            "tool": tool_name,
+            "format": fmt,
+            "archive": finish_archive(spool, writer),
+            "errors": errors.file,
+            "shown_errors": errors.shown,
+            **progress,
+        }
+
+    result = st.session_state.get("merge_result")
+    if result is None or result["tool"] != tool_name:
+        return
+    st.success(f"{result['ok']:,} prompts from {result['rows']:,} rows; {result['failed']:,} rows with errors.")
+    ts = datetime.now().strftime("%Y%m%d-%H%M%S")
+    safe_tool = tool_name.replace(" ", "_").lower()
+    mime, ext = FORMATS[result["format"]]
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            f"Download prompts ({ext})",
+            data=lambda: read_spool(result["archive"]),
+            file_name=f"prompts_{safe_tool}_{ts}{ext}",
+            mime=mime,
+            on_click="ignore",
+            key=f"{key}:download"
+        )
+    if result["failed"]:
+        with col2:
+            st.download_button(
+                "Download error report (.csv)",
+                data=lambda: read_spool(result["errors"]),
+                file_name=f"prompt_errors_{safe_tool}_{ts}.csv",
+                mime="text/csv",
+                on_click="ignore",
+                key=f"{key}:errors"
+            )
+        shown = result["shown_errors"]
+        st.caption(f"First {len(shown):,} rows with errors (sheet row numbers):")
+        st.dataframe(shown, hide_index=True)
+
+
+# Output and downloads rerun on their own (fragment), and the download
+# payloads are only built when a button is actually clicked.
+@st.fragment
+def render_output(tool_name: str):
+    last = st.session_state.get("last")
+    if last is None:
+        st.caption("When ready, click **Generate Prompt** to create the prompt.")
+        return
+
+    last_tool = last.tool_name
+    if last_tool not in REGISTRY:
+        st.caption(f"{last_tool} is no longer available. Generate the prompt again.")
+        return
+    last_args = last.render_args()
+    large = last.large
+    with METRICS.time("prompt", tool_name):
+        prompt_out = None if large else last.prompt(get_store())
+
     st.markdown("### Your Prompt")
-    st.caption(f"Paste into: {st.session_state.get('last_tool', tool_name)}")
-    st.text_area("Copy from here:", prompt_out, height=380)
+    with METRICS.time("tokens", tool_name):
+        tokens = estimate_tokens(*last_args)
+    budget = REGISTRY[last_tool].token_budget
+    st.caption(
+        f"Paste into: {base_name(last_tool)} · about {tokens:,} tokens"
+        + (f" of {budget:,}" if budget else "")
+    )
+    level, message = check_token_budget(last_tool, tokens)
+    if level == "over":
+        st.error(message + " Shorten the longest answers or split the work into several prompts.")
+    elif level == "near":
+        st.warning(message)
+    if large:
+        preview, total = prompt_preview(*last_args, max_chars=PREVIEW_CHARS)
+        if total > PREVIEW_CHARS:
+            st.caption(f"Showing the first {PREVIEW_CHARS:,} of {total:,} characters. Download the full prompt below.")
+        st.text_area("Preview:", preview, height=380)
+    else:
+        st.text_area("Copy from here:", prompt_out, height=380)
+        if LINT_ENABLED:
+            with METRICS.time("lint", tool_name):
+                issues = lint_prompt(REGISTRY[last_tool], prompt_out, last_args[1])
+            if issues:
+                errors = any(issue["severity"] == "error" for issue in issues)
+                with st.expander(f"Prompt checks: {lint_summary(issues)}", expanded=errors):
+                    for issue in issues:
+                        (st.error if issue["severity"] == "error" else st.warning)(issue["message"])
 
     ts = datetime.now().strftime("%Y%m%d-%H%M%S")
-    safe_tool = st.session_state.get("last_tool", tool_name).replace(" ", "_").lower()
+    safe_tool = last_tool.replace(" ", "_").lower()
+
+    # The server calls these after the script run, outside any session, so
+    # they may only use values captured here (not st.session_state).
+    def prompt_file_bytes():
+        if large:
+            return prompt_bytes(*last_args)
+        return prompt_out.encode("utf-8")
+
+    def inputs_bytes():
+        with METRICS.time("payload", tool_name):
+            return _inputs_bytes()
+
+    def _inputs_bytes():
+        payload = {
+            "tool": last_tool,
+            "strict_mode": last.strict,
+            "include_visual_step": last.visual if REGISTRY[last_tool].visual_block else False,
+            "answers": last_args[1],
+            "generated_at": ts,
+            "app": "prompt_builder_v1_1_help_export.py (guided questions restored)"
+        }
+        return inputs_json_bytes(payload)
 
     col1, col2 = st.columns(2)
     with col1:
         st.download_button(
             "Download Prompt (.txt)",
-            data=prompt_out.encode("utf-8"),
+            data=prompt_file_bytes,
             file_name=f"prompt_{safe_tool}_{ts}.txt",
-            mime="text/plain"
+            mime="text/plain",
+            on_click="ignore"
         )
     with col2:
-        payload = {
-            "tool": st.session_state.get("last_tool", tool_name),
-            "strict_mode": bool(strict_mode),
-            "include_visual_step": bool(st.session_state.get("last_visual", False)) if tool_name == "Gemini" else False,
-            "answers": st.session_state.get("last_answers", answers),
-            "generated_at": ts,
-            "app": "prompt_builder_v1_1_help_export.py (guided questions restored)"
-        }
         st.download_button(
             "Download Inputs (.json)",
-            data=json.dumps(payload, indent=2).encode("utf-8"),
+            data=inputs_bytes,
             file_name=f"prompt_inputs_{safe_tool}_{ts}.json",
-            mime="application/json"
+            mime="application/json",
+            on_click="ignore"
         )
 
     with st.expander("Example (what good answers look like)"):
-        if tool_name == "NotebookLM":
+        # Translated tools ("NotebookLM [de]") show their English tool's example
+        example_tool = base_name(tool_name)
+        if example_tool == "NotebookLM":
             st.write("- Use case: Create a plan/blueprint from my sources")
             st.write("- Sources: PDF(s)")
             st.write("- Goal: Summarize my notes and produce a step-by-step launch checklist.")
             st.write("- Guidance: One stage at a time (type 'next')")
-        elif tool_name == "Gemini":
+        elif example_tool == "Gemini":
             st.write("- Task: Create a 2-week LinkedIn content calendar for Prompt Builder.")
             st.write("- Success: Day-by-day topics + short outlines + CTA ideas.")
         else:
             st.write("Tip: Write short, specific goals. If you're unsure, describe what success looks like.")
-else:
-    st.caption("When ready, click **Generate Prompt** to create the prompt.")
+
+
+with METRICS.time("output", tool_name):
+    render_output(tool_name)
+
+with st.expander("Bulk: one prompt per spreadsheet row (mail merge)"):
+    render_mail_merge(tool_name, strict_mode)
+
+finish_run(tool_name)
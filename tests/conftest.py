@@ -0,0 +1,13 @@
+# ------------------------------------------------------------
+# pytest setup
+# - Puts the repository root on sys.path so the tests import prompt_builder
+#   (and the page module) without installing anything
+# - Keeps the tests off any shared prompt history store
+# ------------------------------------------------------------
+
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+os.environ["PROMPT_BUILDER_HISTORY_DB"] = ""
@@ -0,0 +1,108 @@
+# ------------------------------------------------------------
+# Deduplicated prompt archive (prompt_builder.archive)
+# - Round trip: every archived payload reads back with its answers as given
+#   (null, empty, absent, options) and a prompt equal to assemble_prompt
+# - Definitions are written once; appending reuses them
+# - Version 1 archives (null = not given) still read
+# ------------------------------------------------------------
+
+import gzip
+import io
+import json
+
+import pytest
+
+from prompt_builder.archive import HEADER, ArchiveError, ArchiveWriter, iter_archive
+from prompt_builder.core import assemble_prompt
+
+JOBS = [
+    ("ChatGPT", {"Goal": "Plan a trip", "Audience": "Family", "Tone": "Friendly", "Format": "Bullets",
+                 "Constraints": None, "Role": None}, True, False),
+    ("ChatGPT", {"Goal": "Plan a trip", "Tone": "Not an option", "Role": "", "Constraints": "None"}, False, False),
+    ("Gemini", {"Task": "Summarize", "Goal": "Short notes", "Structure": "Bullets", "Constraints": "no jargon"},
+     True, True),
+    ("Google Antigravity", {"Situation": "Ünïcödé\nmultiline", "Outcome": "done", "Constraints": None}, True, False),
+    ("NotebookLM", {}, False, True),
+]
+
+
+def write(target, jobs=JOBS, **kwargs):
+    writer = ArchiveWriter(target, **kwargs)
+    for i, (name, answers, strict, visual) in enumerate(jobs):
+        writer.add(name, answers, strict, visual, f"ts{i}")
+    writer.close()
+    return writer
+
+
+def assert_round_trip(payloads, jobs):
+    assert len(payloads) == len(jobs)
+    for payload, (name, answers, strict, visual) in zip(payloads, jobs):
+        assert payload["tool"] == name
+        assert payload["answers"] == answers
+        assert payload["strict_mode"] == strict
+        assert payload["prompt"] == assemble_prompt(name, answers, strict, visual)
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_round_trip_matches_assemble_prompt(compress):
+    buf = io.BytesIO()
+    write(buf, compress=compress)
+    buf.seek(0)
+    assert_round_trip(list(iter_archive(buf)), JOBS)
+
+
+def test_null_answer_is_kept_apart_from_empty_and_absent():
+    buf = io.BytesIO()
+    jobs = [("ChatGPT", {"Goal": "Plan a trip", "Constraints": value}, True, False) for value in (None, "")]
+    jobs.append(("ChatGPT", {"Goal": "Plan a trip"}, True, False))
+    write(buf, jobs)
+    buf.seek(0)
+    payloads = list(iter_archive(buf))
+    assert_round_trip(payloads, jobs)
+    assert "must-includes:\nNone" in payloads[0]["prompt"]
+    assert len({p["prompt"] for p in payloads}) == 3
+
+
+def test_definitions_are_written_once_and_reused_on_append(tmp_path):
+    path = str(tmp_path / "prompts.jsonl.gz")
+    write(path, JOBS[:2])
+    write(path, JOBS[:2], append=True)
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f]
+    assert sum(1 for line in lines if isinstance(line, dict) and "archive" in line) == 1
+    assert sum(1 for line in lines if isinstance(line, dict) and "tool" in line) == 1
+    assert_round_trip(list(iter_archive(path)), JOBS[:2] * 2)
+
+
+def test_version_1_reads_null_as_not_given(tmp_path):
+    current = str(tmp_path / "v2.jsonl")
+    write(current, [("ChatGPT", {"Goal": "Plan a trip"}, False, False)], compress=False)
+    with open(current, encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f]
+    lines[0] = dict(HEADER, version=1)
+    lines[-1] = [None if v is False else v for v in lines[-1]]
+    old = tmp_path / "v1.jsonl"
+    old.write_text("".join(json.dumps(line) + "\n" for line in lines), encoding="utf-8")
+
+    [payload] = iter_archive(str(old))
+    assert payload["answers"] == {"Goal": "Plan a trip"}
+    assert payload["prompt"] == assemble_prompt("ChatGPT", {"Goal": "Plan a trip"}, False, False)
+
+    # Appending starts a version 2 ref table after it
+    write(str(old), [JOBS[0]], append=True)
+    assert_round_trip(list(iter_archive(str(old)))[1:], [JOBS[0]])
+
+
+def test_tampered_definition_is_rejected():
+    buf = io.BytesIO()
+    write(buf, [JOBS[0]], compress=False)
+    lines = buf.getvalue().decode("utf-8").splitlines()
+    assert json.loads(lines[1])["tool"] == "ChatGPT"
+    lines[1] = lines[1].replace("Task:", "Job:")
+    with pytest.raises(ArchiveError, match="does not match its hash"):
+        list(iter_archive(io.BytesIO("\n".join(lines).encode("utf-8"))))
+
+
+def test_unknown_tool_is_rejected():
+    with pytest.raises(ArchiveError, match="unknown tool"):
+        ArchiveWriter(io.BytesIO()).add("No such tool", {}, True, False)
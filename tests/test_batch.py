@@ -0,0 +1,80 @@
+# ------------------------------------------------------------
+# Batch rendering (prompt_builder.batch)
+# - Valid records render like assemble_prompt; invalid ones (bad JSON, wrong
+#   types, unknown tool, missing fields) go to the error stream with their
+#   line number, without stopping the run
+# - The command line writes prompts and errors to separate JSONL files
+# ------------------------------------------------------------
+
+import json
+
+import pytest
+
+from prompt_builder.batch import main, render_record, run_batch
+from prompt_builder.core import assemble_prompt
+
+ANSWERS = {"Goal": "Plan a trip", "Audience": "Family", "Tone": "Friendly", "Format": "Bullets",
+           "Constraints": "", "Role": "Travel agent"}
+GOOD = {"tool": "ChatGPT", "strict_mode": False, "include_visual_step": False, "answers": ANSWERS}
+
+
+@pytest.mark.parametrize("record, error", [
+    ([], "record is not a JSON object"),
+    ({"tool": 3, "answers": {}}, "tool must be a string"),
+    ({"tool": "No such tool", "answers": {}}, "unknown tool: 'No such tool'"),
+    ({"tool": "ChatGPT", "answers": []}, "answers must be a JSON object"),
+    ({"tool": "ChatGPT", "answers": dict(ANSWERS, Goal=5)}, "answers must be strings"),
+    (dict(GOOD, strict_mode="false"), "flags must be true or false"),
+    (dict(GOOD, include_visual_step=1), "flags must be true or false"),
+    ({"tool": "ChatGPT", "answers": {"Goal": "  "}}, "missing required fields"),
+])
+def test_invalid_record(record, error):
+    result = render_record(record)
+    assert result["ok"] is False
+    assert result["error"] == error
+
+
+def test_invalid_record_names_the_fields():
+    assert render_record(dict(GOOD, strict_mode="false", include_visual_step=None))["fields"] == [
+        "strict_mode", "include_visual_step"]
+    assert render_record(dict(GOOD, answers=dict(ANSWERS, Tone=None, Goal=[])))["fields"] == ["Goal"]
+
+
+def test_valid_record_renders_like_assemble_prompt():
+    result = render_record(GOOD)
+    assert result["ok"] is True
+    assert result["prompt"] == assemble_prompt("ChatGPT", ANSWERS, False, False)
+    assert result["tokens"] > 0
+    # Absent flags take their defaults (strict on)
+    assert render_record({"tool": "ChatGPT", "answers": ANSWERS})["prompt"] == assemble_prompt(
+        "ChatGPT", ANSWERS, True, False)
+
+
+def test_run_batch_keeps_order_and_line_numbers():
+    lines = [json.dumps(GOOD), "\n", "{not json", json.dumps(dict(GOOD, tool="Nope")), json.dumps(GOOD)]
+    results = list(run_batch(lines, workers=1, chunk_size=2))
+    assert [(r["line"], r["ok"]) for r in results] == [(1, True), (3, False), (4, False), (5, True)]
+    assert results[1]["error"].startswith("invalid JSON")
+
+
+def test_main_writes_prompts_and_errors_apart(tmp_path, capsys):
+    source = tmp_path / "inputs.jsonl"
+    source.write_text("\n".join([json.dumps(GOOD), "[]", json.dumps(dict(GOOD, strict_mode="no"))]) + "\n",
+                      encoding="utf-8")
+    out = tmp_path / "prompts.jsonl"
+    errors = tmp_path / "errors.jsonl"
+    assert main([str(source), "-o", str(out), "--errors", str(errors), "-j", "1"]) == 0
+
+    [prompt] = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert prompt["line"] == 1 and prompt["prompt"] == assemble_prompt("ChatGPT", ANSWERS, False, False)
+    failed = [json.loads(line) for line in errors.read_text(encoding="utf-8").splitlines()]
+    assert [(e["line"], e["error"]) for e in failed] == [
+        (2, "record is not a JSON object"), (3, "flags must be true or false")]
+    assert "rendered 1 prompts" in capsys.readouterr().err
+
+
+def test_main_fails_when_nothing_renders(tmp_path):
+    source = tmp_path / "inputs.jsonl"
+    source.write_text("[]\n", encoding="utf-8")
+    assert main([str(source), "-o", str(tmp_path / "out.jsonl"), "--errors", str(tmp_path / "err.jsonl"),
+                 "-j", "1"]) == 1
@@ -0,0 +1,83 @@
+# ------------------------------------------------------------
+# Shared render cache (prompt_builder.cache)
+# - LRU eviction by entry count, the byte ceiling and TTL expiry, with
+#   their counters
+# - Keys: answers the template does not read still hit; values that render
+#   differently (None vs "None") never share an entry
+# ------------------------------------------------------------
+
+import pytest
+
+from prompt_builder import cache as cache_module
+from prompt_builder.cache import RenderCache, cache_key, cached_assemble_prompt, entry_size
+from prompt_builder.core import assemble_prompt
+
+TOOL = "ChatGPT"
+ANSWERS = {"Goal": "Plan a trip", "Audience": "Family", "Tone": "Friendly", "Format": "Bullets",
+           "Constraints": "", "Role": "Travel agent"}
+
+
+def key(i: int) -> tuple:
+    return cache_key(TOOL, dict(ANSWERS, Goal=f"goal {i}"), True, False)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_lru_evicts_least_recently_used():
+    cache = RenderCache(max_entries=2)
+    cache.put(key(1), "one")
+    cache.put(key(2), "two")
+    assert cache.get(key(1)) == "one"  # 2 is now the oldest
+    cache.put(key(3), "three")
+    assert cache.get(key(2)) is None
+    assert cache.get(key(1)) == "one"
+    assert cache.get(key(3)) == "three"
+    stats = cache.stats()
+    assert (stats["entries"], stats["evictions"], stats["hits"], stats["misses"]) == (2, 1, 3, 1)
+
+
+def test_byte_ceiling_evicts_and_skips_oversized_entries():
+    size = entry_size(key(1), "x" * 1000)
+    cache = RenderCache(max_bytes=size * 2 + size // 2)
+    for i in range(3):
+        cache.put(key(i), "x" * 1000)
+    assert cache.stats()["entries"] == 2
+    assert cache.bytes <= cache.max_bytes
+    assert cache.get(key(0)) is None
+
+    cache.put(key(9), "x" * (size * 3))
+    assert cache.get(key(9)) is None
+    assert cache.stats()["entries"] == 2
+
+
+def test_ttl_expires_entries(clock):
+    cache = RenderCache(ttl=60)
+    cache.put(key(1), "one")
+    clock[0] += 59
+    assert cache.get(key(1)) == "one"
+    clock[0] += 2
+    assert cache.get(key(1)) is None
+    stats = cache.stats()
+    assert (stats["entries"], stats["bytes"], stats["expirations"]) == (0, 0, 1)
+
+
+def test_unread_answers_and_visual_toggle_share_a_key():
+    # ChatGPT has no visual block, and "Extra" is not a question
+    assert cache_key(TOOL, ANSWERS, True, False) == cache_key(TOOL, dict(ANSWERS, Extra="x"), True, True)
+    assert cache_key(TOOL, ANSWERS, True, False) != cache_key(TOOL, ANSWERS, False, False)
+
+
+@pytest.mark.parametrize("value, lookalike", [(None, "None"), (0, "0")])
+def test_non_string_values_do_not_share_a_key(value, lookalike):
+    cache = RenderCache()
+    first = dict(ANSWERS, Role=value)
+    second = dict(ANSWERS, Role=lookalike)
+    assert cache_key(TOOL, first, True, False) != cache_key(TOOL, second, True, False)
+    for answers in (first, second, first):
+        assert cached_assemble_prompt(TOOL, answers, True, False, cache=cache) == assemble_prompt(TOOL, answers, True, False)
+    assert "Act as: " + lookalike in cached_assemble_prompt(TOOL, second, True, False, cache=cache)
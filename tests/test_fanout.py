@@ -0,0 +1,81 @@
+# ------------------------------------------------------------
+# Multi-tool fan-out (prompt_builder.fanout)
+# - plan() shares a question id only between tools that ask it with the
+#   same type and options; everything else stays with its tool
+# - fan_out() renders each tool exactly like assemble_prompt does for the
+#   merged shared + own answers, and lists missing required fields per tool
+# ------------------------------------------------------------
+
+import pytest
+
+from prompt_builder.core import BUILTIN_REGISTRY, REGISTRY, assemble_prompt, publish_tools, validate_required
+from prompt_builder.fanout import fan_out, get_field_index
+from prompt_builder.tokens import TokenCounter
+
+TOOLS = ["Google AI Studio", "Gemini", "ChatGPT"]
+SHARED = {"Goal": "A weekly meal plan", "Constraints": "Vegetarian"}
+OWN = {
+    "ChatGPT": {"Audience": "Students", "Tone": "Friendly", "Format": "Bullets", "Role": "Nutritionist"},
+    "Gemini": {"Task": "Draft the plan", "Structure": "", "Detail": ""},
+    "Google AI Studio": {"AppType": "", "Users": "Me"},
+}
+
+
+@pytest.fixture
+def plan():
+    return get_field_index().plan(TOOLS)
+
+
+def test_plan_shares_compatible_questions(plan):
+    assert plan.tools == ("ChatGPT", "Gemini", "Google AI Studio")   # registry order
+    assert plan.shared_tools == {"Goal": ("ChatGPT", "Gemini"), "Constraints": ("ChatGPT", "Gemini")}
+    goal = plan.shared[0]
+    assert (goal.id, goal.label, goal.type) == ("Goal", "Goal", "text")
+    assert goal.help.splitlines()[0].startswith("ChatGPT: ")
+    # AI Studio's Constraints is a choice, not text: it stays its own question
+    assert "Constraints" in [q.id for q in plan.own["Google AI Studio"]]
+    assert "Goal" not in [q.id for q in plan.own["Gemini"]]
+
+
+def test_single_tool_shares_nothing():
+    plan = get_field_index().plan(["ChatGPT"])
+    assert plan.shared == ()
+    assert plan.own["ChatGPT"] == REGISTRY["ChatGPT"].questions
+
+
+@pytest.mark.parametrize("strict, visual", [(False, False), (True, True)])
+def test_prompts_match_assemble_prompt(plan, strict, visual):
+    counter = TokenCounter()
+    results = fan_out(plan, SHARED, OWN, strict, visual, counter=counter)
+    assert list(results) == list(plan.tools)
+    for name in ("ChatGPT", "Gemini"):
+        merged = dict(OWN[name], **SHARED)
+        assert results[name] == {
+            "prompt": assemble_prompt(name, merged, strict, visual),
+            "missing": [],
+            "tokens": counter.prompt_tokens(name, merged, strict, visual),
+        }
+
+
+def test_missing_fields_are_per_tool(plan):
+    results = fan_out(plan, {"Goal": "  ", "Constraints": ""}, OWN, True, False)
+    for name in plan.tools:
+        merged = dict(OWN[name], Goal="  ", Constraints="") if name in plan.shared_tools["Goal"] else OWN[name]
+        assert results[name]["missing"] == validate_required(REGISTRY[name], merged), name
+    assert results["Gemini"] == {"prompt": None, "missing": ["What does success look like?"], "tokens": 0}
+    assert results["Google AI Studio"]["prompt"] is None
+
+
+def test_index_follows_the_registry():
+    index = get_field_index()
+    assert get_field_index() is index
+    try:
+        publish_tools(REGISTRY, {n: t for n, t in BUILTIN_REGISTRY.items() if n != "Gemini"})
+        plan = get_field_index().plan(TOOLS)
+        assert plan.tools == ("ChatGPT", "Google AI Studio")
+        assert plan.shared == ()
+    finally:
+        # Republished from empty so the built-in order comes back as well
+        publish_tools(REGISTRY, {})
+        publish_tools(REGISTRY, dict(BUILTIN_REGISTRY))
+    assert get_field_index().plan(TOOLS).tools == ("ChatGPT", "Gemini", "Google AI Studio")
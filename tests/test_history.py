@@ -0,0 +1,91 @@
+# ------------------------------------------------------------
+# Prompt history (prompt_builder.history)
+# - An exact duplicate (same tool, answers and flags) is one entry whose
+#   use count goes up
+# - Keyset pagination walks every entry once, newest first
+# - Entries past the age or size limit are pruned
+# - History is off unless a database path is configured
+# ------------------------------------------------------------
+
+import time
+
+import pytest
+
+from prompt_builder import history as history_module
+from prompt_builder.history import HistoryStore, answers_hash, get_store
+
+ANSWERS = {"Goal": "Plan a trip", "Audience": "Family", "Tone": "Friendly"}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return HistoryStore(str(tmp_path / "history.sqlite3"), max_entries=0, max_days=0)
+
+
+def record(store, goal: str, tool: str = "ChatGPT", strict: bool = True):
+    store.record(tool, dict(ANSWERS, Goal=goal), strict, False, f"prompt for {goal}")
+
+
+def test_duplicates_are_counted_not_stored_twice(store):
+    record(store, "a")
+    record(store, "a")
+    record(store, "a", strict=False)
+    # Keys the template does not read do not make a new entry
+    store.record("ChatGPT", dict(ANSWERS, Goal="a", Unused="x"), True, False, "prompt for a")
+    store.flush()
+    assert store.count() == 2
+    uses = sorted(row["uses"] for row in store.page())
+    assert uses == [1, 3]
+
+    entry_id, prompt = store.lookup(answers_hash("ChatGPT", dict(ANSWERS, Goal="a"), True, False))
+    entry = store.get(entry_id)
+    assert prompt == entry["prompt"] == "prompt for a"
+    assert entry["answers"] == dict(ANSWERS, Goal="a") and entry["strict_mode"] is True
+
+
+def test_keyset_pagination_walks_every_entry_once(store):
+    for i in range(25):
+        record(store, f"goal {i:02d}", tool="ChatGPT" if i % 5 else "Gemini")
+    store.flush()
+
+    seen = []
+    before = None
+    while True:
+        rows = store.page(before=before, limit=7)
+        if not rows:
+            break
+        seen.extend(rows)
+        before = (rows[-1]["created_at"], rows[-1]["id"])
+    assert len(seen) == 25 and len({row["id"] for row in seen}) == 25
+    keys = [(row["created_at"], row["id"]) for row in seen]
+    assert keys == sorted(keys, reverse=True)
+    assert seen[0]["preview"] == "prompt for goal 24"
+
+    gemini = store.page(tool_name="Gemini", limit=100)
+    assert [row["tool"] for row in gemini] == ["Gemini"] * 5
+    assert [e["id"] for e in store.iter_entries("Gemini")] == [row["id"] for row in reversed(gemini)]
+
+
+def test_prune_by_size_and_age(tmp_path, monkeypatch):
+    store = HistoryStore(str(tmp_path / "history.sqlite3"), max_entries=10, max_days=1)
+    for i in range(15):
+        record(store, f"goal {i:02d}")
+    store.flush()
+    assert store.prune() == 5
+    assert [row["preview"] for row in store.page(limit=1)] == ["prompt for goal 14"]
+    assert store.count() == 10
+
+    now = time.time()
+    monkeypatch.setattr(history_module.time, "time", lambda: now + 2 * 86400)
+    record(store, "fresh")
+    store.flush()
+    assert store.prune() == 10
+    assert [row["preview"] for row in store.page()] == ["prompt for fresh"]
+
+
+def test_history_is_opt_in(monkeypatch, tmp_path):
+    monkeypatch.delenv("PROMPT_BUILDER_HISTORY_DB", raising=False)
+    assert get_store() is None
+    path = str(tmp_path / "on.sqlite3")
+    monkeypatch.setenv("PROMPT_BUILDER_HISTORY_DB", path)
+    assert get_store().path == path
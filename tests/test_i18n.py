@@ -0,0 +1,115 @@
+# ------------------------------------------------------------
+# Localization (prompt_builder.i18n)
+# - A catalog compiles translated copies of the tools ("ChatGPT [de]") that
+#   render in that language; untranslated strings stay English
+# - A translation that changes a template's placeholders is rejected and
+#   reported; that tool stays English in that locale
+# ------------------------------------------------------------
+
+import json
+
+import pytest
+
+from prompt_builder.core import BUILTIN_REGISTRY, TOOLS, tool_chunks
+from prompt_builder.i18n import (
+    Catalog,
+    CatalogError,
+    Locales,
+    base_name,
+    load_catalog,
+    locale_tool_names,
+    localize_tool,
+    translate_answer,
+)
+from prompt_builder.schema import SchemaError
+
+CHATGPT = TOOLS["ChatGPT"]
+STRINGS = {
+    CHATGPT["template"]: CHATGPT["template"].replace("Task:", "Aufgabe:").replace("Audience:", "Zielgruppe:"),
+    "Tone": "Ton",
+    "Friendly": "Freundlich",
+    "Professional": "Professionell",
+}
+
+
+def catalog(strings: dict, locale: str = "de") -> Catalog:
+    return Catalog(locale, "Deutsch", strings.get)
+
+
+def write_catalog(directory, locale: str, strings: dict):
+    path = directory / f"{locale}.json"
+    path.write_text(json.dumps({"language": locale.upper(), "strings": strings}, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+def test_localized_tool_renders_translated():
+    tool = localize_tool(BUILTIN_REGISTRY["ChatGPT"], catalog(STRINGS))
+    assert tool.name == "ChatGPT [de]" and base_name(tool.name) == "ChatGPT"
+    assert tool.question("Tone").label == "Ton"
+    assert "Freundlich" in tool.question("Tone").options
+    assert tool.question("Goal").label == BUILTIN_REGISTRY["ChatGPT"].question("Goal").label
+    answers = {"Goal": "Reise planen", "Audience": "Familie", "Tone": "Freundlich"}
+    prompt = "".join(tool_chunks(tool, answers, False, False))
+    assert prompt.startswith("Aufgabe:\nReise planen\n\nZielgruppe:\nFamilie\n\nTone:\nFreundlich")
+
+
+def test_nothing_translated_gives_no_copy():
+    assert localize_tool(BUILTIN_REGISTRY["ChatGPT"], catalog({})) is None
+
+
+@pytest.mark.parametrize("template", [
+    CHATGPT["template"].replace("{Goal}", "{Ziel}"),     # renamed placeholder
+    CHATGPT["template"].replace("{Audience}", ""),      # lost placeholder
+])
+def test_placeholder_mismatch_is_rejected(template):
+    with pytest.raises(SchemaError, match="placeholder"):
+        localize_tool(BUILTIN_REGISTRY["ChatGPT"], catalog({CHATGPT["template"]: template}))
+
+
+def test_locales_publish_and_report(tmp_path):
+    write_catalog(tmp_path, "de", STRINGS)
+    write_catalog(tmp_path, "xx", {CHATGPT["template"]: CHATGPT["template"].replace("{Goal}", "(Goal)"),
+                                   "Tone": "Tono"})
+    (tmp_path / "yy.json").write_text("{broken", encoding="utf-8")
+    target = dict(BUILTIN_REGISTRY)
+    locales = Locales(str(tmp_path), target=target)
+    locales.load()
+
+    assert list(locales.languages()) == ["en", "de", "xx"]
+    assert "ChatGPT [de]" in target
+    assert "ChatGPT [xx]" not in target
+    assert "placeholders differ" in locales.errors["xx: ChatGPT"]
+    assert str(tmp_path / "yy.json") in locales.errors
+    names = locale_tool_names("de", target)
+    assert names[0] == "ChatGPT [de]" and "Gemini" in names
+    assert locale_tool_names("xx", target)[0] == "ChatGPT"
+
+    # A fixed catalog replaces the error with a translated tool
+    write_catalog(tmp_path, "xx", {"Tone": "Tono"})
+    locales.load()
+    assert "xx: ChatGPT" not in locales.errors
+    assert target["ChatGPT [xx]"].question("Tone").label == "Tono"
+
+    # A removed catalog takes its tools with it
+    (tmp_path / "de.json").unlink()
+    locales.load()
+    assert "ChatGPT [de]" not in target
+
+
+def test_translate_answer_maps_options_by_position():
+    english = BUILTIN_REGISTRY["ChatGPT"]
+    german = localize_tool(english, catalog(STRINGS))
+    assert translate_answer(english.question("Tone"), german.question("Tone"), "Friendly") == "Freundlich"
+    assert translate_answer(german.question("Tone"), english.question("Tone"), "Freundlich") == "Friendly"
+    assert translate_answer(english.question("Goal"), german.question("Goal"), "free text") == "free text"
+
+
+def test_catalog_files(tmp_path):
+    catalog_ = load_catalog(str(write_catalog(tmp_path, "de", {"Tone": "Ton", "Format": ""})))
+    assert (catalog_.locale, catalog_.language) == ("de", "DE")
+    assert catalog_.translate("Tone") == "Ton"
+    assert catalog_.translate("Format") == "Format"  # empty translation falls back
+    with pytest.raises(CatalogError):
+        load_catalog(str(write_catalog(tmp_path, "en", {})))
+    with pytest.raises(CatalogError):
+        load_catalog(str(write_catalog(tmp_path, "fr", {"Tone": 3})))
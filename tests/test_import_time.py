@@ -0,0 +1,50 @@
+# ------------------------------------------------------------
+# Import-time budget for prompt_builder.core
+# - Imports the core module in fresh interpreters (interpreter startup
+#   excluded): no UI module may be pulled in, and the median import must
+#   stay under BUDGET_MS
+# - benchmarks/check_import_time.py is the command-line version
+# ------------------------------------------------------------
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BUDGET_MS = 50.0
+RUNS = 5
+UI_MODULES = ("streamlit", "pandas", "numpy", "altair")
+
+PROBE = """
+import sys, time, json
+t0 = time.perf_counter()
+import prompt_builder.core
+elapsed = (time.perf_counter() - t0) * 1000
+print(json.dumps({"ms": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+@pytest.fixture(scope="module")
+def samples():
+    runs = []
+    for _ in range(RUNS):
+        out = subprocess.run([sys.executable, "-c", PROBE], cwd=REPO_ROOT, check=True,
+                             capture_output=True, text=True).stdout
+        runs.append(json.loads(out.strip().splitlines()[-1]))
+    return runs
+
+
+def test_no_ui_modules_imported(samples):
+    loaded = {m.split(".")[0] for m in samples[0]["modules"]}
+    assert "prompt_builder" in loaded
+    assert not loaded & set(UI_MODULES)
+
+
+def test_import_time_under_budget(samples):
+    median_ms = statistics.median(s["ms"] for s in samples)
+    assert median_ms <= BUDGET_MS, f"import prompt_builder.core took {median_ms:.1f} ms (budget {BUDGET_MS:.0f} ms)"
@@ -0,0 +1,58 @@
+# ------------------------------------------------------------
+# Peak memory of large-input mode (prompt_builder.streaming)
+# - One 10 MB answer; each large-input step must peak (tracemalloc) at no
+#   more than MAX_RATIO x the input size
+# - benchmarks/check_large_input_memory.py prints the same numbers for
+#   other sizes and limits
+# ------------------------------------------------------------
+
+import tracemalloc
+
+import pytest
+
+from prompt_builder.core import REGISTRY, validate_required
+from prompt_builder.streaming import (
+    check_size_budgets,
+    inputs_json_bytes,
+    prompt_bytes,
+    prompt_preview,
+)
+
+TOOL = "Google Antigravity"
+BIG_FIELD = "Situation"
+SIZE = 10 * 1024 * 1024
+MAX_RATIO = 3.0
+
+STEPS = {
+    "validate_required": lambda tool, answers, payload: validate_required(tool, answers),
+    "check_size_budgets": lambda tool, answers, payload: check_size_budgets(
+        TOOL, answers, True, False, max_field_chars=SIZE * 2, max_total_chars=SIZE * 2),
+    "prompt_preview": lambda tool, answers, payload: prompt_preview(TOOL, answers, True, False, max_chars=20_000),
+    "prompt_bytes": lambda tool, answers, payload: prompt_bytes(TOOL, answers, True, False),
+    "inputs_json_bytes": lambda tool, answers, payload: inputs_json_bytes(payload),
+}
+
+
+@pytest.fixture(scope="module")
+def large_answers():
+    tool = REGISTRY[TOOL]
+    answers = {q.id: (q.options[0] if q.type == "single" else "short answer") for q in tool.questions}
+    answers[BIG_FIELD] = ("Pasted document line. " * (SIZE // 22 + 1))[:SIZE]
+    payload = {"tool": TOOL, "strict_mode": True, "include_visual_step": False, "answers": answers}
+    return tool, answers, payload
+
+
+@pytest.mark.parametrize("step", list(STEPS))
+def test_peak_memory_within_ratio(step, large_answers):
+    fn = STEPS[step]
+    fn(*large_answers)  # warm caches and lazy imports outside the measurement
+    tracemalloc.start()
+    try:
+        base, _ = tracemalloc.get_traced_memory()
+        result = fn(*large_answers)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert result is not None
+    ratio = (peak - base) / SIZE
+    assert ratio <= MAX_RATIO, f"{step} peaked at {ratio:.2f}x the input"
@@ -0,0 +1,81 @@
+# ------------------------------------------------------------
+# Prompt linter (prompt_builder.lint)
+# - placeholder: a field whose answer is missing or None is an error, placed
+#   at the "{Field}" left in the prompt; braces typed in an answer are not
+# - empty_section / duplicate_section / long_section on the tool's own
+#   labels only, with issues in text order
+# ------------------------------------------------------------
+
+import pytest
+
+from prompt_builder.core import REGISTRY, STRICT_RULES, assemble_prompt
+from prompt_builder.lint import lint_prompt, lint_summary
+
+TOOL = "ChatGPT"
+ANSWERS = {"Goal": "Plan a trip", "Audience": "Family", "Tone": "Friendly", "Format": "Bullets",
+           "Constraints": "Trains only", "Role": "Travel agent"}
+
+
+def lint(answers, strict=True, visual=False, **kwargs):
+    text = assemble_prompt(TOOL, answers, strict, visual)
+    return text, lint_prompt(REGISTRY[TOOL], text, answers, **kwargs)
+
+
+def kinds(issues):
+    return [(issue["kind"], issue["severity"]) for issue in issues]
+
+
+@pytest.mark.parametrize("strict, visual", [(False, False), (True, True)])
+def test_complete_prompt_is_clean(strict, visual):
+    assert lint(ANSWERS, strict, visual)[1] == []
+
+
+@pytest.mark.parametrize("answers", [
+    {k: v for k, v in ANSWERS.items() if k != "Audience"},
+    dict(ANSWERS, Audience=None),
+], ids=["missing", "none"])
+def test_unset_answer_is_a_placeholder(answers):
+    _, issues = lint(answers)
+    assert kinds(issues) == [("placeholder", "error")]
+    assert issues[0]["message"] == "unresolved placeholder {Audience}"
+    assert lint_summary(issues) == "1 error"
+
+
+def test_placeholder_points_at_the_token_left_in_the_prompt():
+    text, issues = lint({k: v for k, v in ANSWERS.items() if k != "Audience"})
+    assert issues[0]["pos"] == text.index("{Audience}")
+
+
+def test_braces_in_answers_are_not_placeholders():
+    assert lint(dict(ANSWERS, Goal="Fill in {Goal} and {Tone}", Constraints="Notes:\nnone"))[1] == []
+
+
+def test_empty_answer_is_an_empty_section():
+    text, issues = lint(dict(ANSWERS, Audience="   ", Constraints=""))
+    assert kinds(issues) == [("empty_section", "warning")] * 2
+    assert [issue["message"] for issue in issues] == ['"Audience:" is empty', '"Constraints / must-includes:" is empty']
+    assert issues[0]["pos"] == text.index("Audience:")
+    assert lint_summary(issues) == "2 warnings"
+
+
+def test_issues_come_in_text_order():
+    _, issues = lint({k: v for k, v in dict(ANSWERS, Goal="").items() if k != "Format"})
+    assert [issue["kind"] for issue in issues] == ["empty_section", "placeholder"]
+    assert issues[0]["pos"] < issues[1]["pos"]
+    assert lint_summary(issues) == "1 error, 1 warning"
+
+
+def test_pasted_strict_rules_are_a_duplicate():
+    answers = dict(ANSWERS, Constraints="Trains only\n\n" + STRICT_RULES.strip())
+    _, issues = lint(answers, strict=True)
+    assert kinds(issues) == [("duplicate_section", "warning")]
+    assert issues[0]["message"] == '"Strict rules (recommended):" appears more than once'
+    # Without strict mode the template has the label once: the pasted copy is fine
+    assert lint(answers, strict=False)[1] == []
+
+
+def test_long_section():
+    _, issues = lint(dict(ANSWERS, Constraints="x" * 300), strict=False, section_chars=250)
+    assert kinds(issues) == [("long_section", "warning")]
+    assert issues[0]["message"].startswith('"Constraints / must-includes:" is 30')
+    assert lint(dict(ANSWERS, Constraints="x" * 200), strict=False, section_chars=250)[1] == []
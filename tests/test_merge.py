@@ -0,0 +1,111 @@
+# ------------------------------------------------------------
+# Spreadsheet mail merge (prompt_builder.merge)
+# - Every valid row's prompt equals assemble_prompt for that row's answers,
+#   in row order; bad rows land in the error report with their row number
+# - A merge that fails part way releases its spooled outputs
+# ------------------------------------------------------------
+
+import csv
+import io
+import json
+import zipfile
+
+import pytest
+
+from prompt_builder.core import assemble_prompt
+from prompt_builder.merge import (
+    ErrorReport,
+    MergeError,
+    discard_archive,
+    finish_archive,
+    open_archive,
+    open_sheet,
+    run_merge,
+    suggest_mapping,
+)
+
+TOOL = "ChatGPT"
+COLUMNS = ["goal", "Who is this for?", "Tone", "Constraints", "Role"]
+ROWS = [
+    ["Plan a trip", "Family", "Friendly", "", "Travel agent"],
+    ["Write a poem", "Kids", "", "rhymes", ""],        # empty Tone -> default
+    ["", "Nobody", "Formal", "", ""],                  # missing Goal
+    ["Sell a car", "Buyers", "Pirate", "", ""],        # not an option
+    ["Ünïcödé goal", "Everyone", "Professional", "a, \"quoted\" one", ""],
+]
+
+
+def sheet_bytes(rows=ROWS) -> bytes:
+    text = io.StringIO()
+    writer = csv.writer(text)
+    writer.writerow(COLUMNS)
+    writer.writerows(rows)
+    return text.getvalue().encode("utf-8")
+
+
+def expected_answers(row: list, defaults: dict) -> dict:
+    return {"Goal": row[0], "Audience": row[1], "Tone": row[2] or defaults["Tone"],
+            "Format": defaults["Format"], "Constraints": row[3], "Role": row[4]}
+
+
+def merge(data: bytes, fmt: str, defaults: dict):
+    sheet = open_sheet(io.BytesIO(data), "rows.csv")
+    mapping = suggest_mapping(TOOL, sheet.columns)
+    spool, writer = open_archive(fmt)
+    errors = ErrorReport()
+    progress = list(run_merge(TOOL, sheet, mapping, defaults, True, False, writer, errors, chunk_rows=2))
+    sheet.close()
+    errors.close()
+    return finish_archive(spool, writer), errors, progress
+
+
+DEFAULTS = {"Tone": "Neutral", "Format": "Bullets"}
+
+
+def test_suggest_mapping_matches_ids_and_labels():
+    assert suggest_mapping(TOOL, COLUMNS) == {
+        "Goal": "goal", "Audience": "Who is this for?", "Tone": "Tone", "Constraints": "Constraints", "Role": "Role"}
+
+
+def test_jsonl_rows_match_assemble_prompt():
+    archive, errors, progress = merge(sheet_bytes(), "jsonl", DEFAULTS)
+    results = [json.loads(line) for line in archive.read().decode("utf-8").splitlines()]
+    valid = [(n, row) for n, row in enumerate(ROWS, start=2) if n not in (4, 5)]
+    assert [r["line"] for r in results] == [n for n, _ in valid]
+    for result, (_, row) in zip(results, valid):
+        assert result["prompt"] == assemble_prompt(TOOL, expected_answers(row, DEFAULTS), True, False)
+
+    report = list(csv.reader(io.TextIOWrapper(errors.file, encoding="utf-8")))
+    assert [line[0] for line in report] == ["row", "4", "5"]
+    assert "not one of the options" in report[2][1]
+    assert [e["row"] for e in errors.shown] == [4, 5]
+    assert [(p["rows"], p["ok"], p["failed"]) for p in progress] == [(2, 2, 0), (4, 2, 2), (5, 3, 2)]
+    assert progress[-1]["fraction"] == 1.0
+
+
+def test_zip_rows_match_assemble_prompt():
+    archive, _, _ = merge(sheet_bytes(), "zip", DEFAULTS)
+    with zipfile.ZipFile(archive) as zf:
+        prompts = [zf.read(name).decode("utf-8") for name in zf.namelist()]
+    valid = [row for n, row in enumerate(ROWS, start=2) if n not in (4, 5)]
+    assert prompts == [assemble_prompt(TOOL, expected_answers(row, DEFAULTS), True, False) for row in valid]
+
+
+@pytest.mark.parametrize("fmt", ["zip", "jsonl"])
+def test_failed_merge_releases_its_spools(fmt):
+    # The bad byte comes after the first read buffer, so the merge fails part way
+    data = sheet_bytes(ROWS[:1] * 400) + b"\xff\xfe bad,row\n"
+    sheet = open_sheet(io.BytesIO(data), "rows.csv")
+    spool, writer = open_archive(fmt)
+    errors = ErrorReport()
+    with pytest.raises(MergeError, match="row"):
+        for _ in run_merge(TOOL, sheet, suggest_mapping(TOOL, sheet.columns), DEFAULTS, True, False, writer, errors):
+            pass
+    discard_archive(spool, writer)
+    errors.discard()
+    assert spool.closed and errors.file.closed
+
+
+def test_empty_sheet_is_rejected():
+    with pytest.raises(MergeError, match="empty"):
+        open_sheet(io.BytesIO(b""), "rows.csv")
@@ -0,0 +1,88 @@
+# ------------------------------------------------------------
+# Incremental live preview (prompt_builder.preview)
+# - After any sequence of edits, LivePreview renders the same chunks as
+#   prompt_chunks for the current answers, strict/visual toggles included
+# - update() re-renders only the placeholders that read a changed answer
+# - A preview notices when its tool is reloaded or removed
+# ------------------------------------------------------------
+
+import pytest
+
+from prompt_builder.core import BUILTIN_REGISTRY, REGISTRY, prompt_chunks, publish_tools
+from prompt_builder.preview import LivePreview
+
+# (tool, successive answer sets as typed in the page)
+EDITS = [
+    ("ChatGPT", [
+        {},
+        {"Goal": "Plan"},
+        {"Goal": "Plan a trip"},
+        {"Goal": "Plan a trip", "Role": "Travel agent"},
+        {"Goal": "Plan a trip", "Role": "", "Tone": "Friendly", "Constraints": "  padded  "},
+        {"Goal": "", "Audience": "Family\nand friends", "Format": "Bullets"},
+        {},
+    ]),
+    ("NotebookLM", [
+        {"UseCase": "Research a topic from my sources"},
+        {"UseCase": "Podcast planning (coming soon)", "Goal": "Episode outline"},
+        {"UseCase": "Podcast planning (coming soon)", "Goal": "Episode outline", "StepMode": "All at once"},
+        {"UseCase": "Learn step-by-step from my sources", "Goal": "Episode outline"},
+    ]),
+    ("Gemini", [
+        {"Task": "Summarize"},
+        {"Task": "Summarize", "Goal": "Für Anfänger"},
+        {"Task": "", "Goal": "Für Anfänger", "Detail": "Short"},
+    ]),
+]
+
+
+def restore_builtins():
+    # Republished from empty so the built-in order comes back as well
+    publish_tools(REGISTRY, {})
+    publish_tools(REGISTRY, dict(BUILTIN_REGISTRY))
+
+
+@pytest.fixture
+def published():
+    yield
+    restore_builtins()
+
+
+@pytest.mark.parametrize("tool_name, steps", EDITS, ids=[e[0] for e in EDITS])
+def test_chunks_follow_edits(tool_name, steps):
+    preview = LivePreview(tool_name)
+    for answers in steps:
+        preview.update(answers)
+        for strict in (False, True):
+            for visual in (False, True):
+                expected = prompt_chunks(tool_name, answers, strict, visual)
+                assert preview.chunks(strict, visual) == expected, (answers, strict, visual)
+                assert preview.text(strict, visual) == "".join(expected)
+
+
+def test_only_dependents_are_patched():
+    preview = LivePreview("ChatGPT")
+    tool = REGISTRY["ChatGPT"]
+    assert preview.update({"Goal": "Plan"}) == 1
+    assert preview.update({"Goal": "Plan"}) == 0
+    assert preview.last_patched == 0
+    assert preview.update({"Goal": "Plan", "Role": "Agent"}) == len(tool.dependents["Role"])
+    # Removing an answer re-renders its placeholder too
+    assert preview.update({"Role": "Agent"}) == 1
+    assert preview.last_patched == 1
+
+
+def test_one_answer_can_feed_several_placeholders():
+    preview = LivePreview("NotebookLM")
+    deps = REGISTRY["NotebookLM"].dependents["UseCase"]
+    assert len(deps) > 1
+    assert preview.update({"UseCase": "Podcast planning (coming soon)"}) == len(deps)
+
+
+def test_is_current_follows_the_registry(published):
+    preview = LivePreview("Gemini")
+    assert preview.is_current()
+    publish_tools(REGISTRY, {n: t for n, t in BUILTIN_REGISTRY.items() if n != "Gemini"})
+    assert not preview.is_current()
+    restore_builtins()
+    assert preview.is_current()
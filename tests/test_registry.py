@@ -0,0 +1,138 @@
+# ------------------------------------------------------------
+# Hot-reloaded tool files (prompt_builder.registry)
+# - Added, edited and removed files show up on reload; built-ins stay
+# - A bad file is reported and its last good version stays live
+# - The compiled-tool cache keeps live files plus a bounded spare set
+# - registry_view() can be iterated while another thread reloads
+# ------------------------------------------------------------
+
+import itertools
+import json
+import os
+import threading
+
+import pytest
+
+from prompt_builder import registry as registry_module
+from prompt_builder.core import BUILTIN_REGISTRY, REGISTRY, TOOLS, publish_tools, registry_view
+from prompt_builder.registry import ToolRegistry
+from prompt_builder.session import _shared_ids
+
+_mtimes = itertools.count(1_000_000_000_000_000_000, 1_000_000_000)
+
+
+def write_tool(directory, file_name: str, name: str, **changes):
+    path = os.path.join(str(directory), file_name)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"name": name, **TOOLS["ChatGPT"], **changes}, f)
+    # A distinct mtime per write, so a same-size edit is not missed
+    mtime = next(_mtimes)
+    os.utime(path, ns=(mtime, mtime))
+    return path
+
+
+@pytest.fixture
+def target():
+    return dict(BUILTIN_REGISTRY)
+
+
+def test_reload_follows_files(tmp_path, target):
+    path = write_tool(tmp_path, "extra.json", "Extra")
+    tools = ToolRegistry(str(tmp_path), target=target)
+    assert tools.reload()["changed"] == [path]
+    assert set(target) == set(BUILTIN_REGISTRY) | {"Extra"}
+    assert tools.reload() == {"changed": [], "removed": [], "errors": {}}
+
+    write_tool(tmp_path, "extra.json", "Extra", template="Edited: {Goal}")
+    assert tools.reload()["changed"] == [path]
+    assert target["Extra"].template == "Edited: {Goal}"
+
+    os.remove(path)
+    assert tools.reload()["removed"] == [path]
+    assert set(target) == set(BUILTIN_REGISTRY)
+
+
+def test_tool_file_overrides_builtin(tmp_path, target):
+    write_tool(tmp_path, "chatgpt.json", "ChatGPT", template="Mine: {Goal}")
+    ToolRegistry(str(tmp_path), target=target).reload()
+    assert target["ChatGPT"].template == "Mine: {Goal}"
+
+
+def test_bad_file_keeps_last_good_version(tmp_path, target):
+    path = write_tool(tmp_path, "extra.json", "Extra")
+    tools = ToolRegistry(str(tmp_path), target=target)
+    tools.reload()
+    good = target["Extra"]
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("{not json")
+    errors = tools.reload()["errors"]
+    assert list(errors) == [path] and errors[path].startswith("JSONDecodeError")
+    assert target["Extra"] is good
+
+    write_tool(tmp_path, "extra.json", "Extra", template="Fixed: {Goal}")
+    assert tools.reload()["errors"] == {}
+    assert target["Extra"].template == "Fixed: {Goal}"
+
+
+def test_schema_error_and_duplicate_names_are_reported(tmp_path, target):
+    bad = write_tool(tmp_path, "a_bad.json", "Bad", questions="not a list")
+    write_tool(tmp_path, "b_first.json", "Twin")
+    second = write_tool(tmp_path, "c_second.json", "Twin", template="Second: {Goal}")
+    tools = ToolRegistry(str(tmp_path), target=target)
+    errors = tools.reload()["errors"]
+    assert set(errors) == {bad, second}
+    assert "duplicate tool name 'Twin'" in errors[second]
+    assert "Bad" not in target
+    assert target["Twin"].template == TOOLS["ChatGPT"]["template"]
+
+
+def test_compiled_cache_is_bounded(tmp_path, target, monkeypatch):
+    monkeypatch.setattr(registry_module, "MAX_SPARE_COMPILED", 3)
+    tools = ToolRegistry(str(tmp_path), target=target)
+    for i in range(10):
+        write_tool(tmp_path, "extra.json", "Extra", template=f"Version {i}: {{Goal}}")
+        tools.reload()
+    assert len(tools._compiled) == 1 + 3
+    assert target["Extra"].template == "Version 9: {Goal}"
+
+
+@pytest.fixture
+def published():
+    yield
+    publish_tools(REGISTRY, dict(BUILTIN_REGISTRY))
+
+
+def test_views_can_be_iterated_during_reloads(tmp_path, published):
+    tools = ToolRegistry(str(tmp_path))
+    stop = threading.Event()
+    failures = []
+
+    def read():
+        while not stop.is_set():
+            try:
+                for name, tool in registry_view().items():
+                    assert tool.questions
+                _shared_ids()
+            except Exception as exc:
+                failures.append(exc)
+                return
+
+    readers = [threading.Thread(target=read) for _ in range(2)]
+    for t in readers:
+        t.start()
+    try:
+        for i in range(60):
+            if i % 2:
+                for path in tmp_path.iterdir():
+                    os.remove(path)
+            else:
+                for n in range(20):
+                    write_tool(tmp_path, f"tool_{n}.json", f"Tool {i}-{n}")
+            tools.reload()
+    finally:
+        stop.set()
+        for t in readers:
+            t.join()
+    assert failures == []
+    assert registry_view() == REGISTRY
@@ -0,0 +1,95 @@
+# ------------------------------------------------------------
+# Golden replay (prompt_builder.replay)
+# - Exit status: 0 when every payload matches its golden, 1 when any
+#   changed, has no golden yet or is invalid; --update writes the goldens
+# - Payloads are only rendered: no token counts or lint on this path
+# ------------------------------------------------------------
+
+import json
+
+import pytest
+
+from prompt_builder import batch
+from prompt_builder.core import assemble_prompt
+from prompt_builder.replay import load_payload, main, run_replay
+
+ANSWERS = {"Goal": "Plan a trip", "Audience": "Family", "Tone": "Friendly", "Format": "Bullets",
+           "Constraints": "", "Role": "Travel agent"}
+
+
+def write_payload(directory, rel: str, **payload):
+    path = directory / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"tool": "ChatGPT", "answers": ANSWERS, **payload}), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    payloads = tmp_path / "payloads"
+    write_payload(payloads, "a.json")
+    write_payload(payloads, "team/b.json", strict_mode=False)
+    return payloads, tmp_path / "golden"
+
+
+def run(payloads, golden, *extra) -> int:
+    return main([str(payloads), "--golden", str(golden), "-j", "1", *extra])
+
+
+def test_exit_codes(dirs, capsys):
+    payloads, golden = dirs
+    assert run(payloads, golden) == 1                 # no goldens yet
+    assert run(payloads, golden, "--update") == 0
+    assert (golden / "team" / "b.txt").read_text(encoding="utf-8") == assemble_prompt("ChatGPT", ANSWERS, False, False)
+    assert run(payloads, golden) == 0
+
+    (golden / "a.txt").write_text("an older template\n", encoding="utf-8")
+    assert run(payloads, golden) == 1
+    assert run(payloads, golden, "--update") == 0
+    assert run(payloads, golden) == 0
+
+    write_payload(payloads, "c.json", tool="No such tool")
+    assert run(payloads, golden) == 1
+    assert run(payloads, golden, "--update") == 1     # errors fail even when updating
+    capsys.readouterr()
+
+
+def test_results_and_report(dirs, tmp_path):
+    payloads, golden = dirs
+    run(payloads, golden, "--update")
+    (golden / "a.txt").write_text("old\n", encoding="utf-8")
+    write_payload(payloads, "d.json", answers={"Goal": ""})
+    (payloads / "e.json").write_text("{broken", encoding="utf-8")
+
+    results = {r["file"]: r for r in run_replay(str(payloads), str(golden), workers=1)}
+    assert {rel: r["status"] for rel, r in results.items()} == {
+        "a.json": "changed", "d.json": "error", "e.json": "error", "team/b.json": "same"}
+    assert results["a.json"]["diff"].startswith("--- golden/a.json")
+    assert results["d.json"]["missing"]
+
+    report = tmp_path / "report.jsonl"
+    assert run(payloads, golden, "--report", str(report)) == 1
+    assert sorted(json.loads(line)["file"] for line in report.read_text(encoding="utf-8").splitlines()) == [
+        "a.json", "d.json", "e.json"]
+
+
+def test_replay_only_renders(dirs, monkeypatch):
+    payloads, golden = dirs
+
+    def fail(*args, **kwargs):
+        raise AssertionError("replay counted tokens or linted")
+
+    monkeypatch.setattr(batch, "estimate_tokens", fail)
+    monkeypatch.setattr(batch, "lint_prompt", fail)
+    assert [r["status"] for r in run_replay(str(payloads), str(golden), workers=1)] == ["new", "new"]
+
+
+@pytest.mark.parametrize("data, message", [
+    (b"{broken", "not a JSON file"),
+    (b"[]", "expected a"),
+    (b'{"answers": {}}', 'no "tool"'),
+    (b'{"tool": "ChatGPT", "answers": {}, "strict_mode": "false"}', "strict_mode must be true or false"),
+])
+def test_load_payload_rejects(data, message):
+    with pytest.raises(ValueError, match=message):
+        load_payload(data)
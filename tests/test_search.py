@@ -0,0 +1,82 @@
+# ------------------------------------------------------------
+# Tool search (prompt_builder.search)
+# - Exact, prefix and one-typo matches, ranked exact first
+# - Unicode terms: translated tools are found by their own text
+# - refresh() follows tools being added, replaced and removed
+# ------------------------------------------------------------
+
+import pickle
+
+import pytest
+
+from prompt_builder.core import REGISTRY
+from prompt_builder.schema import compile_tool, tool_schema
+from prompt_builder.search import ToolIndex, tokenize
+
+
+@pytest.fixture
+def registry():
+    registry = dict(REGISTRY)
+    schema = tool_schema(REGISTRY["ChatGPT"])
+    schema["desc"] = "Für Texte, Planung und Übersetzung. 日本語の文章にも"
+    schema["questions"][0]["label"] = "Was soll ChatGPT erstellen? Größe egal"
+    registry["ChatGPT [de]"] = compile_tool("ChatGPT [de]", schema)
+    return registry
+
+
+@pytest.fixture
+def index(registry):
+    index = ToolIndex()
+    index.refresh(registry)
+    return index
+
+
+def names(hits) -> list:
+    return [hit.tool for hit in hits]
+
+
+def test_tokenize_keeps_unicode_words():
+    assert tokenize("Größe Übersetzung 日本語 café, a Ｆｕｌｌ") == ["grösse", "übersetzung", "日本語", "café", "full"]
+
+
+@pytest.mark.parametrize("query, tool", [
+    ("antigravity", "Google Antigravity"),
+    ("antigravty", "Google Antigravity"),   # one letter missing
+    ("antigarvity", "Google Antigravity"),  # two letters swapped
+    ("stud", "Google AI Studio"),           # still typing
+    ("übersetzung", "ChatGPT [de]"),
+    ("ubersetzung", "ChatGPT [de]"),        # one typo away
+    ("ÜBERSETZUNG", "ChatGPT [de]"),
+    ("größe", "ChatGPT [de]"),
+    ("日本語の文章にも", "ChatGPT [de]"),
+])
+def test_query_finds_tool(index, query, tool):
+    assert names(index.search(query))[:1] == [tool]
+
+
+def test_exact_match_ranks_above_typo(index):
+    # "gems" is an exact term for Gemini Gems and one edit from "gemini"
+    ranked = names(index.search("gems"))
+    assert ranked[0] == "Gemini Gems"
+
+
+def test_hit_names_the_matching_question(index):
+    [hit] = [h for h in index.search("chatgpt tone") if h.tool == "ChatGPT"]
+    assert hit.question == "Tone"
+
+
+def test_refresh_follows_registry_changes(index, registry):
+    del registry["ChatGPT [de]"]
+    assert index.refresh(registry) == 1
+    assert index.search("übersetzung") == []
+    schema = tool_schema(REGISTRY["Gemini"])
+    schema["desc"] = "Zeppelin planning"
+    registry["Gemini"] = compile_tool("Gemini", schema)
+    assert index.refresh(registry) == 1
+    assert names(index.search("zeppelin")) == ["Gemini"]
+    assert index.refresh(registry) == 0
+
+
+def test_index_pickles(index):
+    copy = pickle.loads(pickle.dumps(index))
+    assert names(copy.search("antigravty")) == names(index.search("antigravty"))
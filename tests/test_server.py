@@ -0,0 +1,127 @@
+# ------------------------------------------------------------
+# HTTP service (prompt_builder.server)
+# - A real server on an ephemeral port, driven with raw HTTP/1.1 requests
+# - Status codes: 200, 400, 404, 405, 408, 411, 413, 422, 500 and 503,
+#   each with a JSON body
+# ------------------------------------------------------------
+
+import asyncio
+import json
+
+import pytest
+
+from prompt_builder import server as server_module
+from prompt_builder.core import assemble_prompt
+from prompt_builder.server import PromptServer
+
+ANSWERS = {"Goal": "Plan a trip", "Audience": "Family", "Tone": "Friendly", "Format": "Bullets",
+           "Constraints": "", "Role": "Travel agent"}
+GOOD = {"tool": "ChatGPT", "strict_mode": False, "answers": ANSWERS}
+
+
+def post(path: str, body, **headers) -> bytes:
+    data = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+    extra = "".join(f"{k}: {v}\r\n" for k, v in headers.items())
+    return (f"POST {path} HTTP/1.1\r\nContent-Length: {len(data)}\r\nConnection: close\r\n{extra}\r\n"
+            .encode("latin-1") + data)
+
+
+def get(path: str) -> bytes:
+    return f"GET {path} HTTP/1.1\r\nConnection: close\r\n\r\n".encode("latin-1")
+
+
+async def exchange(port: int, *parts: bytes, pause: float = 0.0) -> tuple:
+    # Sends the parts (pausing between them) and reads until the server closes
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        for i, part in enumerate(parts):
+            if i and pause:
+                await asyncio.sleep(pause)
+            writer.write(part)
+            await writer.drain()
+        data = await asyncio.wait_for(reader.read(), 5)
+    finally:
+        writer.close()
+    head, _, body = data.partition(b"\r\n\r\n")
+    return int(head.split(b" ", 2)[1]), json.loads(body)
+
+
+def call(*parts: bytes, pause: float = 0.0, **options) -> tuple:
+    async def run():
+        server = PromptServer(**options)
+        srv = await server.start(port=0)
+        try:
+            return await exchange(srv.sockets[0].getsockname()[1], *parts, pause=pause)
+        finally:
+            srv.close()
+            await srv.wait_closed()
+    return asyncio.run(run())
+
+
+def test_list_and_describe_tools():
+    status, body = call(get("/tools"))
+    assert status == 200 and "ChatGPT" in [t["name"] for t in body["tools"]]
+    status, body = call(get("/tools/Google%20AI%20Studio"))
+    assert status == 200 and body["name"] == "Google AI Studio" and body["questions"]
+
+
+def test_render_one_and_batch():
+    status, body = call(post("/render", GOOD))
+    assert status == 200
+    assert body["prompt"] == assemble_prompt("ChatGPT", ANSWERS, False, False)
+    status, body = call(post("/render/batch", {"records": [GOOD, {"tool": "Nope", "answers": {}}]}))
+    assert status == 200
+    assert [r["ok"] for r in body["results"]] == [True, False]
+
+
+@pytest.mark.parametrize("request_bytes, status, error", [
+    (post("/render", b"{broken"), 400, "invalid JSON"),
+    (b"POST /render HTTP/1.1\r\nContent-Length: -5\r\n\r\n", 400, "invalid Content-Length"),
+    (b"POST /render HTTP/1.1\r\nContent-Length: many\r\n\r\n", 400, "invalid Content-Length"),
+    (b"NONSENSE\r\n\r\n", 400, "malformed request line"),
+    (get("/tools/Nope"), 404, "unknown tool"),
+    (get("/elsewhere"), 404, "no route"),
+    (get("/render"), 405, "use POST"),
+    (b"POST /render HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n", 411, "chunked"),
+    (post("/render", {"tool": "ChatGPT", "answers": {"Goal": ""}}), 422, "missing required fields"),
+    (post("/render", dict(GOOD, strict_mode="false")), 422, "flags must be true or false"),
+    (post("/render/batch", {"records": "all"}), 400, "expected"),
+])
+def test_error_statuses(request_bytes, status, error):
+    got, body = call(request_bytes)
+    assert got == status
+    assert error in body["error"]
+
+
+def test_body_and_batch_limits():
+    status, body = call(post("/render", GOOD), max_body=10)
+    assert status == 413 and "body too large" in body["error"]
+    status, body = call(post("/render/batch", {"records": [GOOD] * 3}), max_batch=2)
+    assert status == 413 and "batch too large" in body["error"]
+
+
+def test_busy_server_answers_503():
+    status, body = call(get("/tools"), max_connections=0)
+    assert status == 503
+
+
+def test_slow_request_times_out_with_408():
+    request = post("/render", GOOD)
+    head, _, body = request.partition(b"\r\n\r\n")
+    status, result = call(head + b"\r\n\r\n" + body[:5], body[5:], pause=0.5, read_timeout=0.1)
+    assert status == 408 and "body" in result["error"]
+    status, result = call(head[:10], head[10:] + b"\r\n\r\n" + body, pause=0.5, read_timeout=0.1)
+    assert status == 408 and "headers" in result["error"]
+    # Within the timeout a paused request is fine
+    status, _ = call(request[:20], request[20:], pause=0.05, read_timeout=2)
+    assert status == 200
+
+
+def test_unexpected_error_answers_500(monkeypatch, capsys):
+    def broken(payload):
+        raise ZeroDivisionError("boom")
+
+    monkeypatch.setattr(server_module, "render_one", broken)
+    status, body = call(post("/render", GOOD))
+    assert status == 500 and body["error"] == "internal error: ZeroDivisionError"
+    assert "boom" in capsys.readouterr().err
@@ -0,0 +1,42 @@
+# ------------------------------------------------------------
+# Compact per-session state (prompt_builder.session)
+# - LastPrompt keeps answers, not the prompt: it re-renders through the
+#   render cache, or reads the history entry it points at
+# - A duplicate found in the history store hands back its entry id, so the
+#   session can point at it
+# ------------------------------------------------------------
+
+from prompt_builder.core import REGISTRY, assemble_prompt
+from prompt_builder.history import HistoryStore, answers_hash
+from prompt_builder.session import LastPrompt
+
+TOOL = "ChatGPT"
+ANSWERS = {"Goal": "Plan a trip", "Audience": "Family", "Tone": "Friendly", "Format": "Bullets",
+           "Constraints": "", "Role": "Travel agent"}
+
+
+def test_prompt_is_rendered_from_answers():
+    last = LastPrompt(TOOL, ANSWERS, True, False)
+    assert last.answers() == ANSWERS
+    assert last.prompt() == assemble_prompt(TOOL, ANSWERS, True, False)
+
+
+def test_single_answers_share_the_registry_option():
+    last = LastPrompt(TOOL, dict(ANSWERS, Tone="".join(["Fri", "endly"])), True, False)
+    tone = next(q for q in REGISTRY[TOOL].questions if q.id == "Tone")
+    assert any(option is last.answers()["Tone"] for option in tone.options)
+
+
+def test_duplicate_lookup_returns_the_entry_to_read(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.sqlite3"))
+    key = answers_hash(TOOL, ANSWERS, True, False)
+    assert store.lookup(key) is None
+    store.record(TOOL, ANSWERS, True, False, "stored prompt", key_hash=key)
+    store.flush()
+
+    history_id, prompt = store.lookup(key)
+    assert prompt == "stored prompt"
+    last = LastPrompt(TOOL, ANSWERS, True, False, history_id=history_id)
+    assert last.prompt(store) == "stored prompt"
+    # Without the store (or once the entry is pruned) it renders again
+    assert last.prompt() == assemble_prompt(TOOL, ANSWERS, True, False)
@@ -0,0 +1,119 @@
+# ------------------------------------------------------------
+# Cold-start snapshot (prompt_builder.snapshot)
+# - A built snapshot loads back with the compiled tool files and a search
+#   index that is handed out once
+# - Missing, foreign and truncated files report why they were not used
+# - A snapshot whose source_key() differs (other format version or sources)
+#   is stale and never unpickled
+# - A tool loader seeded from the snapshot reuses its compiled tools
+# ------------------------------------------------------------
+
+import json
+import os
+
+import pytest
+
+from prompt_builder import registry as registry_module
+from prompt_builder import search as search_module
+from prompt_builder import snapshot as snapshot_module
+from prompt_builder.core import BUILTIN_REGISTRY, REGISTRY, TOOLS, publish_tools
+from prompt_builder.registry import ToolRegistry
+from prompt_builder.search import ToolIndex
+from prompt_builder.snapshot import FORMAT, get_snapshot, load_snapshot, source_key, write_snapshot
+
+
+@pytest.fixture
+def tools_dir(tmp_path, monkeypatch):
+    # One extra tool file, loaded through fresh process-wide loaders
+    directory = tmp_path / "tools"
+    directory.mkdir()
+    with open(directory / "trip.json", "w", encoding="utf-8") as f:
+        json.dump({"name": "Trip planner", **TOOLS["ChatGPT"]}, f)
+    monkeypatch.setenv("PROMPT_BUILDER_TOOLS_DIR", str(directory))
+    monkeypatch.delenv("PROMPT_BUILDER_SNAPSHOT", raising=False)
+    monkeypatch.setattr(registry_module, "_registry", None)
+    monkeypatch.setattr(search_module, "_index", None)
+    monkeypatch.setattr(snapshot_module, "_snapshot", None)
+    yield str(directory)
+    # Republished from empty so the built-in order comes back as well
+    publish_tools(REGISTRY, {})
+    publish_tools(REGISTRY, dict(BUILTIN_REGISTRY))
+
+
+@pytest.fixture
+def built(tmp_path, tools_dir):
+    path = str(tmp_path / "app.snapshot")
+    return path, write_snapshot(path)
+
+
+def test_build_and_load(built):
+    path, header = built
+    assert header["format"] == FORMAT
+    assert header["key"] == source_key()
+    assert (header["tools"], header["files"]) == (len(BUILTIN_REGISTRY) + 1, 1)
+    assert not [name for name in os.listdir(os.path.dirname(path)) if name.endswith(".tmp")]
+
+    snapshot = load_snapshot(path)
+    assert snapshot.status == "loaded" and snapshot.loaded
+    assert [tool.name for tool in snapshot.files.values()] == ["Trip planner"]
+
+
+def test_index_is_handed_out_once(built):
+    snapshot = load_snapshot(built[0])
+    index = snapshot.load_index()
+    assert isinstance(index, ToolIndex)
+    assert index.search("trip planner")[0].tool == "Trip planner"
+    # The index refers to the snapshot's own tools, not copies
+    assert index._tools["Trip planner"][0] is next(iter(snapshot.files.values()))
+    assert snapshot.load_index() is None
+
+
+def test_loader_reuses_snapshot_tools(built, tools_dir):
+    snapshot = load_snapshot(built[0])
+    target = dict(BUILTIN_REGISTRY)
+    ToolRegistry(tools_dir, target=target, compiled=snapshot.files).reload()
+    assert target["Trip planner"] is next(iter(snapshot.files.values()))
+
+
+def test_get_snapshot_reads_once(built, monkeypatch):
+    assert get_snapshot() is None
+    monkeypatch.setenv("PROMPT_BUILDER_SNAPSHOT", built[0])
+    snapshot = get_snapshot()
+    assert snapshot.loaded
+    assert get_snapshot() is snapshot
+
+
+@pytest.mark.parametrize("change", [
+    lambda monkeypatch: monkeypatch.setattr(snapshot_module, "VERSION", snapshot_module.VERSION + 1),
+    lambda monkeypatch: monkeypatch.setattr(snapshot_module, "SOURCE_FILES", snapshot_module.SOURCE_FILES[:-1]),
+], ids=["version", "sources"])
+def test_other_sources_are_stale(built, monkeypatch, change):
+    key = source_key()
+    change(monkeypatch)
+    assert source_key() != key
+    snapshot = load_snapshot(built[0])
+    assert snapshot.status == "stale" and not snapshot.loaded
+    assert snapshot.files == {} and snapshot.load_index() is None
+
+
+def test_missing_file(tmp_path):
+    assert load_snapshot(str(tmp_path / "nope.snapshot")).status == "missing"
+
+
+@pytest.mark.parametrize("content", [b"", b"not json\n", b'{"format": "something else"}\n'], ids=["empty", "garbage", "foreign"])
+def test_unreadable_file(tmp_path, content):
+    path = tmp_path / "bad.snapshot"
+    path.write_bytes(content)
+    assert load_snapshot(str(path)).status.startswith("unreadable: ")
+
+
+def test_truncated_payload(built):
+    path = built[0]
+    with open(path, "rb") as f:
+        data = f.read()
+    header_end = data.index(b"\n") + 1
+    with open(path, "wb") as f:
+        f.write(data[:header_end + 20])
+    snapshot = load_snapshot(path)
+    assert snapshot.status.startswith("unreadable: ")
+    assert snapshot.files == {}
@@ -0,0 +1,87 @@
+# ------------------------------------------------------------
+# Offline token estimates (prompt_builder.tokens)
+# - Per-piece counting stays close to counting the whole prompt
+# - Answers are counted once: a rerun only scans answers that changed, and
+#   the answer cache is bounded
+# - Budget warnings near and over a tool's token_budget
+# ------------------------------------------------------------
+
+import json
+import os
+
+import pytest
+
+from prompt_builder.core import REGISTRY, assemble_prompt, prompt_chunks
+from prompt_builder.tokens import SLICE_CHARS, TOKEN_RE, TokenCounter, check_token_budget, count_tokens, estimate_tokens
+
+GOLDEN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden", "render_baseline.json")
+ANSWERS = {"Goal": "Plan a two-week trip", "Audience": "Family of four", "Tone": "Friendly", "Format": "Bullets",
+           "Constraints": "Under 3000 EUR, trains only", "Role": "Travel agent"}
+
+
+def test_count_tokens_shape():
+    assert count_tokens("") == 0
+    assert count_tokens("Hello, world!") == 4
+    assert count_tokens("internationalization") == 4   # long words split every 6 letters
+    assert count_tokens("1234567") == 3
+    assert count_tokens("a\n\n\nb") == 3
+
+
+def test_long_text_is_counted_in_slices_with_the_same_result():
+    text = "lorem ipsum dolor sit amet, " * (SLICE_CHARS // 10)
+    assert len(text) > 2 * SLICE_CHARS
+    assert count_tokens(text) == len(TOKEN_RE.findall(text))
+
+
+def test_estimate_is_close_to_counting_the_whole_prompt():
+    with open(GOLDEN, encoding="utf-8") as f:
+        cases = json.load(f)["cases"]
+    for case in cases:
+        args = (case["tool"], case["answers"], case["strict_mode"], case["include_visual_step"])
+        estimate = estimate_tokens(*args, counter=TokenCounter())
+        whole = count_tokens(assemble_prompt(*args))
+        assert abs(estimate - whole) <= max(2, whole * 0.05), case
+
+
+def test_answers_are_counted_once():
+    counter = TokenCounter()
+    first = counter.prompt_tokens("ChatGPT", ANSWERS, True, False)
+    scanned = counter.counted_chars
+    assert scanned > 0
+
+    # Same answers, strict and visual toggled: nothing new to scan
+    counter.prompt_tokens("ChatGPT", ANSWERS, False, True)
+    assert counter.counted_chars == scanned
+
+    # One answer changed: only it is scanned
+    changed = dict(ANSWERS, Goal="Plan a weekend")
+    assert counter.prompt_tokens("ChatGPT", changed, True, False) == (
+        first - count_tokens("Plan a two-week trip") + count_tokens("Plan a weekend"))
+    assert counter.counted_chars == scanned + len("Plan a weekend")
+
+
+def test_answer_cache_is_bounded():
+    counter = TokenCounter(max_entries=3)
+    for i in range(10):
+        counter.count(f"answer number {i}")
+    assert len(counter._answers) == 3
+    before = counter.counted_chars
+    counter.count("answer number 9")
+    assert counter.counted_chars == before
+    counter.count("answer number 0")
+    assert counter.counted_chars == before + len("answer number 0")
+
+
+def test_chunks_tokens_matches_prompt_tokens():
+    counter = TokenCounter()
+    chunks = prompt_chunks("Gemini", {"Task": "Summarize", "Goal": "Notes"}, True, True)
+    assert counter.chunks_tokens(REGISTRY["Gemini"], chunks) == counter.prompt_tokens(
+        "Gemini", {"Task": "Summarize", "Goal": "Notes"}, True, True)
+
+
+@pytest.mark.parametrize("tokens, level", [(1000, None), (110_000, "near"), (130_000, "over")])
+def test_budget_levels(tokens, level):
+    assert REGISTRY["ChatGPT"].token_budget == 128_000
+    got, message = check_token_budget("ChatGPT", tokens)
+    assert got == level
+    assert (f"{tokens:,}" in message) == (level is not None)